@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of crash-safe vehicle file writes.
+
+Compares the previous in-place write (open(..., "w") + yaml.dump) with the
+loader's temp-file + fsync + rename write for each vehicle in vehicles/.
+
+Usage:
+  python benchmarks/bench_atomic_write.py [--repeat 50]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.loader import _dump_yaml, _load_yaml  # noqa: E402
+
+VEHICLES_DIR = Path(__file__).parent.parent / "vehicles"
+
+
+def in_place_dump(filename, data):
+    """The previous write path: truncate and dump directly into the file."""
+    with open(filename, "w") as fp:
+        yaml.dump(
+            data,
+            fp,
+            Dumper=yaml.SafeDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+            width=120,
+        )
+
+
+def median_ms(fn, path, data, repeat: int) -> float:
+    """Median wall-clock time of `repeat` writes, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path, data)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'File':<16}{'In place':>12}{'Atomic':>12}{'Added':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for source in sorted(VEHICLES_DIR.glob("*.yaml")):
+            data = _load_yaml(source)
+            path = Path(tmp) / source.name
+            in_place = median_ms(in_place_dump, path, data, args.repeat)
+            atomic = median_ms(_dump_yaml, path, data, args.repeat)
+            print(
+                f"{source.name:<16}{in_place:>10.2f}ms{atomic:>10.2f}ms"
+                f"{atomic - in_place:>10.2f}ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI queries answered by `maint.py serve-daemon` vs run locally.
+
+Writes a copy of wrx.yaml with an --entries history, starts a daemon on a
+temporary socket, and times `maint.py <file> status` and `history` both
+forwarded to it (warm cache) and with MAINT_NO_DAEMON=1 (best of --repeat).
+
+Usage:
+  python benchmarks/bench_daemon.py [--entries 2000] [--repeat 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_load_vehicle import make_scaled_file  # noqa: E402
+
+ROOT = Path(__file__).parent.parent
+
+
+def best_of(argv, env, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=ROOT, env=env, check=True, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_scaled_file(Path(tmp), args.entries)
+        sock = os.path.join(tmp, "maint.sock")
+        env = dict(os.environ, MAINT_DAEMON_SOCKET=sock)
+        daemon = subprocess.Popen(
+            [sys.executable, "maint.py", "serve-daemon", "--socket", sock],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+        )
+        try:
+            daemon.stdout.readline()  # listening
+            # First query parses the file into the daemon's cache
+            status = [sys.executable, "maint.py", str(path), "status"]
+            subprocess.run(status, cwd=ROOT, env=env, check=True, capture_output=True)
+
+            print(f"History entries: {args.entries:,}")
+            for command in (["status"], ["history"]):
+                argv = [sys.executable, "maint.py", str(path), *command]
+                local = best_of(argv, dict(env, MAINT_NO_DAEMON="1"), args.repeat)
+                daemon_time = best_of(argv, env, args.repeat)
+                print(
+                    f"{command[0]:8} local: {local * 1000:8.1f} ms   "
+                    f"daemon: {daemon_time * 1000:8.1f} ms"
+                )
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
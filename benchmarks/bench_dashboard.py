@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark rendering the fleet dashboard rows: full status vs summary index.
+
+Copies the files in vehicles/ into a temporary directory until it holds
+--vehicles files, then times the per-request work of the dashboard: loading
+every vehicle and computing its full service status (what index() used to
+do) against reading a warm SummaryIndex. Loader-cache hits are included,
+as in the app, so the full pass only re-parses what the cache cannot hold.
+Also times a cold load (empty cache) of every file, sequentially and on the
+load_vehicles thread pool.
+
+Usage:
+  python benchmarks/bench_dashboard.py [--vehicles 500] [--repeat 5] [--workers N]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.fleet_status import fleet_service_status  # noqa: E402
+from models.loader import (  # noqa: E402
+    LOAD_WORKERS,
+    clear_cache,
+    load_vehicle,
+    load_vehicles,
+)
+from models.summary_index import SummaryIndex  # noqa: E402
+
+VEHICLES_DIR = Path(__file__).parent.parent / "vehicles"
+
+
+def full_pass(directory):
+    paths = sorted(directory.glob("*.yaml"))
+    fleet = [load_vehicle(path) for path in paths]
+    return fleet_service_status(fleet)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=LOAD_WORKERS)
+    args = parser.parse_args()
+
+    sources = sorted(VEHICLES_DIR.glob("*.yaml"))
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for i in range(args.vehicles):
+            shutil.copy(sources[i % len(sources)], directory / f"v{i:05d}.yaml")
+
+        full = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            full_pass(directory)
+            full.append(time.perf_counter() - start)
+
+        paths = sorted(directory.glob("*.yaml"))
+        cold = {}
+        for workers in (1, args.workers):
+            times = []
+            for _ in range(args.repeat):
+                clear_cache()
+                start = time.perf_counter()
+                load_vehicles(paths, workers=workers)
+                times.append(time.perf_counter() - start)
+            cold[workers] = min(times)
+
+        clear_cache()
+        index = SummaryIndex(directory)
+        start = time.perf_counter()
+        index.summaries()
+        build = time.perf_counter() - start
+        warm = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            index.summaries()
+            warm.append(time.perf_counter() - start)
+
+    print(f"Vehicles: {args.vehicles:,}")
+    for workers, seconds in cold.items():
+        print(f"Cold load, {workers} worker(s): {seconds * 1000:8.1f} ms")
+    print(f"Full status pass:   {min(full) * 1000:8.1f} ms")
+    print(f"Index build (once): {build * 1000:8.1f} ms")
+    print(f"Index, warm:        {min(warm) * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark a fleet status report: one CLI run per vehicle vs `fleet status`.
+
+Copies the files in vehicles/ into a temporary directory until it holds
+--vehicles files, then times running `maint.py <file> status` once per file
+(what a shell loop does) against a single `maint.py <dir> fleet status` with
+one worker and with --workers.
+
+Usage:
+  python benchmarks/bench_fleet_cli.py [--vehicles 40] [--workers 4] [--chunksize 1]
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+VEHICLES_DIR = ROOT / "vehicles"
+MAINT = str(ROOT / "maint.py")
+
+
+def run(*argv) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, MAINT, *argv], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunksize", type=int, default=1)
+    args = parser.parse_args()
+
+    sources = sorted(VEHICLES_DIR.glob("*.yaml"))
+    with tempfile.TemporaryDirectory() as tmp:
+        fleet = Path(tmp)
+        for i in range(args.vehicles):
+            shutil.copy(sources[i % len(sources)], fleet / f"v{i:05d}.yaml")
+
+        per_file = sum(run(str(p), "status") for p in sorted(fleet.glob("*.yaml")))
+        serial = run(str(fleet), "fleet", "status", "--workers", "1")
+        parallel = run(
+            str(fleet),
+            "fleet",
+            "status",
+            "--workers",
+            str(args.workers),
+            "--chunksize",
+            str(args.chunksize),
+        )
+
+    print(f"Vehicles: {args.vehicles:,}")
+    print(f"One run per vehicle:        {per_file * 1000:8.1f} ms")
+    print(f"fleet status, 1 worker:     {serial * 1000:8.1f} ms")
+    print(f"fleet status, {args.workers} workers:    {parallel * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
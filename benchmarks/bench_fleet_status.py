@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark fleet-wide status: scalar per-vehicle path vs the NumPy engine.
+
+Builds a fleet by parsing the files in vehicles/ repeatedly, then times
+Vehicle.get_all_service_status for every vehicle against a single
+fleet_service_status call (history indexes are warmed first for both, and
+the materialized status tables are dropped before every run).
+
+Usage:
+  python benchmarks/bench_fleet_status.py [--vehicles 2000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.fleet_status import HAS_NUMPY, fleet_service_status  # noqa: E402
+from models.loader import _read_vehicle  # noqa: E402
+
+VEHICLES_DIR = Path(__file__).parent.parent / "vehicles"
+
+
+def best_of(fn, fleet, repeat: int) -> float:
+    """Return the fastest wall-clock time of `repeat` cold-table calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        for vehicle in fleet:
+            vehicle._status_tables.clear()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        print("NumPy is not installed; nothing to compare.")
+        return 1
+
+    paths = sorted(VEHICLES_DIR.glob("*.yaml"))
+    fleet = [_read_vehicle(paths[i % len(paths)]) for i in range(args.vehicles)]
+    for vehicle in fleet:
+        vehicle.get_all_service_status()
+
+    scalar = best_of(
+        lambda: [v.get_all_service_status() for v in fleet], fleet, args.repeat
+    )
+    vectorized = best_of(lambda: fleet_service_status(fleet), fleet, args.repeat)
+    rows = sum(len(v.rules) for v in fleet)
+
+    print(f"Vehicles: {len(fleet):,}  Vehicle x rule rows: {rows:,}")
+    print(f"Scalar:     {scalar * 1000:8.1f} ms")
+    print(f"Vectorized: {vectorized * 1000:8.1f} ms")
+    print(f"Speedup:    {scalar / vectorized:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fleet-wide "what is due in the next N days" query.
+
+Builds a fleet by parsing the files in vehicles/ repeatedly, then times
+fleet_due_within on the fresh vehicles (mileage rates fitted and last
+services looked up inside the timed call, no status tables) and again once
+fleet_service_status has materialized every vehicle's status table.
+
+Usage:
+  python benchmarks/bench_forecast.py [--vehicles 5000] [--days 30] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.fleet_status import (  # noqa: E402
+    HAS_NUMPY,
+    fleet_due_within,
+    fleet_service_status,
+)
+from models.loader import _read_vehicle  # noqa: E402
+
+VEHICLES_DIR = Path(__file__).parent.parent / "vehicles"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = sorted(VEHICLES_DIR.glob("*.yaml"))
+    cold, warm = [], []
+    for _ in range(args.repeat):
+        fleet = [_read_vehicle(paths[i % len(paths)]) for i in range(args.vehicles)]
+        start = time.perf_counter()
+        due = fleet_due_within(fleet, args.days)
+        cold.append(time.perf_counter() - start)
+        fleet_service_status(fleet)
+        start = time.perf_counter()
+        fleet_due_within(fleet, args.days)
+        warm.append(time.perf_counter() - start)
+
+    engine = "NumPy" if HAS_NUMPY else "scalar"
+    print(f"Vehicles: {args.vehicles:,}  Engine: {engine}")
+    print(f"Due within {args.days} days: {len(due):,} services")
+    print(f"Cold (no status tables): {min(cold) * 1000:8.1f} ms")
+    print(f"With status tables:      {min(warm) * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
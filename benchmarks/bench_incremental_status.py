@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark status after a single history edit: incremental vs full recompute.
+
+Scales the history of vehicles/wrx.yaml up to a target number of entries and
+times the dashboard's log-a-service round trip (a journaled save_history_entry,
+then load_vehicle and get_all_service_status) with the cached vehicle updated
+in place, and with the cache dropped so the file is re-parsed and every status
+row recomputed. Also times the edit in memory alone (Vehicle.add_history_entry
+vs appending to history directly).
+
+Usage:
+  python benchmarks/bench_incremental_status.py [--entries 10000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_load_vehicle import make_scaled_file  # noqa: E402
+from models import HistoryEntry, invalidate_cache, load_vehicle  # noqa: E402
+from models import save_history_entry, update_vehicle_meta  # noqa: E402
+from models.loader import _read_vehicle  # noqa: E402
+
+
+def new_entry(vehicle) -> HistoryEntry:
+    """An oil change at the current mileage (so every other row is unaffected)."""
+    return HistoryEntry(
+        "engine oil and filter/replace", vehicle.as_of_date, vehicle.current_miles
+    )
+
+
+def time_round_trip(path: Path, repeat: int, drop_cache: bool) -> float:
+    timings = []
+    for _ in range(repeat):
+        load_vehicle(path).get_all_service_status()
+        start = time.perf_counter()
+        save_history_entry(path, new_entry(load_vehicle(path)), journal=True)
+        if drop_cache:
+            invalidate_cache(path)
+        load_vehicle(path).get_all_service_status()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def time_in_memory(path: Path, repeat: int, incremental: bool) -> float:
+    timings = []
+    for _ in range(repeat):
+        vehicle = _read_vehicle(path)
+        vehicle.get_all_service_status()
+        entry = new_entry(vehicle)
+        start = time.perf_counter()
+        if incremental:
+            vehicle.add_history_entry(entry)
+        else:
+            vehicle.history.append(entry)
+        vehicle.get_all_service_status()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_scaled_file(Path(tmp), args.entries)
+        # Pin the current mileage, as the sample vehicles do in their state
+        vehicle = _read_vehicle(path)
+        update_vehicle_meta(path, current_miles=vehicle.current_miles)
+
+        full = time_in_memory(path, args.repeat, incremental=False)
+        incremental = time_in_memory(path, args.repeat, incremental=True)
+        reparse = time_round_trip(path, args.repeat, drop_cache=True)
+        replay = time_round_trip(path, args.repeat, drop_cache=False)
+        rules = len(vehicle.rules)
+
+    print(f"History entries: {args.entries:,}  Rules: {rules}")
+    print("Edit + status (in memory):")
+    print(f"  Full recompute: {full * 1000:8.2f} ms")
+    print(f"  Incremental:    {incremental * 1000:8.2f} ms")
+    print("Save + load + status (file):")
+    print(f"  Re-parse:       {reparse * 1000:8.2f} ms")
+    print(f"  Cache replay:   {replay * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark vehicle YAML parsing.
+
+Scales the history of vehicles/wrx.yaml up to a target number of entries and
+compares the direct model construction in models.loader against the previous
+YAML -> JSON string -> JSON object_hook round-trip.
+
+Usage:
+  python benchmarks/bench_load_vehicle.py [--entries 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import Car, HistoryEntry, Rule, Vehicle  # noqa: E402
+from models.loader import _read_vehicle  # noqa: E402
+
+SOURCE = Path(__file__).parent.parent / "vehicles" / "wrx.yaml"
+
+
+def _legacy_object_hook(dct):
+    """The object_hook previously used by load_vehicle (kept for comparison)."""
+    if "make" in dct and "model" in dct:
+        return Car(
+            dct["make"],
+            dct["model"],
+            dct.get("trim"),
+            dct["year"],
+            dct["purchaseDate"],
+            dct["purchaseMiles"],
+        )
+    elif "item" in dct and "verb" in dct:
+        return Rule(
+            dct["item"],
+            dct["verb"],
+            dct.get("intervalMiles"),
+            dct.get("intervalMonths"),
+            dct.get("severeIntervalMiles"),
+            dct.get("severeIntervalMonths"),
+            dct.get("notes"),
+            dct.get("phase"),
+            dct.get("startMiles"),
+            dct.get("stopMiles"),
+            dct.get("startMonths"),
+            dct.get("stopMonths"),
+            dct.get("aftermarket"),
+            dct.get("countsAs"),
+        )
+    elif "ruleKey" in dct:
+        return HistoryEntry(
+            dct["ruleKey"],
+            dct["date"],
+            dct.get("mileage"),
+            dct.get("performedBy"),
+            dct.get("notes"),
+            dct.get("cost"),
+        )
+    elif "car" in dct and "rules" in dct:
+        state = dct.get("state") or {}
+        return Vehicle(
+            dct["car"],
+            dct["rules"],
+            dct.get("history"),
+            state.get("asOfDate"),
+            state.get("currentMiles"),
+        )
+    return dct
+
+
+def legacy_load(filename):
+    """Load via the YAML -> JSON -> object_hook round-trip."""
+    with open(filename, "rb") as fp:
+        json_data = json.dumps(yaml.load(fp, Loader=yaml.SafeLoader), indent=4)
+        return json.loads(json_data, object_hook=_legacy_object_hook)
+
+
+def make_scaled_file(directory: Path, entries: int) -> Path:
+    """Write a copy of wrx.yaml whose history is repeated up to `entries` rows."""
+    with open(SOURCE) as fp:
+        data = yaml.safe_load(fp)
+    history = data["history"]
+    data["history"] = [dict(history[i % len(history)]) for i in range(entries)]
+    path = directory / "wrx_scaled.yaml"
+    with open(path, "w") as fp:
+        yaml.dump(data, fp, default_flow_style=False, sort_keys=False, width=120)
+    return path
+
+
+def best_of(fn, path, repeat: int) -> float:
+    """Return the fastest wall-clock time of `repeat` calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_scaled_file(Path(tmp), args.entries)
+        legacy = best_of(legacy_load, path, args.repeat)
+        direct = best_of(_read_vehicle, path, args.repeat)
+
+    print(f"History entries: {args.entries:,}")
+    print(f"JSON round-trip: {legacy * 1000:8.1f} ms")
+    print(f"Direct build:    {direct * 1000:8.1f} ms")
+    print(f"Speedup:         {legacy / direct:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
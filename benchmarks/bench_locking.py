@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark reader throughput with and without vehicle file locking.
+
+Several threads repeatedly load (uncached) the vehicles in vehicles/; readers
+take shared locks, so throughput should match the unlocked run.
+
+Usage:
+  python benchmarks/bench_locking.py [--threads 8] [--loads 200]
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import loader  # noqa: E402
+
+VEHICLES_DIR = Path(__file__).parent.parent / "vehicles"
+
+
+def read_all(paths, loads: int) -> None:
+    """Parse each vehicle `loads` times under a shared lock, bypassing the cache."""
+    for _ in range(loads):
+        for path in paths:
+            with loader._file_lock(path, exclusive=False):
+                loader._read_vehicle(path)
+
+
+def loads_per_second(paths, threads: int, loads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for _ in range(threads):
+            pool.submit(read_all, paths, loads)
+    return threads * loads * len(paths) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--loads", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = sorted(VEHICLES_DIR.glob("*.yaml"))
+    locked = loads_per_second(paths, args.threads, args.loads)
+    stats = loader.lock_stats()
+
+    fcntl, loader.fcntl = loader.fcntl, None
+    try:
+        unlocked = loads_per_second(paths, args.threads, args.loads)
+    finally:
+        loader.fcntl = fcntl
+
+    print(f"Unlocked: {unlocked:10.0f} loads/s")
+    print(f"Locked:   {locked:10.0f} loads/s")
+    print(f"Lock waits: {stats.contended} of {stats.acquired} acquisitions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
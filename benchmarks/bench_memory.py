@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory retained per HistoryEntry.
+
+Parses a copy of vehicles/wrx.yaml scaled to a target number of history
+entries under tracemalloc, drops the raw YAML document, and reports the bytes
+still held per entry, both for the slotted, string-interning HistoryEntry and
+for the previous plain class with a per-instance __dict__.
+
+Usage:
+  python benchmarks/bench_memory.py [--entries 10000]
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_load_vehicle import make_scaled_file  # noqa: E402
+from models import HistoryEntry  # noqa: E402
+from models.loader import _load_yaml  # noqa: E402
+
+
+class DictHistoryEntry:
+    """The previous HistoryEntry layout (kept for comparison)."""
+
+    def __init__(self, rule_key, date, mileage, performed_by, notes, cost):
+        self.rule_key = rule_key
+        self.date = date
+        self.mileage = mileage
+        self.performed_by = performed_by
+        self.notes = notes
+        self.cost = cost
+
+
+def bytes_per_entry(cls, path: Path) -> float:
+    """Bytes retained per entry after parsing the file and dropping the document."""
+    gc.collect()
+    tracemalloc.start()
+    data = _load_yaml(path)
+    entries = [
+        cls(
+            h["ruleKey"],
+            h["date"],
+            h.get("mileage"),
+            h.get("performedBy"),
+            h.get("notes"),
+            h.get("cost"),
+        )
+        for h in data["history"]
+    ]
+    del data
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained / len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_scaled_file(Path(tmp), args.entries)
+        before = bytes_per_entry(DictHistoryEntry, path)
+        after = bytes_per_entry(HistoryEntry, path)
+
+    print(f"History entries: {args.entries:,}")
+    print(f"__dict__ class:  {before:8.0f} bytes/entry")
+    print(f"Slotted class:   {after:8.0f} bytes/entry")
+    print(f"Saved:           {1 - after / before:8.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark Vehicle.get_all_service_status on a long history.
+
+Scales the history of vehicles/wrx.yaml up to a target number of entries and
+times a full status calculation on a freshly loaded vehicle (so any lookup
+index is built inside the timed call) and on a repeat call.
+
+Usage:
+  python benchmarks/bench_service_status.py [--entries 10000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for model imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_load_vehicle import make_scaled_file  # noqa: E402
+from models.loader import _read_vehicle  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_scaled_file(Path(tmp), args.entries)
+        vehicles = [_read_vehicle(path) for _ in range(args.repeat)]
+
+    first, again = [], []
+    for vehicle in vehicles:
+        start = time.perf_counter()
+        vehicle.get_all_service_status()
+        first.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        vehicle.get_all_service_status()
+        again.append(time.perf_counter() - start)
+
+    print(f"History entries: {args.entries:,}  Rules: {len(vehicles[0].rules)}")
+    print(f"First status:    {min(first) * 1000:8.1f} ms")
+    print(f"Repeat status:   {min(again) * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup: wall time of short maint.py commands.
+
+Each command runs in a fresh interpreter (best of --repeat runs), next to a
+bare `python -c pass` for the interpreter's own startup. Run with
+`python -X importtime maint.py ...` to see where the import time goes.
+
+Usage:
+  python benchmarks/bench_startup.py [--repeat 20] [--vehicle vehicles/brz.yaml]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+COMMANDS = [
+    ["--help"],
+    ["{vehicle}", "rules", "--format", "csv"],
+    ["{vehicle}", "status", "--format", "json"],
+    ["{vehicle}", "status"],
+    ["{vehicle}", "history"],
+]
+
+
+def best_of(argv, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=ROOT, check=True, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--vehicle", default="vehicles/brz.yaml")
+    args = parser.parse_args()
+
+    bare = best_of([sys.executable, "-c", "pass"], args.repeat)
+    print(f"{'python -c pass':48} {bare * 1000:8.1f} ms")
+    for command in COMMANDS:
+        command = [part.format(vehicle=args.vehicle) for part in command]
+        elapsed = best_of([sys.executable, "maint.py", *command], args.repeat)
+        print(f"{'maint.py ' + ' '.join(command):48} {elapsed * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
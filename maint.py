@@ -9,17 +9,32 @@ Commands:
   edit    - Edit vehicle info and/or current mileage
   delete  - Delete the vehicle file
   rules   - List maintenance rules (default); subcommands: add, edit, delete
+  compact - Fold the append-only history journal back into the vehicle file
+  fleet   - Commands over a directory of vehicle files; subcommand: status
+
+  maint.py serve-daemon keeps vehicles warm in memory; while it runs, status
+  and history/rules listings are answered by it (see maint_daemon.py).
 """
 
 import argparse
+import os
 import sys
 from collections import defaultdict
 from datetime import date
+from functools import partial
 from pathlib import Path
-from tabulate import tabulate
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import maint_daemon
+
+if __name__ == "__main__":
+    # Let a running daemon answer before paying for the imports below
+    _status = maint_daemon.forward(sys.argv[1:])
+    if _status is not None:
+        sys.exit(_status)
 
-from models import (
+from models import (  # noqa: E402
+    parse_date,
     Car,
     Status,
     ServiceDue,
@@ -27,14 +42,13 @@ from models import (
     Rule,
     load_vehicle,
     save_history_entry,
-    update_history_entry,
-    delete_history_entry,
+    compact_history,
     add_rule,
-    update_rule,
-    delete_rule,
     create_vehicle,
     update_vehicle_meta,
     delete_vehicle,
+    yaml_backend,
+    VehicleFile,
 )
 
 # =============================================================================
@@ -84,6 +98,15 @@ def format_time_remaining(svc: ServiceDue) -> str:
         return f"{days}d"
 
 
+def iso_date(value: str) -> str:
+    """argparse type for YYYY-MM-DD dates (validated, returned unchanged)."""
+    try:
+        parse_date(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return value
+
+
 def truncate(text: Optional[str], max_len: int = 30) -> str:
     """Truncate text with ellipsis if too long."""
     if text is None:
@@ -143,6 +166,169 @@ def extract_chart_data(vehicle, rule_filter=None):
     }
 
 
+# =============================================================================
+# Machine-readable output
+# =============================================================================
+
+OUTPUT_FORMATS = ("table", "json", "ndjson", "csv")
+
+# Bumped whenever a field is renamed, removed or changes meaning; fields may
+# be appended within a version.
+SCHEMA_VERSION = 1
+
+STATUS_FIELDS = [
+    "rule_key",
+    "rule",
+    "status",
+    "last_service_date",
+    "last_service_miles",
+    "due_date",
+    "due_miles",
+    "miles_remaining",
+    "time_remaining_days",
+    "projected_date",
+]
+
+HISTORY_FIELDS = [
+    "index",
+    "date",
+    "mileage",
+    "rule_key",
+    "rule",
+    "performed_by",
+    "cost",
+    "notes",
+]
+
+RULE_FIELDS = [
+    "index",
+    "rule_key",
+    "rule",
+    "interval_miles",
+    "interval_months",
+    "severe_interval_miles",
+    "severe_interval_months",
+    "start_miles",
+    "stop_miles",
+    "start_months",
+    "stop_months",
+    "aftermarket",
+    "notes",
+]
+
+
+def status_record(svc: ServiceDue) -> Dict[str, Any]:
+    """One status row with raw (unformatted) values, keyed by STATUS_FIELDS."""
+    return {
+        "rule_key": svc.rule.key,
+        "rule": svc.rule.display_name,
+        "status": svc.status.name,
+        "last_service_date": svc.last_service_date,
+        "last_service_miles": svc.last_service_miles,
+        "due_date": svc.due_date,
+        "due_miles": svc.due_miles,
+        "miles_remaining": svc.miles_remaining,
+        "time_remaining_days": svc.time_remaining_days,
+        "projected_date": svc.projected_date,
+    }
+
+
+def history_record(index: int, entry: HistoryEntry, vehicle) -> Dict[str, Any]:
+    """One history row keyed by HISTORY_FIELDS; index is the raw file position."""
+    rule = vehicle.get_rule(entry.rule_key)
+    return {
+        "index": index,
+        "date": entry.date,
+        "mileage": entry.mileage,
+        "rule_key": entry.rule_key,
+        "rule": rule.display_name if rule else entry.rule_key,
+        "performed_by": entry.performed_by,
+        "cost": entry.cost,
+        "notes": entry.notes,
+    }
+
+
+def rule_record(index: int, rule: Rule) -> Dict[str, Any]:
+    """One rule row keyed by RULE_FIELDS; index is the raw file position."""
+    return {
+        "index": index,
+        "rule_key": rule.key,
+        "rule": rule.display_name,
+        "interval_miles": rule.interval_miles,
+        "interval_months": rule.interval_months,
+        "severe_interval_miles": rule.severe_interval_miles,
+        "severe_interval_months": rule.severe_interval_months,
+        "start_miles": rule.start_miles,
+        "stop_miles": rule.stop_miles,
+        "start_months": rule.start_months,
+        "stop_months": rule.stop_months,
+        "aftermarket": rule.aftermarket,
+        "notes": rule.notes,
+    }
+
+
+def vehicle_meta(vehicle, current_miles=None, as_of_date=None) -> Dict[str, Any]:
+    """Vehicle fields for the json/ndjson header."""
+    return {
+        "name": vehicle.car.name,
+        "current_miles": (
+            vehicle.current_miles if current_miles is None else current_miles
+        ),
+        "as_of_date": as_of_date or vehicle.as_of_date,
+    }
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def write_records(
+    fmt: str,
+    kind: str,
+    fields: List[str],
+    records: Iterable[Dict[str, Any]],
+    vehicle: Dict[str, Any],
+) -> None:
+    """
+    Write records to stdout as json, ndjson or csv, one row at a time.
+
+    json is {"schema": "maint.<kind>/<version>", "vehicle": {...},
+    "rows": [...]}; ndjson is that header (with "fields" instead of "rows")
+    on the first line and one row per line after it; csv is a header row of
+    field names, then the rows, with empty cells for missing values and a
+    last "schema" column holding the schema name on every row (a column
+    rather than a preamble line, so any CSV reader can still parse it).
+    """
+    import csv
+    import json
+
+    out = sys.stdout
+    header = {"schema": f"maint.{kind}/{SCHEMA_VERSION}", "vehicle": vehicle}
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow([*fields, "schema"])
+        for record in records:
+            writer.writerow(
+                [*(_csv_value(record[f]) for f in fields), header["schema"]]
+            )
+    elif fmt == "ndjson":
+        out.write(json.dumps({**header, "fields": fields}) + "\n")
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+    else:
+        # Open the rows array inside the header object, then stream into it
+        out.write(json.dumps(header)[:-1] + ', "rows": [')
+        separator = "\n"
+        for record in records:
+            out.write(separator + json.dumps(record))
+            separator = ",\n"
+        out.write("\n]}\n")
+
+
 # =============================================================================
 # Status command
 # =============================================================================
@@ -188,9 +374,46 @@ def cmd_status(args):
     if args.exclude_verbs:
         exclude_verbs = [v.strip() for v in args.exclude_verbs.split(",")]
 
+    # Get all service statuses
+    options = dict(
+        severe=args.severe,
+        miles_only=args.miles_only,
+        time_only=args.time_only,
+        exclude_verbs=exclude_verbs,
+    )
+    if args.as_of:
+        statuses = vehicle.status_as_of(args.as_of, **options)
+    else:
+        statuses = vehicle.get_all_service_status(**options)
+
+    if args.format != "table":
+        # Most urgent first, then by item like the table sections
+        statuses.sort(
+            key=lambda s: (s.status.value, s.rule.item, s.rule.verb, s.rule.phase or "")
+        )
+        meta = vehicle_meta(vehicle)
+        if args.as_of:
+            meta = vehicle_meta(vehicle, vehicle.miles_as_of(args.as_of), args.as_of)
+        write_records(
+            args.format,
+            "status",
+            STATUS_FIELDS,
+            map(status_record, statuses),
+            meta,
+        )
+        return 0
+
+    from tabulate import tabulate
+
     # Header
     print(f"Vehicle: {vehicle.car.name}")
-    print(f"Current mileage: {vehicle.current_miles:,.0f} (as of {vehicle.as_of_date})")
+    if args.as_of:
+        miles = vehicle.miles_as_of(args.as_of)
+        print(f"Mileage: {miles:,.0f} (estimated, as of {args.as_of})")
+    else:
+        print(
+            f"Current mileage: {vehicle.current_miles:,.0f} (as of {vehicle.as_of_date})"
+        )
     if args.severe:
         print("Mode: SEVERE DRIVING (shorter intervals)")
     if args.miles_only:
@@ -200,17 +423,13 @@ def cmd_status(args):
     if exclude_verbs:
         print(f"Filter: EXCLUDING VERBS: {', '.join(exclude_verbs)}")
     print(f"Rules: {len(vehicle.rules)}")
-    print(f"History entries: {len(vehicle.history)}")
+    if args.as_of:
+        count = sum(1 for h in vehicle.history if h.date <= args.as_of)
+        print(f"History entries: {count} (of {len(vehicle.history)})")
+    else:
+        print(f"History entries: {len(vehicle.history)}")
     print()
 
-    # Get all service statuses
-    statuses = vehicle.get_all_service_status(
-        severe=args.severe,
-        miles_only=args.miles_only,
-        time_only=args.time_only,
-        exclude_verbs=exclude_verbs,
-    )
-
     # Group by status and sort by item for logical grouping
     overdue = sorted(
         [s for s in statuses if s.status == Status.OVERDUE],
@@ -296,6 +515,148 @@ def cmd_status(args):
     return 0
 
 
+# =============================================================================
+# Fleet command
+# =============================================================================
+
+# (path, vehicle name, current miles, overdue, due soon, error message)
+FleetResult = Tuple[
+    str,
+    Optional[str],
+    Optional[float],
+    List[ServiceDue],
+    List[ServiceDue],
+    Optional[str],
+]
+
+
+def fleet_vehicle_status(path: str, options: Dict[str, Any]) -> FleetResult:
+    """
+    Load one vehicle file and keep its overdue and due-soon services.
+
+    Runs in a worker process, so only what the report prints is sent back;
+    a file that fails to load is reported rather than ending the run.
+    """
+    try:
+        vehicle = load_vehicle(path)
+        statuses = vehicle.get_all_service_status(**options)
+    except Exception as e:
+        return (path, None, None, [], [], f"{type(e).__name__}: {e}")
+
+    def pick(status):
+        return sorted(
+            (s for s in statuses if s.status == status),
+            key=lambda s: (s.rule.item, s.rule.verb, s.rule.phase or ""),
+        )
+
+    return (
+        path,
+        vehicle.car.name,
+        vehicle.current_miles,
+        pick(Status.OVERDUE),
+        pick(Status.DUE_SOON),
+        None,
+    )
+
+
+def iter_fleet_status(
+    paths: List[Path],
+    options: Dict[str, Any],
+    workers: int = 1,
+    chunksize: int = 1,
+) -> Iterator[FleetResult]:
+    """
+    Yield fleet_vehicle_status for each path as soon as it is ready.
+
+    With more than one worker the files are spread over a process pool,
+    chunksize paths per task, and results arrive in completion order.
+    """
+    import multiprocessing
+
+    worker = partial(fleet_vehicle_status, options=options)
+    names = [str(p) for p in paths]
+    if workers <= 1 or len(names) <= 1:
+        yield from map(worker, names)
+        return
+    with multiprocessing.Pool(min(workers, len(names))) as pool:
+        yield from pool.imap_unordered(worker, names, chunksize)
+
+
+def cmd_fleet_status(args):
+    """Show overdue and due-soon maintenance for every vehicle in a directory."""
+    from tabulate import tabulate
+
+    if args.miles_only and args.time_only:
+        print("Error: --miles-only and --time-only cannot be used together")
+        return 1
+    if args.workers < 1 or args.chunksize < 1:
+        print("Error: --workers and --chunksize must be at least 1")
+        return 1
+
+    exclude_verbs = None
+    if args.exclude_verbs:
+        exclude_verbs = [v.strip() for v in args.exclude_verbs.split(",")]
+    options = dict(
+        severe=args.severe,
+        miles_only=args.miles_only,
+        time_only=args.time_only,
+        exclude_verbs=exclude_verbs,
+    )
+
+    paths = sorted(args.vehicle_file.glob("*.yaml"))
+    print(f"Fleet: {args.vehicle_file} ({len(paths)} vehicle files)")
+    print()
+
+    headers = ["Rule", "Due (mi)", "Due (date)", "Remaining (mi)", "Remaining (time)"]
+    colalign = ("left", "right", "left", "right", "right")
+    overdue_total = due_soon_total = 0
+    needs_service = []
+    errors = []
+    for path, name, miles, overdue, due_soon, error in iter_fleet_status(
+        paths, options, args.workers, args.chunksize
+    ):
+        if error:
+            print(f"{path}: ERROR {error}")
+            print(flush=True)
+            errors.append(path)
+            continue
+        print(
+            f"{name} ({path}) @ {miles:,.0f} mi: "
+            f"{len(overdue)} overdue, {len(due_soon)} due soon"
+        )
+        rows = [["OVERDUE"] + r for r in _fleet_rows(overdue)]
+        rows += [["DUE SOON"] + r for r in _fleet_rows(due_soon)]
+        if rows:
+            print(
+                tabulate(
+                    rows,
+                    headers=["Status"] + headers,
+                    tablefmt="simple",
+                    colalign=("left",) + colalign,
+                )
+            )
+            needs_service.append(name)
+        # Stream each vehicle as it arrives, even when piped
+        print(flush=True)
+        overdue_total += len(overdue)
+        due_soon_total += len(due_soon)
+
+    print("SUMMARY:")
+    print(f"  Vehicles: {len(paths) - len(errors)}")
+    print(f"  Needing service: {len(needs_service)}")
+    print(f"  Overdue: {overdue_total}")
+    print(f"  Due soon: {due_soon_total}")
+    if errors:
+        print(f"  Failed to load: {len(errors)}")
+        return 1
+    return 0
+
+
+def _fleet_rows(services: List[ServiceDue]) -> List[List[str]]:
+    """Status table rows without the Last Done column."""
+    return [row[:1] + row[2:] for row in make_status_table(services)]
+
+
 # =============================================================================
 # History command
 # =============================================================================
@@ -330,13 +691,13 @@ def cmd_history(args):
     vehicle = load_vehicle(args.vehicle_file)
 
     def key_by_date(ie):
-        return ie[1].date
+        return ie[1].date_ordinal
 
     def key_by_miles(ie):
         return ie[1].mileage or 0
 
     def key_by_rule(ie):
-        return (ie[1].rule_key, ie[1].date)
+        return (ie[1].rule_key, ie[1].date_ordinal)
 
     # Build (raw_index, entry) and sort like get_history_sorted for consistent order
     if args.sort == "date":
@@ -363,10 +724,23 @@ def cmd_history(args):
         entries = [f[1] for f in filtered]
 
     if args.since:
-        filtered = [(i, e) for i, e in zip(indices, entries) if e.date >= args.since]
+        since = parse_date(args.since).toordinal()
+        filtered = [(i, e) for i, e in zip(indices, entries) if e.date_ordinal >= since]
         indices = [f[0] for f in filtered]
         entries = [f[1] for f in filtered]
 
+    if args.format != "table":
+        write_records(
+            args.format,
+            "history",
+            HISTORY_FIELDS,
+            (history_record(i, e, vehicle) for i, e in zip(indices, entries)),
+            vehicle_meta(vehicle),
+        )
+        return 0
+
+    from tabulate import tabulate
+
     # Calculate summary stats
     total_cost = sum(e.cost for e in entries if e.cost is not None)
 
@@ -475,8 +849,11 @@ def cmd_log(args):
         return 0
 
     # Save the entry
-    save_history_entry(args.vehicle_file, entry)
-    print("Entry saved.")
+    save_history_entry(args.vehicle_file, entry, journal=args.journal)
+    if args.journal:
+        print("Entry appended to history journal.")
+    else:
+        print("Entry saved.")
 
     return 0
 
@@ -488,67 +865,71 @@ def cmd_log(args):
 
 def cmd_edit(args):
     """Edit an existing history entry by index."""
-    vehicle = load_vehicle(args.vehicle_file)
-
-    if args.index < 0 or args.index >= len(vehicle.history):
-        print(f"Error: Index {args.index} out of range (0..{len(vehicle.history) - 1})")
-        return 1
+    # Validate and write in one transaction so the file cannot change in between
+    with VehicleFile(args.vehicle_file) as vf:
+        vehicle = vf.vehicle
 
-    existing = vehicle.history[args.index]
-
-    # Build updated entry: only override fields that were explicitly passed
-    if args.rule_key is not None:
-        normalized_key = args.rule_key.lower()
-        rule = None
-        for r in vehicle.rules:
-            if r.key.lower() == normalized_key:
-                rule = r
-                break
-        if rule is None:
-            print(f"Error: Unknown rule key '{args.rule_key}'")
+        if args.index < 0 or args.index >= len(vehicle.history):
+            print(
+                f"Error: Index {args.index} out of range (0..{len(vehicle.history) - 1})"
+            )
             return 1
-        rule_display = rule.display_name
-    else:
-        rule = vehicle.get_rule(existing.rule_key)
-        rule_display = rule.display_name if rule else existing.rule_key
 
-    entry_date = args.date if args.date is not None else existing.date
-    mileage = args.mileage if args.mileage is not None else existing.mileage
-    performed_by = args.by if args.by is not None else existing.performed_by
-    notes = args.notes if args.notes is not None else existing.notes
-    cost = args.cost if args.cost is not None else existing.cost
-
-    entry = HistoryEntry(
-        rule_key=rule.key,
-        date=entry_date,
-        mileage=mileage,
-        performed_by=performed_by,
-        notes=notes,
-        cost=cost,
-    )
+        existing = vehicle.history[args.index]
+
+        # Build updated entry: only override fields that were explicitly passed
+        if args.rule_key is not None:
+            normalized_key = args.rule_key.lower()
+            rule = None
+            for r in vehicle.rules:
+                if r.key.lower() == normalized_key:
+                    rule = r
+                    break
+            if rule is None:
+                print(f"Error: Unknown rule key '{args.rule_key}'")
+                return 1
+            rule_display = rule.display_name
+        else:
+            rule = vehicle.get_rule(existing.rule_key)
+            rule_display = rule.display_name if rule else existing.rule_key
+
+        entry_date = args.date if args.date is not None else existing.date
+        mileage = args.mileage if args.mileage is not None else existing.mileage
+        performed_by = args.by if args.by is not None else existing.performed_by
+        notes = args.notes if args.notes is not None else existing.notes
+        cost = args.cost if args.cost is not None else existing.cost
+
+        entry = HistoryEntry(
+            rule_key=rule.key,
+            date=entry_date,
+            mileage=mileage,
+            performed_by=performed_by,
+            notes=notes,
+            cost=cost,
+        )
 
-    print(f"Updating history entry {args.index} in {args.vehicle_file}:")
-    print(f"  Rule:    {rule_display}")
-    print(f"  Date:    {entry.date}")
-    if entry.mileage is not None:
-        print(f"  Mileage: {entry.mileage:,.0f}")
-    if entry.performed_by:
-        print(f"  By:      {entry.performed_by}")
-    if entry.notes:
-        print(f"  Notes:   {entry.notes}")
-    if entry.cost is not None:
-        print(f"  Cost:    ${entry.cost:.2f}")
-    print()
+        print(f"Updating history entry {args.index} in {args.vehicle_file}:")
+        print(f"  Rule:    {rule_display}")
+        print(f"  Date:    {entry.date}")
+        if entry.mileage is not None:
+            print(f"  Mileage: {entry.mileage:,.0f}")
+        if entry.performed_by:
+            print(f"  By:      {entry.performed_by}")
+        if entry.notes:
+            print(f"  Notes:   {entry.notes}")
+        if entry.cost is not None:
+            print(f"  Cost:    ${entry.cost:.2f}")
+        print()
 
-    if args.dry_run:
-        print("(dry run - no changes made)")
-        return 0
+        if args.dry_run:
+            print("(dry run - no changes made)")
+            return 0
 
-    try:
-        update_history_entry(args.vehicle_file, args.index, entry)
-    except IndexError as e:
-        print(f"Error: {e}")
-        return 1
+        try:
+            vf.update_history_entry(args.index, entry)
+        except IndexError as e:
+            print(f"Error: {e}")
+            return 1
     print("Entry updated.")
     return 0
 
@@ -560,31 +941,35 @@ def cmd_edit(args):
 
 def cmd_delete(args):
     """Delete a history entry by index."""
-    vehicle = load_vehicle(args.vehicle_file)
+    # Validate and write in one transaction so the file cannot change in between
+    with VehicleFile(args.vehicle_file) as vf:
+        vehicle = vf.vehicle
 
-    if args.index < 0 or args.index >= len(vehicle.history):
-        print(f"Error: Index {args.index} out of range (0..{len(vehicle.history) - 1})")
-        return 1
+        if args.index < 0 or args.index >= len(vehicle.history):
+            print(
+                f"Error: Index {args.index} out of range (0..{len(vehicle.history) - 1})"
+            )
+            return 1
 
-    entry = vehicle.history[args.index]
-    rule = vehicle.get_rule(entry.rule_key)
-    display_name = rule.display_name if rule else entry.rule_key
+        entry = vehicle.history[args.index]
+        rule = vehicle.get_rule(entry.rule_key)
+        display_name = rule.display_name if rule else entry.rule_key
 
-    print(f"Deleting history entry {args.index} from {args.vehicle_file}:")
-    print(f"  {entry.date}  {display_name}")
-    if entry.mileage:
-        print(f"  Mileage: {entry.mileage:,.0f}")
-    print()
+        print(f"Deleting history entry {args.index} from {args.vehicle_file}:")
+        print(f"  {entry.date}  {display_name}")
+        if entry.mileage:
+            print(f"  Mileage: {entry.mileage:,.0f}")
+        print()
 
-    if args.dry_run:
-        print("(dry run - no changes made)")
-        return 0
+        if args.dry_run:
+            print("(dry run - no changes made)")
+            return 0
 
-    try:
-        delete_history_entry(args.vehicle_file, args.index)
-    except IndexError as e:
-        print(f"Error: {e}")
-        return 1
+        try:
+            vf.delete_history_entry(args.index)
+        except IndexError as e:
+            print(f"Error: {e}")
+            return 1
     print("Entry deleted.")
     return 0
 
@@ -596,53 +981,59 @@ def cmd_delete(args):
 
 def cmd_edit_rule(args):
     """Edit an existing rule by index."""
-    vehicle = load_vehicle(args.vehicle_file)
+    # Validate and write in one transaction so the file cannot change in between
+    with VehicleFile(args.vehicle_file) as vf:
+        vehicle = vf.vehicle
 
-    if args.index < 0 or args.index >= len(vehicle.rules):
-        print(f"Error: Index {args.index} out of range (0..{len(vehicle.rules) - 1})")
-        return 1
+        if args.index < 0 or args.index >= len(vehicle.rules):
+            print(
+                f"Error: Index {args.index} out of range (0..{len(vehicle.rules) - 1})"
+            )
+            return 1
 
-    existing = vehicle.rules[args.index]
+        existing = vehicle.rules[args.index]
 
-    def _ov(name, val):
-        return val if val is not None else getattr(existing, name)
+        def _ov(name, val):
+            return val if val is not None else getattr(existing, name)
 
-    # aftermarket: only override if explicitly set (--set-aftermarket true/false)
-    aftermarket = existing.aftermarket
-    if args.set_aftermarket is not None:
-        aftermarket = args.set_aftermarket.lower() == "true"
+        # aftermarket: only override if explicitly set (--set-aftermarket true/false)
+        aftermarket = existing.aftermarket
+        if args.set_aftermarket is not None:
+            aftermarket = args.set_aftermarket.lower() == "true"
 
-    rule = Rule(
-        item=_ov("item", args.item),
-        verb=_ov("verb", args.verb),
-        interval_miles=_ov("interval_miles", args.interval_miles),
-        interval_months=_ov("interval_months", args.interval_months),
-        severe_interval_miles=_ov("severe_interval_miles", args.severe_interval_miles),
-        severe_interval_months=_ov(
-            "severe_interval_months", args.severe_interval_months
-        ),
-        notes=_ov("notes", args.notes),
-        phase=_ov("phase", args.phase),
-        start_miles=_ov("start_miles", args.start_miles),
-        stop_miles=_ov("stop_miles", args.stop_miles),
-        start_months=_ov("start_months", args.start_months),
-        stop_months=_ov("stop_months", args.stop_months),
-        aftermarket=aftermarket,
-    )
+        rule = Rule(
+            item=_ov("item", args.item),
+            verb=_ov("verb", args.verb),
+            interval_miles=_ov("interval_miles", args.interval_miles),
+            interval_months=_ov("interval_months", args.interval_months),
+            severe_interval_miles=_ov(
+                "severe_interval_miles", args.severe_interval_miles
+            ),
+            severe_interval_months=_ov(
+                "severe_interval_months", args.severe_interval_months
+            ),
+            notes=_ov("notes", args.notes),
+            phase=_ov("phase", args.phase),
+            start_miles=_ov("start_miles", args.start_miles),
+            stop_miles=_ov("stop_miles", args.stop_miles),
+            start_months=_ov("start_months", args.start_months),
+            stop_months=_ov("stop_months", args.stop_months),
+            aftermarket=aftermarket,
+        )
 
-    print(f"Updating rule {args.index} in {args.vehicle_file}:")
-    print(f"  {rule.display_name}")
-    print()
+        print(f"Updating rule {args.index} in {args.vehicle_file}:")
+        print(f"  {rule.display_name}")
+        print()
 
-    if args.dry_run:
-        print("(dry run - no changes made)")
-        return 0
+        if args.dry_run:
+            print("(dry run - no changes made)")
+            return 0
 
-    try:
-        update_rule(args.vehicle_file, args.index, rule)
-    except IndexError as e:
-        print(f"Error: {e}")
-        return 1
+        try:
+            vf.update_rule(args.index, rule)
+        except IndexError as e:
+            print(f"Error: {e}")
+            return 1
     print("Rule updated.")
     return 0
 
@@ -654,28 +1045,32 @@ def cmd_edit_rule(args):
 
 def cmd_delete_rule(args):
     """Delete a rule by index."""
-    vehicle = load_vehicle(args.vehicle_file)
+    # Validate and write in one transaction so the file cannot change in between
+    with VehicleFile(args.vehicle_file) as vf:
+        vehicle = vf.vehicle
 
-    if args.index < 0 or args.index >= len(vehicle.rules):
-        print(f"Error: Index {args.index} out of range (0..{len(vehicle.rules) - 1})")
-        return 1
+        if args.index < 0 or args.index >= len(vehicle.rules):
+            print(
+                f"Error: Index {args.index} out of range (0..{len(vehicle.rules) - 1})"
+            )
+            return 1
 
-    rule = vehicle.rules[args.index]
+        rule = vehicle.rules[args.index]
 
-    print(f"Deleting rule {args.index} from {args.vehicle_file}:")
-    print(f"  {rule.display_name}")
-    print(f"  Key: {rule.key}")
-    print()
+        print(f"Deleting rule {args.index} from {args.vehicle_file}:")
+        print(f"  {rule.display_name}")
+        print(f"  Key: {rule.key}")
+        print()
 
-    if args.dry_run:
-        print("(dry run - no changes made)")
-        return 0
+        if args.dry_run:
+            print("(dry run - no changes made)")
+            return 0
 
-    try:
-        delete_rule(args.vehicle_file, args.index)
-    except IndexError as e:
-        print(f"Error: {e}")
-        return 1
+        try:
+            vf.delete_rule(args.index)
+        except IndexError as e:
+            print(f"Error: {e}")
+            return 1
     print("Rule deleted.")
     return 0
 
@@ -875,17 +1270,29 @@ def cmd_rules(args):
     """List available maintenance rules."""
     vehicle = load_vehicle(args.vehicle_file)
 
-    print(f"Vehicle: {vehicle.car.name}")
-    print(f"Rules: {len(vehicle.rules)}")
-    if args.show_index:
-        print("Index column is for: maint rules edit/delete <index> ...")
-    print()
-
     # Sort rules by item, then verb, then phase; keep (raw_index, rule)
     indexed = list(enumerate(vehicle.rules))
     sorted_indexed = sorted(
         indexed, key=lambda ir: (ir[1].item, ir[1].verb, ir[1].phase or "")
     )
+
+    if args.format != "table":
+        write_records(
+            args.format,
+            "rules",
+            RULE_FIELDS,
+            (rule_record(i, r) for i, r in sorted_indexed),
+            vehicle_meta(vehicle),
+        )
+        return 0
+
+    from tabulate import tabulate
+
+    print(f"Vehicle: {vehicle.car.name}")
+    print(f"Rules: {len(vehicle.rules)}")
+    if args.show_index:
+        print("Index column is for: maint rules edit/delete <index> ...")
+    print()
     indices = [ir[0] for ir in sorted_indexed]
     sorted_rules = [ir[1] for ir in sorted_indexed]
 
@@ -927,6 +1334,21 @@ def cmd_rules(args):
     return 0
 
 
+# =============================================================================
+# Compact command
+# =============================================================================
+
+
+def cmd_compact(args):
+    """Fold the history journal back into the vehicle file."""
+    folded = compact_history(args.vehicle_file)
+    if folded == 0:
+        print("No journaled history entries to compact.")
+        return 0
+    print(f"Folded {folded} journaled history entries into {args.vehicle_file}.")
+    return 0
+
+
 # =============================================================================
 # Chart command
 # =============================================================================
@@ -979,24 +1401,24 @@ def cmd_chart(args):
 # Main
 # =============================================================================
 
-
-def main():
-    parser = argparse.ArgumentParser(
-        description="Vehicle maintenance tracker",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
-    parser.add_argument(
-        "vehicle_file",
-        type=Path,
-        help="Path to vehicle YAML file (for create: path for new file; for others: existing file)",
-    )
-
-    subparsers = parser.add_subparsers(dest="command", required=True)
-
-    # Status subcommand
+COMMAND_HELP = {
+    "status": "Show what maintenance is due, overdue, or upcoming",
+    "history": "View or modify service history",
+    "add": "Create a new vehicle file",
+    "edit": "Edit vehicle info and/or current mileage",
+    "delete": "Delete the vehicle file",
+    "rules": "List or modify maintenance rules",
+    "compact": "Fold the append-only history journal back into the vehicle file",
+    "fleet": "Commands over every vehicle file in a directory",
+    "chart": "Show mileage over time with service markers",
+}
+
+
+def _add_status_parser(subparsers):
+    """Status subcommand."""
     status_parser = subparsers.add_parser(
         "status",
-        help="Show what maintenance is due, overdue, or upcoming",
+        help=COMMAND_HELP["status"],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 examples:
@@ -1004,6 +1426,8 @@ examples:
   %(prog)s vehicles/brz.yaml status --severe
   %(prog)s vehicles/brz.yaml status --miles-only
   %(prog)s vehicles/brz.yaml status --exclude-verbs inspect
+  %(prog)s vehicles/brz.yaml status --as-of 2023-06-30
+  %(prog)s vehicles/brz.yaml status --format json
 """,
     )
     status_parser.add_argument(
@@ -1029,11 +1453,27 @@ examples:
             '(comma-separated, e.g., "inspect,rotate")'
         ),
     )
+    status_parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="table",
+        help="Output format (json, ndjson and csv stream raw values; default: table)",
+    )
+    status_parser.add_argument(
+        "--as-of",
+        type=iso_date,
+        help=(
+            "Show status as it stood on a date (YYYY-MM-DD): later history is "
+            "ignored and mileage is interpolated between readings"
+        ),
+    )
 
-    # History subcommand (with nested edit/delete)
+
+def _add_history_parser(subparsers):
+    """History subcommand (with nested edit/delete)."""
     history_parser = subparsers.add_parser(
         "history",
-        help="View or modify service history",
+        help=COMMAND_HELP["history"],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 examples:
@@ -1041,6 +1481,7 @@ examples:
   %(prog)s vehicles/brz.yaml history --rule "oil"
   %(prog)s vehicles/brz.yaml history --since 2024-01-01
   %(prog)s vehicles/brz.yaml history --show-index
+  %(prog)s vehicles/brz.yaml history --format ndjson
 """,
     )
     history_parser.add_argument(
@@ -1050,7 +1491,7 @@ examples:
     )
     history_parser.add_argument(
         "--since",
-        type=str,
+        type=iso_date,
         help="Show only entries since date (YYYY-MM-DD)",
     )
     history_parser.add_argument(
@@ -1069,6 +1510,12 @@ examples:
         action="store_true",
         help="Show index column for use with: maint history edit/delete <index> ...",
     )
+    history_parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="table",
+        help="Output format (json, ndjson and csv stream raw values; default: table)",
+    )
     history_sub = history_parser.add_subparsers(dest="history_command", required=False)
     history_add_parser = history_sub.add_parser(
         "add",
@@ -1087,7 +1534,7 @@ examples:
     )
     history_add_parser.add_argument(
         "--date",
-        type=str,
+        type=iso_date,
         help="Service date in YYYY-MM-DD format (default: today)",
     )
     history_add_parser.add_argument(
@@ -1110,6 +1557,14 @@ examples:
         type=float,
         help="Cost of service",
     )
+    history_add_parser.add_argument(
+        "--journal",
+        action="store_true",
+        help=(
+            "Append to the history journal instead of rewriting the YAML "
+            "(fold back with: maint compact)"
+        ),
+    )
     history_add_parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -1137,7 +1592,7 @@ examples:
     )
     history_edit_parser.add_argument(
         "--date",
-        type=str,
+        type=iso_date,
         help="Service date in YYYY-MM-DD format",
     )
     history_edit_parser.add_argument(
@@ -1186,10 +1641,12 @@ examples:
         help="Show what would be deleted without saving",
     )
 
-    # Add (create vehicle file)
+
+def _add_add_parser(subparsers):
+    """Add (create vehicle file)."""
     add_parser = subparsers.add_parser(
         "add",
-        help="Create a new vehicle file",
+        help=COMMAND_HELP["add"],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 examples:
@@ -1207,7 +1664,7 @@ examples:
     add_parser.add_argument("--year", type=int, required=True, help="Year")
     add_parser.add_argument(
         "--purchase-date",
-        type=str,
+        type=iso_date,
         required=True,
         help="Purchase date (YYYY-MM-DD)",
     )
@@ -1224,7 +1681,7 @@ examples:
     )
     add_parser.add_argument(
         "--as-of-date",
-        type=str,
+        type=iso_date,
         help="Date for current mileage (YYYY-MM-DD)",
     )
     add_parser.add_argument(
@@ -1233,10 +1690,12 @@ examples:
         help="Show what would be created without saving",
     )
 
-    # Edit (vehicle info and/or current mileage)
+
+def _add_edit_parser(subparsers):
+    """Edit (vehicle info and/or current mileage)."""
     edit_parser = subparsers.add_parser(
         "edit",
-        help="Edit vehicle info and/or current mileage",
+        help=COMMAND_HELP["edit"],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 examples:
@@ -1250,7 +1709,7 @@ examples:
     edit_parser.add_argument("--trim", type=str, help="Trim")
     edit_parser.add_argument("--year", type=int, help="Year")
     edit_parser.add_argument(
-        "--purchase-date", type=str, help="Purchase date (YYYY-MM-DD)"
+        "--purchase-date", type=iso_date, help="Purchase date (YYYY-MM-DD)"
     )
     edit_parser.add_argument("--purchase-miles", type=float, help="Mileage at purchase")
     edit_parser.add_argument(
@@ -1260,7 +1719,7 @@ examples:
     )
     edit_parser.add_argument(
         "--as-of-date",
-        type=str,
+        type=iso_date,
         help="Date for current mileage (YYYY-MM-DD)",
     )
     edit_parser.add_argument(
@@ -1269,10 +1728,12 @@ examples:
         help="Show what would be updated without saving",
     )
 
-    # Delete (vehicle file)
+
+def _add_delete_parser(subparsers):
+    """Delete (vehicle file)."""
     delete_parser = subparsers.add_parser(
         "delete",
-        help="Delete the vehicle file",
+        help=COMMAND_HELP["delete"],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 examples:
@@ -1291,15 +1752,18 @@ examples:
         help="Show what would be deleted without saving",
     )
 
-    # Rules subcommand (with nested edit/delete)
+
+def _add_rules_parser(subparsers):
+    """Rules subcommand (with nested edit/delete)."""
     rules_parser = subparsers.add_parser(
         "rules",
-        help="List or modify maintenance rules",
+        help=COMMAND_HELP["rules"],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 examples:
   %(prog)s vehicles/brz.yaml rules
   %(prog)s vehicles/brz.yaml rules --show-index
+  %(prog)s vehicles/brz.yaml rules --format csv
 """,
     )
     rules_parser.add_argument(
@@ -1307,6 +1771,12 @@ examples:
         action="store_true",
         help="Show index column for use with: maint rules edit/delete <index> ...",
     )
+    rules_parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="table",
+        help="Output format (json, ndjson and csv stream raw values; default: table)",
+    )
     rules_sub = rules_parser.add_subparsers(dest="rules_command", required=False)
     rules_add_parser = rules_sub.add_parser(
         "add",
@@ -1479,10 +1949,77 @@ examples:
         help="Show what would be deleted without saving",
     )
 
-    # Chart subcommand
+
+def _add_compact_parser(subparsers):
+    """Compact subcommand."""
+    subparsers.add_parser(
+        "compact",
+        help=COMMAND_HELP["compact"],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+examples:
+  %(prog)s vehicles/brz.yaml compact
+""",
+    )
+
+
+def _add_fleet_parser(subparsers):
+    """Fleet subcommand (the path is a directory of vehicle files)."""
+    fleet_parser = subparsers.add_parser(
+        "fleet",
+        help=COMMAND_HELP["fleet"],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+examples:
+  %(prog)s vehicles fleet status
+  %(prog)s vehicles fleet status --workers 4 --chunksize 8
+  %(prog)s vehicles fleet status --severe --exclude-verbs inspect
+""",
+    )
+    fleet_sub = fleet_parser.add_subparsers(dest="fleet_command", required=True)
+    fleet_status_parser = fleet_sub.add_parser(
+        "status",
+        help="Overdue and due-soon services per vehicle, then fleet totals",
+    )
+    fleet_status_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes loading vehicle files (default: CPU count)",
+    )
+    fleet_status_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=1,
+        help="Vehicle files handed to a worker at a time (default: 1)",
+    )
+    fleet_status_parser.add_argument(
+        "--severe",
+        action="store_true",
+        help="Use severe driving intervals (shorter intervals)",
+    )
+    fleet_status_parser.add_argument(
+        "--miles-only",
+        action="store_true",
+        help="Only consider mileage-based intervals (ignore time)",
+    )
+    fleet_status_parser.add_argument(
+        "--time-only",
+        action="store_true",
+        help="Only consider time-based intervals (ignore mileage)",
+    )
+    fleet_status_parser.add_argument(
+        "--exclude-verbs",
+        type=str,
+        help="Exclude rules with specified verbs (comma-separated)",
+    )
+
+
+def _add_chart_parser(subparsers):
+    """Chart subcommand."""
     chart_parser = subparsers.add_parser(
         "chart",
-        help="Show mileage over time with service markers",
+        help=COMMAND_HELP["chart"],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 examples:
@@ -1496,13 +2033,80 @@ examples:
         help="Filter service markers to rules containing text (case-insensitive)",
     )
 
-    args = parser.parse_args()
+
+# Parsers are built only for the command being run; the rest get a stub
+# with their help line so `maint.py --help` still lists them.
+COMMAND_PARSERS = {
+    "status": _add_status_parser,
+    "history": _add_history_parser,
+    "add": _add_add_parser,
+    "edit": _add_edit_parser,
+    "delete": _add_delete_parser,
+    "rules": _add_rules_parser,
+    "compact": _add_compact_parser,
+    "fleet": _add_fleet_parser,
+    "chart": _add_chart_parser,
+}
+
+
+def requested_command(argv: List[str]) -> Optional[str]:
+    """The subcommand in argv (the second positional), if it is a known one."""
+    # The top-level options are all flags, so the first two positionals are
+    # always the vehicle file and the command; option values come after it
+    positionals = [a for a in argv if not a.startswith("-")]
+    if len(positionals) >= 2 and positionals[1] in COMMAND_PARSERS:
+        return positionals[1]
+    return None
+
+
+def build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the CLI parser with full arguments for command only.
+
+    With no command every subcommand is built in full.
+    """
+    parser = argparse.ArgumentParser(
+        description="Vehicle maintenance tracker",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "vehicle_file",
+        type=Path,
+        help="Path to vehicle YAML file (for create: path for new file; for others: existing file)",
+    )
+    backend = yaml_backend()
+    parser.add_argument(
+        "--yaml-backend",
+        action="version",
+        version=f"YAML loader: {backend.loader}, dumper: {backend.dumper}",
+        help="Show which PyYAML backend (libyaml or pure Python) is in use and exit",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, add_parser in COMMAND_PARSERS.items():
+        if command is None or name == command:
+            add_parser(subparsers)
+        else:
+            subparsers.add_parser(name, help=COMMAND_HELP[name])
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["serve-daemon"]:
+        return maint_daemon.run_daemon(argv[1:])
+    args = build_parser(requested_command(argv)).parse_args(argv)
 
     # Validate vehicle file: for "add" it must not exist; otherwise it must exist
     if args.command == "add":
         if args.vehicle_file.exists():
             print(f"Error: File already exists: {args.vehicle_file}")
             return 1
+    elif args.command == "fleet":
+        if not args.vehicle_file.is_dir():
+            print(f"Error: Not a directory: {args.vehicle_file}")
+            return 1
     else:
         if not args.vehicle_file.exists():
             print(f"Error: File not found: {args.vehicle_file}")
@@ -1535,9 +2139,19 @@ examples:
         return cmd_rules(args)
     elif args.command == "chart":
         return cmd_chart(args)
+    elif args.command == "compact":
+        return cmd_compact(args)
+    elif args.command == "fleet":
+        if args.fleet_command == "status":
+            return cmd_fleet_status(args)
 
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main() or 0)
+    try:
+        sys.exit(main() or 0)
+    except BrokenPipeError:
+        # Reader went away (e.g. `| head`); silence the flush at exit too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
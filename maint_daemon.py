@@ -0,0 +1,333 @@
+"""
+Persistent maint.py daemon with a warm vehicle cache.
+
+`maint.py serve-daemon` listens on a local Unix socket and runs read-only
+CLI commands (status, and listing history or rules) in one long-lived
+process. The parsed vehicles and their materialized status tables stay in
+the loader's cache between requests. Each request still stats the vehicle
+file and its journal, so an edit from any process is picked up on the
+next query.
+
+While the daemon is running, maint.py forwards those commands to it
+before importing the models package, so a forwarded command pays neither
+the imports nor the YAML parse. When the socket is missing, refuses the
+connection, or the daemon fails mid-request, the command simply runs
+locally. Set MAINT_NO_DAEMON=1 to never forward.
+
+This module only imports the standard library at load time; maint is
+imported by the server when it starts.
+"""
+
+import io
+import json
+import os
+import socket
+import stat
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from typing import List, Optional
+
+# Options of the commands the daemon serves, and whether each takes a value,
+# so an option's value is never mistaken for a subcommand. These must match
+# maint.py's parsers (the tests check); anything else runs locally.
+_SERVED_OPTIONS = {
+    "status": {
+        "--severe": False,
+        "--miles-only": False,
+        "--time-only": False,
+        "--exclude-verbs": True,
+        "--format": True,
+        "--as-of": True,
+    },
+    "history": {
+        "--rule": True,
+        "--since": True,
+        "--sort": True,
+        "--asc": False,
+        "--show-index": False,
+        "--format": True,
+    },
+    "rules": {
+        "--show-index": False,
+        "--format": True,
+    },
+}
+
+# Seconds a forwarding client waits for the daemon before running locally
+CLIENT_TIMEOUT = 30.0
+
+# Bumped whenever the request or response format changes
+PROTOCOL_VERSION = 1
+
+
+def code_version() -> str:
+    """
+    The protocol version and a stamp of the CLI's source files.
+
+    A client sends its own with every request and the daemon answers only
+    if it matches what it started with, so a daemon left running across an
+    upgrade (or an edit) is not asked to run the old code.
+    """
+    import hashlib
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    models = os.path.join(root, "models")
+    paths = [os.path.join(root, "maint.py"), os.path.join(root, "maint_daemon.py")]
+    try:
+        paths.extend(
+            entry.path for entry in os.scandir(models) if entry.name.endswith(".py")
+        )
+    except OSError:
+        pass
+    stamps = []
+    for path in sorted(paths):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps.append((os.path.basename(path), st.st_mtime_ns, st.st_size))
+    digest = hashlib.blake2b(repr(stamps).encode(), digest_size=8).hexdigest()
+    return f"{PROTOCOL_VERSION}-{digest}"
+
+
+def socket_path() -> str:
+    """Daemon socket: $MAINT_DAEMON_SOCKET, else per-user in the runtime dir."""
+    path = os.environ.get("MAINT_DAEMON_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    user = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    return os.path.join(runtime_dir, f"maint-{user}.sock")
+
+
+def _served_option(options: dict, arg: str) -> Optional[str]:
+    """The option arg names (exactly or by unique prefix, as argparse allows)."""
+    if arg in options:
+        return arg
+    matches = [name for name in options if name.startswith(arg)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def forwardable(argv: List[str]) -> bool:
+    """
+    True for the read-only commands the daemon serves.
+
+    argv must be exactly <file> <command> [options]: any positional after
+    the command (add, edit, delete, or a stray argument) and any option not
+    in _SERVED_OPTIONS (including -h) means the command runs locally.
+    """
+    # The top-level options (-h, --yaml-backend) only print and exit
+    if len(argv) < 2 or argv[0].startswith("-") or argv[1].startswith("-"):
+        return False
+    options = _SERVED_OPTIONS.get(argv[1])
+    if options is None:
+        return False
+    rest = iter(argv[2:])
+    for arg in rest:
+        if not arg.startswith("--"):
+            return False
+        name, has_value, _ = arg.partition("=")
+        option = _served_option(options, name)
+        if option is None or (has_value and not options[option]):
+            return False
+        if options[option] and not has_value and next(rest, None) is None:
+            return False
+    return True
+
+
+def _trusted_socket(path: str) -> bool:
+    """
+    True if path is a socket (not a symlink) owned by this user.
+
+    Without XDG_RUNTIME_DIR the socket lives in /tmp, where anyone can
+    create the name first; a socket planted there must not get our argv
+    or be able to write to our terminal.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(st.st_mode) and hasattr(os, "getuid") and st.st_uid == os.getuid()
+    )
+
+
+def _valid_response(response: object) -> bool:
+    return (
+        isinstance(response, dict)
+        and isinstance(response.get("stdout"), str)
+        and isinstance(response.get("stderr"), str)
+        and isinstance(response.get("exit"), int)
+        and not isinstance(response.get("exit"), bool)
+    )
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def forward(argv: List[str], path: Optional[str] = None) -> Optional[int]:
+    """
+    Run argv on the daemon and replay its output; return the exit status.
+
+    None means the command was not sent or got no answer, and should run
+    locally: so does a socket that is not ours, a daemon running other code
+    (see code_version), or a malformed response.
+    Nothing is written until the full response has arrived, so a fallback
+    never duplicates output.
+    """
+    if not hasattr(socket, "AF_UNIX") or os.environ.get("MAINT_NO_DAEMON"):
+        return None
+    if not forwardable(argv):
+        return None
+    path = path or socket_path()
+    if not _trusted_socket(path):
+        return None
+    request = {"argv": argv, "cwd": os.getcwd(), "version": code_version()}
+    request = json.dumps(request).encode() + b"\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(request)
+            sock.shutdown(socket.SHUT_WR)
+            response = json.loads(_recv_all(sock))
+    except (OSError, ValueError):
+        return None
+    if not _valid_response(response):
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit"]
+
+
+def handle_request(request: bytes, version: Optional[str] = None) -> dict:
+    """
+    Run one forwarded command in this process, capturing its output.
+
+    A request from a client whose code_version() differs from version (the
+    daemon's own) is refused with an error the client treats as no answer,
+    so it runs the command locally.
+    """
+    import maint
+
+    try:
+        message = json.loads(request)
+        argv, cwd = message["argv"], message["cwd"]
+    except (ValueError, KeyError, TypeError):
+        return {"exit": 2, "stdout": "", "stderr": "maint daemon: bad request\n"}
+    if message.get("version") != (version or code_version()):
+        return {"error": "version mismatch"}
+    if not forwardable(argv):
+        return {"exit": 2, "stdout": "", "stderr": "maint daemon: not served\n"}
+
+    out, err = io.StringIO(), io.StringIO()
+    try:
+        # Requests are served one at a time, so the working directory and
+        # the redirected streams are ours for the duration of the command
+        os.chdir(cwd)
+        with redirect_stdout(out), redirect_stderr(err):
+            code = maint.main(argv) or 0
+    except SystemExit as e:
+        # argparse errors and --version style exits
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        if isinstance(e.code, str):
+            err.write(e.code + "\n")
+    except Exception as e:
+        err.write(f"maint daemon: {type(e).__name__}: {e}\n")
+        code = 1
+    return {"exit": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+def _daemon_running(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def make_server(path: Optional[str] = None) -> socket.socket:
+    """
+    Bind the daemon's listening socket (owner-only) at path.
+
+    Raises FileExistsError if another daemon is already listening there; a
+    socket file left behind by a dead daemon is replaced.
+    """
+    path = path or socket_path()
+    if os.path.exists(path):
+        if _daemon_running(path):
+            raise FileExistsError(f"maint daemon already running on {path}")
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen()
+    return server
+
+
+def serve(server: socket.socket) -> None:
+    """Answer requests on a socket from make_server until it is closed."""
+    # The code this process runs is the code on disk now
+    version = code_version()
+    while True:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            return
+        with conn:
+            try:
+                response = handle_request(_recv_all(conn), version)
+                conn.sendall(json.dumps(response).encode())
+            except OSError:
+                # Client went away; nothing to tell it
+                pass
+
+
+def run_daemon(argv: List[str]) -> int:
+    """`maint.py serve-daemon [--socket PATH]`."""
+    import argparse
+    import signal
+
+    parser = argparse.ArgumentParser(
+        prog="maint.py serve-daemon",
+        description="Serve status/history/rules queries from a warm in-memory cache",
+    )
+    parser.add_argument(
+        "--socket",
+        default=socket_path(),
+        help="Unix socket path (default: %(default)s; env MAINT_DAEMON_SOCKET)",
+    )
+    args = parser.parse_args(argv)
+
+    # Import everything a request needs now rather than on the first query
+    import maint  # noqa: F401
+
+    try:
+        server = make_server(args.socket)
+    except FileExistsError as e:
+        print(f"Error: {e}")
+        return 1
+    # Stop like Ctrl-C, which a request's SystemExit handling cannot swallow
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"maint daemon listening on {args.socket}", flush=True)
+    try:
+        serve(server)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.unlink(args.socket)
+        except FileNotFoundError:
+            pass
+    return 0
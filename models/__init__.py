@@ -7,6 +7,7 @@ This package provides data models for tracking vehicle maintenance:
 - Car: Vehicle identification
 - HistoryEntry: Service records
 - ServiceDue: Calculated service status
+- StatusBundle: Every status variant of a vehicle, computed in one pass
 - Vehicle: Main aggregate combining all data
 """
 
@@ -15,11 +16,34 @@ from .car import Car
 from .rule import Rule
 from .history_entry import HistoryEntry
 from .service_due import ServiceDue
+from .status_bundle import StatusBundle
 from .vehicle import Vehicle
-from .calculations import calc_due_miles, calc_due_date, check_status
+from .calculations import (
+    calc_due_miles,
+    calc_due_date,
+    calc_due_dates,
+    due_date_cache_info,
+    clear_due_date_cache,
+    check_status,
+    parse_date,
+)
 from .loader import (
     load_vehicle,
+    load_vehicles,
+    parse_timings,
+    cache_info,
+    invalidate_cache,
+    clear_cache,
+    file_stamp,
+    yaml_backend,
+    add_write_listener,
+    remove_write_listener,
+    VehicleFile,
+    LockTimeout,
+    lock_stats,
     save_history_entry,
+    compact_history,
+    journal_path,
     update_history_entry,
     delete_history_entry,
     add_rule,
@@ -36,12 +60,31 @@ __all__ = [
     "Rule",
     "HistoryEntry",
     "ServiceDue",
+    "StatusBundle",
     "Vehicle",
     "calc_due_miles",
     "calc_due_date",
+    "calc_due_dates",
+    "due_date_cache_info",
+    "clear_due_date_cache",
     "check_status",
+    "parse_date",
     "load_vehicle",
+    "load_vehicles",
+    "parse_timings",
+    "cache_info",
+    "invalidate_cache",
+    "clear_cache",
+    "file_stamp",
+    "yaml_backend",
+    "add_write_listener",
+    "remove_write_listener",
+    "VehicleFile",
+    "LockTimeout",
+    "lock_stats",
     "save_history_entry",
+    "compact_history",
+    "journal_path",
     "update_history_entry",
     "delete_history_entry",
     "add_rule",
@@ -1,12 +1,33 @@
 """Helper functions for service due calculations."""
 
-from datetime import date
-from dateutil.relativedelta import relativedelta
-from typing import Optional
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Union
 
 from .status import Status
 
 
+def parse_date(value: Union[str, date], field: str = "date") -> date:
+    """
+    Parse a YYYY-MM-DD date string (date objects are passed through).
+
+    Anything else raises ValueError naming the field, so malformed dates are
+    rejected when a model is built instead of when a status is calculated.
+    """
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            parsed = date.fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            # fromisoformat also takes forms like 20240115; keep files uniform
+            if parsed.isoformat() == value:
+                return parsed
+    raise ValueError(f"Invalid {field} {value!r}: expected YYYY-MM-DD")
+
+
 def calc_due_miles(
     last_miles: Optional[float], interval: Optional[float], start_miles: float = 0
 ) -> Optional[float]:
@@ -23,15 +44,60 @@ def calc_due_miles(
     return start_miles + interval
 
 
+# Distinct (last date, interval) pairs whose due dates are kept
+DUE_DATE_CACHE_MAXSIZE = 4096
+
+
+@lru_cache(maxsize=DUE_DATE_CACHE_MAXSIZE)
+def _due_date(last_date: date, interval_months: float) -> date:
+    # Imported on first use: commands that never compute a due date skip it
+    from dateutil.relativedelta import relativedelta
+
+    months = int(interval_months)
+    days = int((interval_months - months) * 30)
+    return last_date + relativedelta(months=months, days=days)
+
+
 def calc_due_date(
     last_date: Optional[date], interval_months: Optional[float]
 ) -> Optional[date]:
-    """Calculate next due date: last + interval months."""
+    """
+    Calculate next due date: last + interval months.
+
+    Whole months are added first (clamping to the end of the month), then
+    the fractional part as 30-day months. Results are memoized per
+    (last_date, interval_months); see due_date_cache_info.
+    """
     if interval_months is None or last_date is None:
         return None
-    months = int(interval_months)
-    days = int((interval_months - months) * 30)
-    return last_date + relativedelta(months=months, days=days)
+    return _due_date(last_date, interval_months)
+
+
+def calc_due_dates(
+    last_dates: Sequence[Optional[date]], interval_months: Optional[float]
+) -> List[Optional[date]]:
+    """
+    calc_due_date for many last dates sharing one interval.
+
+    Each distinct date is computed (or taken from the memo) once.
+    """
+    if interval_months is None:
+        return [None] * len(last_dates)
+    due: Dict[Optional[date], Optional[date]] = {None: None}
+    for last_date in last_dates:
+        if last_date not in due:
+            due[last_date] = _due_date(last_date, interval_months)
+    return [due[last_date] for last_date in last_dates]
+
+
+def due_date_cache_info():
+    """Report hits, misses, maxsize and currsize of the due date memo."""
+    return _due_date.cache_info()
+
+
+def clear_due_date_cache() -> None:
+    """Empty the due date memo and reset its counters."""
+    _due_date.cache_clear()
 
 
 def check_status(current: float, due: float, soon_threshold: float) -> Status:
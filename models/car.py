@@ -2,10 +2,22 @@
 
 from typing import Optional
 
+from .calculations import parse_date
+
 
 class Car:
     """Vehicle identification and purchase information."""
 
+    __slots__ = (
+        "make",
+        "model",
+        "trim",
+        "year",
+        "_purchase_date",
+        "purchase_date_ordinal",
+        "purchase_miles",
+    )
+
     def __init__(
         self,
         make: str,
@@ -22,6 +34,17 @@ class Car:
         self.purchase_date = purchase_date
         self.purchase_miles = purchase_miles
 
+    @property
+    def purchase_date(self) -> str:
+        """Purchase date (YYYY-MM-DD); purchase_date_ordinal holds it parsed."""
+        return self._purchase_date
+
+    @purchase_date.setter
+    def purchase_date(self, value: str) -> None:
+        parsed = parse_date(value, "purchase date")
+        self._purchase_date = value if type(value) is str else parsed.isoformat()
+        self.purchase_date_ordinal = parsed.toordinal()
+
     @property
     def name(self) -> str:
         """Human-readable vehicle name."""
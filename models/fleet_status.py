@@ -0,0 +1,542 @@
+"""
+Vectorized service status for a whole fleet.
+
+fleet_service_status computes the same ServiceDue results as calling
+Vehicle.get_all_service_status on each vehicle, but packs every
+vehicle x rule pair into columnar NumPy arrays and derives due miles, due
+dates (as ordinals), remaining values and status codes in a few array passes.
+NumPy is optional; without it the scalar path is used. fleet_due_within
+answers "what is due in the next N days" from the projected dates.
+
+Vehicles that already hold a materialized status table for the requested
+options are served from it; the tables computed here are stored back on the
+vehicles for later calls.
+"""
+
+import bisect
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .history_entry import HistoryEntry
+from .rule import Rule
+from .service_due import ServiceDue
+from .status import Status
+from .status_bundle import _filter_by_verbs
+from .vehicle import Vehicle
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+HAS_NUMPY = np is not None
+
+# datetime64[D] counts days from 1970-01-01; date ordinals count from 0001-01-01
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_STATUS_BY_VALUE = {s.value: s for s in Status}
+
+_MAX_ORDINAL = date.max.toordinal()
+
+
+def fleet_service_status(
+    vehicles: Sequence[Vehicle],
+    due_soon_miles: float = 1000,
+    due_soon_months: float = 1,
+    severe: bool = False,
+    miles_only: bool = False,
+    time_only: bool = False,
+    exclude_verbs: Optional[List[str]] = None,
+    include_verbs: Optional[List[str]] = None,
+) -> List[List[ServiceDue]]:
+    """
+    Calculate service status for all active rules of every vehicle.
+
+    Arguments match Vehicle.get_all_service_status; the result holds one list
+    per vehicle, in order, equal to what that method returns.
+    """
+    if np is None:
+        return [
+            v.get_all_service_status(
+                due_soon_miles,
+                due_soon_months,
+                severe,
+                miles_only,
+                time_only,
+                exclude_verbs,
+                include_verbs,
+            )
+            for v in vehicles
+        ]
+
+    options = (due_soon_miles, due_soon_months, severe, miles_only, time_only)
+    tables = [v.cached_status(options) for v in vehicles]
+
+    # Pack one row per vehicle x rule of the vehicles without a table
+    rules, owners = _pack(vehicles, [i for i, t in enumerate(tables) if t is None])
+    computed: List[List[ServiceDue]] = [[] for _ in vehicles]
+    if rules:
+        last_services = _last_services(vehicles, rules, owners)
+        columns = _compute(
+            vehicles, rules, owners, last_services, due_soon_miles, *options[1:]
+        )
+        for i, row in _rows(rules, last_services, columns, range(len(rules))):
+            computed[i].append(row)
+    for i, vehicle in enumerate(vehicles):
+        if tables[i] is None:
+            tables[i] = computed[i]
+            vehicle.store_status(options, computed[i])
+
+    return [
+        _filter_by_verbs(v.rules, table, exclude_verbs, include_verbs)
+        for v, table in zip(vehicles, tables)
+    ]
+
+
+def fleet_due_within(
+    vehicles: Sequence[Vehicle],
+    days: int,
+    due_soon_miles: float = 1000,
+    due_soon_months: float = 1,
+    severe: bool = False,
+    miles_only: bool = False,
+    time_only: bool = False,
+    exclude_verbs: Optional[List[str]] = None,
+    include_verbs: Optional[List[str]] = None,
+) -> List[Tuple[int, ServiceDue]]:
+    """
+    Services projected due within days of each vehicle's as-of date.
+
+    Returns (vehicle index, ServiceDue) pairs, soonest projected date first;
+    services already past due are included. Other arguments match
+    fleet_service_status.
+
+    Vehicles holding a status table for these options are answered from it.
+    For the rest the projected dates come straight from the fleet arrays and
+    only the rows within the horizon are built; no tables are stored, so a
+    cold fleet costs one vectorized pass rather than a table per vehicle.
+    """
+    if np is None:
+        statuses = fleet_service_status(
+            vehicles,
+            due_soon_miles,
+            due_soon_months,
+            severe,
+            miles_only,
+            time_only,
+            exclude_verbs,
+            include_verbs,
+        )
+        due = []
+        for i, (vehicle, rows) in enumerate(zip(vehicles, statuses)):
+            horizon = date.fromordinal(vehicle.as_of_ordinal + days).isoformat()
+            due.extend(
+                (i, row)
+                for row in rows
+                if row.projected_date is not None and row.projected_date <= horizon
+            )
+        due.sort(key=lambda pair: (pair[1].projected_date, pair[0]))
+        return due
+
+    options = (due_soon_miles, due_soon_months, severe, miles_only, time_only)
+    due = []
+    cold = []
+    for i, vehicle in enumerate(vehicles):
+        table = vehicle.cached_status(options)
+        if table is None:
+            cold.append(i)
+            continue
+        horizon = date.fromordinal(vehicle.as_of_ordinal + days).isoformat()
+        due.extend(
+            (i, row)
+            for row in _filter_by_verbs(
+                vehicle.rules, table, exclude_verbs, include_verbs
+            )
+            if row.projected_date is not None and row.projected_date <= horizon
+        )
+
+    rules, owners = _pack(vehicles, cold, exclude_verbs, include_verbs)
+    if rules:
+        last_services = _last_services(vehicles, rules, owners)
+        columns = _compute(
+            vehicles, rules, owners, last_services, due_soon_miles, *options[1:]
+        )
+        horizon = columns.current_ordinal + days
+        within = (
+            columns.active
+            & columns.has_projected
+            & (columns.projected_ordinal <= horizon)
+        )
+        due.extend(
+            _rows(rules, last_services, columns, np.flatnonzero(within).tolist())
+        )
+    due.sort(key=lambda pair: (pair[1].projected_date, pair[0]))
+    return due
+
+
+def _pack(
+    vehicles: Sequence[Vehicle],
+    indices: Iterable[int],
+    exclude_verbs: Optional[List[str]] = None,
+    include_verbs: Optional[List[str]] = None,
+) -> Tuple[List[Rule], List[int]]:
+    """The rules (passing the verb filters) of vehicles[indices], and owners."""
+    rules: List[Rule] = []
+    owners: List[int] = []
+    for i in indices:
+        kept = _filter_by_verbs(
+            vehicles[i].rules, vehicles[i].rules, exclude_verbs, include_verbs
+        )
+        rules.extend(kept)
+        owners.extend([i] * len(kept))
+    return rules, owners
+
+
+def _last_services(
+    vehicles: Sequence[Vehicle], rules: List[Rule], owners: List[int]
+) -> List[Optional[HistoryEntry]]:
+    """
+    Last service of every packed vehicle x rule pair, for the fleet at once.
+
+    Equal to Vehicle.get_last_service_for_item(rule.item, rule.verb): each
+    lookup key (the rule's base key, and the base keys of same-item rules
+    whose counts_as has its verb) selects the entries whose rule key starts
+    with it, and the newest of those by (date, mileage), earlier in the
+    history on ties, is picked; entries with a mileage are preferred. Every
+    (vehicle, lookup key) group is resolved in one sort of the whole fleet's
+    history rather than through a per-vehicle index.
+    """
+    # counts_as aliases of each vehicle involved, as in its history index
+    aliases_of: Dict[int, Dict[Tuple[str, str], List[str]]] = {}
+    for i in dict.fromkeys(owners):
+        aliases = aliases_of[i] = {}
+        for rule in vehicles[i].rules:
+            for verb in dict.fromkeys(rule.counts_as):
+                aliases.setdefault((rule.item, verb), []).append(rule.base_key)
+    # Pairs whose rule has aliases: index -> every lookup key, base key first
+    aliased: Dict[int, List[str]] = {}
+    for pair, (rule, i) in enumerate(zip(rules, owners)):
+        extra = aliases_of[i].get((rule.item, rule.verb)) if aliases_of[i] else None
+        if extra:
+            aliased[pair] = [rule.base_key, *extra]
+
+    bases = sorted({rule.base_key for rule in rules}.union(*aliased.values()))
+    base_id = {base: b for b, base in enumerate(bases)}
+    width = len(bases)
+
+    # The whole history of every vehicle involved, one row per entry
+    entries: List[HistoryEntry] = []
+    entry_owner: List[int] = []
+    entry_position: List[int] = []
+    for i in aliases_of:
+        history = vehicles[i].history
+        entries.extend(history)
+        entry_owner.extend([i] * len(history))
+        entry_position.extend(range(len(history)))
+    if not entries:
+        return [None] * len(rules)
+
+    # Rule key -> lookup keys it starts with (keys starting with a base key
+    # are one run of the sorted keys), flattened: key k's lookup keys are
+    # matches[start[k]:start[k + 1]]
+    keys = sorted({h.rule_key for h in entries})
+    key_id = {key: k for k, key in enumerate(keys)}
+    matched: List[List[int]] = [[] for _ in keys]
+    for base, b in base_id.items():
+        for k in range(bisect.bisect_left(keys, base), len(keys)):
+            if not keys[k].startswith(base):
+                break
+            matched[k].append(b)
+    counts = np.array([len(m) for m in matched], dtype=np.int64)
+    start = np.concatenate(([0], np.cumsum(counts)))
+    matches = np.array([b for m in matched for b in m], dtype=np.int64)
+
+    # One row per (entry, lookup key it belongs to)
+    entry_key = np.array([key_id[h.rule_key] for h in entries], dtype=np.int64)
+    per_entry = counts[entry_key]
+    member = np.repeat(np.arange(len(entries)), per_entry)
+    if not len(member):
+        return [None] * len(rules)
+    offset = np.arange(len(member)) - np.repeat(
+        np.cumsum(per_entry) - per_entry, per_entry
+    )
+    group = (
+        np.array(entry_owner, dtype=np.int64)[member] * width
+        + matches[start[entry_key[member]] + offset]
+    )
+    ordinal = np.array([h.date_ordinal for h in entries], dtype=np.int64)[member]
+    mileage = np.array(
+        [np.nan if h.mileage is None else h.mileage for h in entries], dtype=float
+    )[member]
+    position = np.array(entry_position, dtype=np.int64)[member]
+
+    def newest(rows: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """Groups present in rows (sorted), and the newest entry of each."""
+        if not len(rows):
+            return rows, rows
+        order = rows[
+            np.lexsort(
+                (
+                    -position[rows],
+                    np.nan_to_num(mileage[rows]),
+                    ordinal[rows],
+                    group[rows],
+                )
+            )
+        ]
+        groups = group[order]
+        last = np.append(groups[1:] != groups[:-1], True)
+        return groups[last], member[order[last]]
+
+    def lookup(found: Tuple["np.ndarray", "np.ndarray"], wanted) -> "np.ndarray":
+        """Newest entry of each wanted group, -1 where it has none."""
+        groups, newest_entry = found
+        if not len(groups):
+            return np.full(len(wanted), -1, dtype=np.int64)
+        at = np.minimum(np.searchsorted(groups, wanted), len(groups) - 1)
+        return np.where(groups[at] == wanted, newest_entry[at], -1)
+
+    every = np.arange(len(member))
+    head = newest(every)
+    with_mileage = newest(every[~np.isnan(mileage)])
+
+    # One lookup key: its newest entry with mileage, else its newest entry
+    wanted = np.array(owners, dtype=np.int64) * width + np.array(
+        [base_id[rule.base_key] for rule in rules], dtype=np.int64
+    )
+    pick = lookup(with_mileage, wanted)
+    pick = np.where(pick >= 0, pick, lookup(head, wanted))
+    result = [None if e < 0 else entries[e] for e in pick.tolist()]
+
+    # Several lookup keys: the newest by (date, mileage) of each key's entry
+    # with mileage, else the newest by date of each key's newest entry (the
+    # first key wins ties)
+    for pair, pair_bases in aliased.items():
+        groups = owners[pair] * width + np.array(
+            [base_id[base] for base in pair_bases], dtype=np.int64
+        )
+        found = [entries[e] for e in lookup(with_mileage, groups).tolist() if e >= 0]
+        if found:
+            result[pair] = max(found, key=lambda h: (h.date_ordinal, h.mileage))
+            continue
+        found = [entries[e] for e in lookup(head, groups).tolist() if e >= 0]
+        result[pair] = max(found, key=lambda h: h.date_ordinal) if found else None
+    return result
+
+
+class _Columns(NamedTuple):
+    """Status of the packed vehicle x rule pairs, one array per quantity."""
+
+    owner: "np.ndarray"
+    current_ordinal: "np.ndarray"
+    active: "np.ndarray"
+    status: "np.ndarray"
+    has_due_miles: "np.ndarray"
+    due_miles: "np.ndarray"
+    miles_remaining: "np.ndarray"
+    has_due_date: "np.ndarray"
+    due_ordinal: "np.ndarray"
+    time_remaining: "np.ndarray"
+    has_projected: "np.ndarray"
+    projected_ordinal: "np.ndarray"
+
+
+def _compute(
+    vehicles: Sequence[Vehicle],
+    rules: list,
+    owners: List[int],
+    last_services: list,
+    due_soon_miles: float,
+    due_soon_months: float,
+    severe: bool,
+    miles_only: bool,
+    time_only: bool,
+) -> _Columns:
+    """Status columns for the packed vehicle x rule pairs (at least one)."""
+
+    def column(values) -> "np.ndarray":
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+    owner = np.array(owners, dtype=np.int64)
+    current_miles = np.array([v.current_miles for v in vehicles], dtype=float)[owner]
+    current_ordinal = np.array([v.as_of_ordinal for v in vehicles], dtype=np.int64)[
+        owner
+    ]
+    start_miles = column(r.start_miles for r in rules)
+    stop_miles = column(r.stop_miles for r in rules)
+    last_miles = column(h.mileage if h else None for h in last_services)
+    last_ordinal = np.array(
+        [h.date_ordinal if h else -1 for h in last_services], dtype=np.int64
+    )
+    interval_miles = column(r.interval_miles for r in rules)
+    interval_months = column(r.interval_months for r in rules)
+
+    # Severe intervals fall back to normal ones when unset (or zero)
+    if severe:
+        severe_miles = column(r.severe_interval_miles or None for r in rules)
+        severe_months = column(r.severe_interval_months or None for r in rules)
+        interval_miles = np.where(np.isnan(severe_miles), interval_miles, severe_miles)
+        interval_months = np.where(
+            np.isnan(severe_months), interval_months, severe_months
+        )
+    if miles_only:
+        interval_months = np.full(len(rules), np.nan)
+    if time_only:
+        interval_miles = np.full(len(rules), np.nan)
+
+    active = (start_miles <= current_miles) & (current_miles < stop_miles)
+
+    # Due miles: from the last service, else from the rule's start
+    has_due_miles = ~np.isnan(interval_miles)
+    due_miles = np.where(np.isnan(last_miles), start_miles, last_miles) + interval_miles
+
+    # Due date: last service + whole months (clamped to month end) + extra days
+    has_due_date = ~np.isnan(interval_months) & (last_ordinal >= 0)
+    due_ordinal = _add_months(
+        np.where(has_due_date, last_ordinal, current_ordinal),
+        np.where(has_due_date, interval_months, 0.0),
+    )
+
+    # Status: the worse of the mileage and date checks
+    status = np.full(len(rules), Status.OK.value, dtype=np.int64)
+    status = np.where(
+        has_due_miles,
+        _check_status(current_miles, due_miles, due_soon_miles),
+        status,
+    )
+    date_status = _check_status(current_ordinal, due_ordinal, int(due_soon_months * 30))
+    status = np.where(has_due_date, np.minimum(status, date_status), status)
+    status = np.where(has_due_miles | has_due_date, status, Status.UNKNOWN.value)
+    status = np.where(active, status, Status.INACTIVE.value)
+
+    miles_remaining = due_miles - current_miles
+    time_remaining = due_ordinal - current_ordinal
+
+    # Projected date: the earlier of the due date and when the remaining
+    # miles run out at the vehicle's mileage rate (not before the as-of date)
+    rate = column(v.mileage_rate().miles_per_day for v in vehicles)[owner]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.maximum(0, np.ceil(miles_remaining / rate))
+    has_projection = (
+        has_due_miles
+        & (due_miles != 0)
+        & ~np.isnan(rate)
+        & (days <= _MAX_ORDINAL - current_ordinal)
+    )
+    mileage_ordinal = current_ordinal + np.where(has_projection, days, 0).astype(
+        np.int64
+    )
+    projected_ordinal = np.where(
+        has_projection & has_due_date,
+        np.minimum(mileage_ordinal, due_ordinal),
+        np.where(has_projection, mileage_ordinal, due_ordinal),
+    )
+    has_projected = has_projection | has_due_date
+
+    return _Columns(
+        owner,
+        current_ordinal,
+        active,
+        status,
+        has_due_miles,
+        due_miles,
+        miles_remaining,
+        has_due_date,
+        due_ordinal,
+        time_remaining,
+        has_projected,
+        projected_ordinal,
+    )
+
+
+def _rows(
+    rules: List[Rule],
+    last_services: List[Optional[HistoryEntry]],
+    columns: _Columns,
+    indices: Sequence[int],
+) -> Iterator[Tuple[int, ServiceDue]]:
+    """(vehicle index, ServiceDue) for the given packed pairs, in order."""
+    picked = [column[indices].tolist() for column in columns[:1] + columns[2:]]
+    # A fleet's rows share few distinct dates
+    iso_dates: Dict[int, str] = {}
+
+    def iso_date(ordinal: int) -> str:
+        text = iso_dates.get(ordinal)
+        if text is None:
+            text = iso_dates[ordinal] = date.fromordinal(ordinal).isoformat()
+        return text
+
+    for (
+        pair,
+        i,
+        is_active,
+        code,
+        with_miles,
+        miles,
+        remaining,
+        with_date,
+        ordinal,
+        days,
+        with_projected,
+        projected,
+    ) in zip(indices, *picked):
+        rule = rules[pair]
+        if not is_active:
+            yield i, ServiceDue(rule=rule, status=Status.INACTIVE)
+            continue
+        last = last_services[pair]
+        due_date = iso_date(ordinal) if with_date else None
+        # Positional in field order: rule, status, last service miles/date,
+        # due miles/date, severe due miles/date, miles/days remaining,
+        # projected date
+        yield (
+            i,
+            ServiceDue(
+                rule,
+                _STATUS_BY_VALUE[code],
+                last.mileage if last else None,
+                last.date if last else None,
+                miles if with_miles else None,
+                due_date,
+                None,
+                None,
+                # Like the scalar path, a due mileage of 0 has no remaining
+                remaining if with_miles and miles else None,
+                days if with_date else None,
+                iso_date(projected) if with_projected else None,
+            ),
+        )
+
+
+def _check_status(current, due, soon_threshold) -> "np.ndarray":
+    """Vectorized check_status, returning Status values."""
+    return np.where(
+        current >= due,
+        Status.OVERDUE.value,
+        np.where(
+            current >= due - soon_threshold, Status.DUE_SOON.value, Status.OK.value
+        ),
+    )
+
+
+def _add_months(ordinal, interval_months) -> "np.ndarray":
+    """
+    Vectorized calc_due_date on ordinals.
+
+    Matches relativedelta(months=int(m), days=int((m - int(m)) * 30)): the
+    whole months are added first, clamping the day to the end of the month,
+    then the leftover days.
+    """
+    months = np.trunc(interval_months)
+    days = np.trunc((interval_months - months) * 30).astype(np.int64)
+
+    day = (ordinal - _EPOCH_ORDINAL).astype("datetime64[D]")
+    month = day.astype("datetime64[M]")
+    day_of_month = (day - month.astype("datetime64[D]")).astype(np.int64)
+
+    target = month + months.astype(np.int64)
+    month_length = (
+        (target + 1).astype("datetime64[D]") - target.astype("datetime64[D]")
+    ).astype(np.int64)
+    due = target.astype("datetime64[D]") + np.minimum(day_of_month, month_length - 1)
+    return due.astype(np.int64) + days + _EPOCH_ORDINAL
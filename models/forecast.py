@@ -0,0 +1,149 @@
+"""
+Mileage forecasting from a vehicle's service history.
+
+MileageRate fits miles per day by least squares over the (date, mileage)
+points of the history that fall within FORECAST_WINDOW_DAYS of the newest
+one. The regression sums are kept up to date as points are added, so
+logging a service does not refit the whole history. They are exact integers
+(mileage in thousandths of a mile), so the rate does not drift with the
+order points arrive in. project_date turns a
+ServiceDue's remaining miles into a calendar date at that rate.
+"""
+
+import bisect
+import math
+from collections import deque
+from datetime import date
+from typing import Deque, Iterable, Optional, Tuple
+
+# Only points this many days before the newest one feed the fitted rate
+FORECAST_WINDOW_DAYS = 730
+
+# Mileage is summed in units of 1/_MILEAGE_SCALE mile
+_MILEAGE_SCALE = 1000
+
+_MAX_ORDINAL = date.max.toordinal()
+
+
+class MileageRate:
+    """Rolling-window linear fit of odometer readings against date ordinals."""
+
+    __slots__ = (
+        "window_days",
+        "_points",
+        "_origin",
+        "_n",
+        "_sx",
+        "_sy",
+        "_sxx",
+        "_sxy",
+    )
+
+    def __init__(
+        self,
+        points: Iterable[Tuple[int, float]] = (),
+        window_days: int = FORECAST_WINDOW_DAYS,
+    ):
+        self.window_days = window_days
+        # (date ordinal, mileage), oldest first, all within the window
+        self._points: Deque[Tuple[int, float]] = deque()
+        # Ordinals are summed relative to this to keep the sums small
+        self._origin: Optional[int] = None
+        self._n = self._sx = self._sy = self._sxx = self._sxy = 0
+
+        # Batch fit: keep the window ending at the newest point, sum once
+        points = sorted(points)
+        if not points:
+            return
+        cutoff = points[-1][0] - window_days
+        points = points[bisect.bisect_left(points, (cutoff,)) :]
+        self._points.extend(points)
+        self._origin = origin = points[0][0]
+        xs = [ordinal - origin for ordinal, _ in points]
+        ys = [round(mileage * _MILEAGE_SCALE) for _, mileage in points]
+        self._n = len(points)
+        self._sx = sum(xs)
+        self._sy = sum(ys)
+        self._sxx = sum(x * x for x in xs)
+        self._sxy = sum(x * y for x, y in zip(xs, ys))
+
+    def copy(self) -> "MileageRate":
+        other = MileageRate(window_days=self.window_days)
+        other._points = deque(self._points)
+        other._origin = self._origin
+        other._n = self._n
+        other._sx, other._sy = self._sx, self._sy
+        other._sxx, other._sxy = self._sxx, self._sxy
+        return other
+
+    def _accumulate(self, ordinal: int, mileage: float, sign: int) -> None:
+        x = ordinal - self._origin
+        mileage = round(mileage * _MILEAGE_SCALE)
+        self._n += sign
+        self._sx += sign * x
+        self._sy += sign * mileage
+        self._sxx += sign * x * x
+        self._sxy += sign * x * mileage
+
+    def add(self, ordinal: int, mileage: float) -> None:
+        """Add one odometer reading, dropping points that leave the window."""
+        points = self._points
+        if self._origin is None:
+            self._origin = ordinal
+        if not points or ordinal >= points[-1][0]:
+            points.append((ordinal, mileage))
+            self._accumulate(ordinal, mileage, 1)
+            while points[0][0] < ordinal - self.window_days:
+                self._accumulate(*points.popleft(), -1)
+        elif ordinal >= points[-1][0] - self.window_days:
+            # Older than the newest point but still inside the window
+            bisect.insort(points, (ordinal, mileage))
+            self._accumulate(ordinal, mileage, 1)
+
+    @property
+    def points(self) -> int:
+        """Number of readings currently in the window."""
+        return self._n
+
+    @property
+    def miles_per_day(self) -> Optional[float]:
+        """
+        Fitted slope in miles per day.
+
+        None with fewer than two distinct dates in the window, or when the
+        fit is not increasing (a rate that never reaches the next service).
+        """
+        if self._n < 2:
+            return None
+        denominator = self._n * self._sxx - self._sx * self._sx
+        if denominator <= 0:
+            return None
+        numerator = self._n * self._sxy - self._sx * self._sy
+        if numerator <= 0:
+            return None
+        return numerator / (denominator * _MILEAGE_SCALE)
+
+
+def project_date(
+    due_date: Optional[str],
+    miles_remaining: Optional[float],
+    miles_per_day: Optional[float],
+    as_of_ordinal: int,
+) -> Optional[str]:
+    """
+    Projected calendar date a service falls due (YYYY-MM-DD).
+
+    The earlier of the time-based due date and the day the remaining miles
+    run out at miles_per_day (the as-of date itself once they have run
+    out); whichever is known when only one is.
+    """
+    projected = None
+    if miles_remaining is not None and miles_per_day:
+        days = max(0, math.ceil(miles_remaining / miles_per_day))
+        if days <= _MAX_ORDINAL - as_of_ordinal:
+            projected = date.fromordinal(as_of_ordinal + days).isoformat()
+    if due_date is None:
+        return projected
+    if projected is None:
+        return due_date
+    return min(due_date, projected)
@@ -1,10 +1,35 @@
 """HistoryEntry class for maintenance records."""
 
+import sys
 from typing import Optional
 
+from .calculations import parse_date
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if type(value) is str else value
+
 
 class HistoryEntry:
-    """A record of maintenance performed."""
+    """
+    A record of maintenance performed.
+
+    Rule keys, dates and performedBy repeat across a long history, so they
+    are interned: every entry for "oil/replace" shares one string.
+
+    The date is validated and parsed once; date_ordinal holds it as a
+    proleptic Gregorian ordinal for comparisons and date arithmetic.
+    """
+
+    __slots__ = (
+        "rule_key",
+        "_date",
+        "date_ordinal",
+        "mileage",
+        "performed_by",
+        "notes",
+        "cost",
+    )
 
     def __init__(
         self,
@@ -15,9 +40,20 @@ class HistoryEntry:
         notes: Optional[str] = None,
         cost: Optional[float] = None,
     ):
-        self.rule_key = rule_key
+        self.rule_key = _intern(rule_key)
         self.date = date
         self.mileage = mileage
-        self.performed_by = performed_by
+        self.performed_by = _intern(performed_by)
         self.notes = notes
         self.cost = cost
+
+    @property
+    def date(self) -> str:
+        """Service date (YYYY-MM-DD)."""
+        return self._date
+
+    @date.setter
+    def date(self, value: str) -> None:
+        parsed = parse_date(value, "date")
+        self._date = _intern(value if type(value) is str else parsed.isoformat())
+        self.date_ordinal = parsed.toordinal()
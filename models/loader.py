@@ -1,157 +1,730 @@
 """YAML loading and saving utilities for vehicle data."""
 
 import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import yaml
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no advisory flock
+    fcntl = None
+
+from .calculations import parse_date
 from .car import Car
 from .rule import Rule
 from .history_entry import HistoryEntry
 from .vehicle import Vehicle
 
+logger = logging.getLogger(__name__)
 
-def _parse_object(dct: Dict[str, Any]) -> Union[Car, Rule, HistoryEntry, Vehicle, dict]:
-    """Parse dictionary into appropriate object type."""
-    # Car object (inside 'car' key)
-    if "make" in dct and "model" in dct:
-        return Car(
-            dct["make"],
-            dct["model"],
-            dct.get("trim"),
-            dct["year"],
-            dct["purchaseDate"],
-            dct["purchaseMiles"],
-        )
-    # Rule object
-    elif "item" in dct and "verb" in dct:
-        return Rule(
-            dct["item"],
-            dct["verb"],
-            dct.get("intervalMiles"),
-            dct.get("intervalMonths"),
-            dct.get("severeIntervalMiles"),
-            dct.get("severeIntervalMonths"),
-            dct.get("notes"),
-            dct.get("phase"),
-            dct.get("startMiles"),
-            dct.get("stopMiles"),
-            dct.get("startMonths"),
-            dct.get("stopMonths"),
-            dct.get("aftermarket"),
-            dct.get("countsAs"),
-        )
-    # History entry
-    elif "ruleKey" in dct:
-        return HistoryEntry(
-            dct["ruleKey"],
-            dct["date"],
-            dct.get("mileage"),
-            dct.get("performedBy"),
-            dct.get("notes"),
-            dct.get("cost"),
-        )
-    # Top-level vehicle object
-    elif "car" in dct and "rules" in dct:
-        state = dct.get("state") or {}
-        return Vehicle(
-            dct["car"],
-            dct["rules"],
-            dct.get("history"),
-            state.get("asOfDate"),
-            state.get("currentMiles"),
-        )
-    else:
-        # Return dict as-is for unknown structures (like 'state')
-        return dct
+# Prefer the libyaml-backed parser when PyYAML was built with it. It produces
+# the same documents as the pure-Python SafeLoader, only faster.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
+# Writes stay on the pure-Python emitter: libyaml folds long double-quoted
+# scalars at different points, so CSafeDumper would churn existing files.
+_YAML_DUMPER = yaml.SafeDumper
 
-def load_vehicle(filename: Union[str, Path]) -> Vehicle:
-    """Load a vehicle from a YAML file."""
+
+class YamlBackend(NamedTuple):
+    """Which PyYAML implementation handles loading and dumping."""
+
+    loader: str
+    dumper: str
+
+
+def _backend_name(cls: type) -> str:
+    return "libyaml" if cls.__name__.startswith("C") else "python"
+
+
+def yaml_backend() -> YamlBackend:
+    """Report the YAML backends in use ("libyaml" or "python")."""
+    return YamlBackend(_backend_name(_YAML_LOADER), _backend_name(_YAML_DUMPER))
+
+
+def _load_yaml(filename: Union[str, Path]) -> Any:
+    """Read a YAML document from disk with the fastest safe loader available."""
     with open(filename, "rb") as fp:
-        json_data = json.dumps(yaml.load(fp, Loader=yaml.SafeLoader), indent=4)
-        return json.loads(json_data, object_hook=_parse_object)
+        return yaml.load(fp, Loader=_YAML_LOADER)
+
 
+def _fsync_dir(directory: Union[str, Path]) -> None:
+    """Flush a directory entry (e.g. a rename) to disk where the OS allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on some platforms (e.g. Windows)
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
-def save_history_entry(filename: Union[str, Path], entry: HistoryEntry) -> None:
+
+def _dump_yaml(filename: Union[str, Path], data: Dict[str, Any]) -> None:
     """
-    Append a history entry to a vehicle YAML file.
+    Write a YAML document with the project's canonical formatting.
 
-    Loads the raw YAML, appends the entry to the history list,
-    and writes back to the file.
+    The document is written to a temporary file in the same directory,
+    fsynced, and renamed over the target, so readers and crashes only ever
+    see the old or the new file, never a partial one.
     """
-    # Load the raw YAML data (not parsed into objects)
-    with open(filename, "r") as fp:
-        data = yaml.load(fp, Loader=yaml.SafeLoader)
+    import secrets
 
-    # Ensure history list exists
-    if data.get("history") is None:
-        data["history"] = []
+    # Write through symlinks rather than replacing the link itself
+    target = Path(os.path.realpath(filename))
+    tmp = target.with_name(f".{target.name}.{secrets.token_hex(4)}.tmp")
 
-    # Build the entry dict, omitting None values for cleaner YAML
-    entry_dict = {"ruleKey": entry.rule_key, "date": entry.date}
-    if entry.mileage is not None:
-        entry_dict["mileage"] = entry.mileage
-    if entry.performed_by is not None:
-        entry_dict["performedBy"] = entry.performed_by
-    if entry.notes is not None:
-        entry_dict["notes"] = entry.notes
-    if entry.cost is not None:
-        entry_dict["cost"] = entry.cost
-
-    # Append the new entry
-    data["history"].append(entry_dict)
-
-    # Write back to file
-    with open(filename, "w") as fp:
-        yaml.dump(
-            data,
-            fp,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=120,
+    # 0o666 lets the umask pick the mode for new files, like open(..., "w")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w") as fp:
+            yaml.dump(
+                data,
+                fp,
+                Dumper=_YAML_DUMPER,
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+                width=120,
+            )
+            fp.flush()
+            os.fsync(fp.fileno())
+        try:
+            os.chmod(tmp, os.stat(target).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _fsync_dir(target.parent)
+
+
+# =============================================================================
+# Cross-process locking
+# =============================================================================
+
+# Default seconds to wait for a vehicle file lock before giving up
+LOCK_TIMEOUT = 10.0
+
+# Polling backoff while a lock is held elsewhere (seconds)
+_LOCK_POLL_MIN = 0.001
+_LOCK_POLL_MAX = 0.05
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a vehicle file lock cannot be acquired in time."""
+
+
+class LockStats(NamedTuple):
+    """Counters for vehicle file lock acquisition in this process."""
+
+    acquired: int
+    contended: int
+    timeouts: int
+    wait_seconds: float
+    max_wait_seconds: float
+
+
+_lock_stats_lock = threading.Lock()
+_lock_acquired = 0
+_lock_contended = 0
+_lock_timeouts = 0
+_lock_wait = 0.0
+_lock_max_wait = 0.0
+
+# Lock files held by the current thread, so nested operations do not deadlock
+_held_locks = threading.local()
+
+
+def lock_path(filename: Union[str, Path]) -> Path:
+    """
+    Path of the hidden lock file beside a vehicle file.
+
+    A separate file is locked because writes replace the vehicle file (and
+    with it any lock held on the old inode).
+    """
+    target = Path(os.path.realpath(filename))
+    return target.with_name(f".{target.name}.lock")
+
+
+def lock_stats() -> LockStats:
+    """Report how often and how long this process waited for file locks."""
+    with _lock_stats_lock:
+        return LockStats(
+            _lock_acquired, _lock_contended, _lock_timeouts, _lock_wait, _lock_max_wait
         )
 
 
-def update_history_entry(
-    filename: Union[str, Path], index: int, entry: HistoryEntry
+def reset_lock_stats() -> None:
+    """Zero the lock acquisition counters."""
+    global _lock_acquired, _lock_contended, _lock_timeouts, _lock_wait, _lock_max_wait
+    with _lock_stats_lock:
+        _lock_acquired = _lock_contended = _lock_timeouts = 0
+        _lock_wait = _lock_max_wait = 0.0
+
+
+def _record_lock(waited: float, contended: bool, timed_out: bool) -> None:
+    global _lock_acquired, _lock_contended, _lock_timeouts, _lock_wait, _lock_max_wait
+    with _lock_stats_lock:
+        if timed_out:
+            _lock_timeouts += 1
+        else:
+            _lock_acquired += 1
+        if contended:
+            _lock_contended += 1
+            _lock_wait += waited
+            _lock_max_wait = max(_lock_max_wait, waited)
+
+
+@contextmanager
+def _file_lock(
+    filename: Union[str, Path], exclusive: bool, timeout: Optional[float] = None
+) -> Iterator[None]:
+    """
+    Hold an advisory lock on a vehicle file for the duration of the block.
+
+    Shared locks (readers) never block each other; an exclusive lock
+    (writers) waits for every other holder. Raises LockTimeout after
+    timeout seconds (default LOCK_TIMEOUT). Without fcntl, or when a reader
+    cannot create the lock file, the block runs unlocked.
+    """
+    path = lock_path(filename)
+    held = _held_locks.__dict__.setdefault("paths", set())
+    if fcntl is None or path in held:
+        yield
+        return
+
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    except OSError:
+        if exclusive:
+            raise
+        # e.g. a read-only vehicles directory: nobody can write there either
+        yield
+        return
+
+    try:
+        mode = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+        if timeout is None:
+            timeout = LOCK_TIMEOUT
+        start = time.monotonic()
+        delay = _LOCK_POLL_MIN
+        contended = False
+        while True:
+            try:
+                fcntl.flock(fd, mode)
+                break
+            except BlockingIOError:
+                contended = True
+                waited = time.monotonic() - start
+                if waited >= timeout:
+                    _record_lock(waited, contended, timed_out=True)
+                    kind = "exclusive" if exclusive else "shared"
+                    raise LockTimeout(
+                        f"Timed out after {timeout:g}s waiting for {kind} lock on {filename}"
+                    ) from None
+                time.sleep(min(delay, timeout - waited))
+                delay = min(delay * 2, _LOCK_POLL_MAX)
+        _record_lock(time.monotonic() - start, contended, timed_out=False)
+
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+# =============================================================================
+# History journal
+# =============================================================================
+
+# Sidecar holding history entries appended since the YAML was last rewritten
+JOURNAL_SUFFIX = ".history.log"
+
+# Top-level YAML key recording which journal entries the YAML already holds
+JOURNAL_FOLD_KEY = "journalFold"
+
+
+def journal_path(filename: Union[str, Path]) -> Path:
+    """
+    Path of the append-only history journal beside a vehicle file.
+
+    Like lock_path, symlinks are resolved first, so writers reaching the
+    vehicle through different paths share one journal.
+    """
+    return Path(os.path.realpath(filename)).with_suffix(JOURNAL_SUFFIX)
+
+
+def _read_journal(
+    filename: Union[str, Path],
+) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """
+    Read a journal: (its id, the history entries in it).
+
+    The first line of a journal is a header naming it ({"journal": id});
+    journals written before headers existed have None for an id. Each
+    further line is one JSON history entry. A final line without its newline
+    is an append that never completed and is ignored. Any other line that
+    is not a JSON object is logged and skipped rather than making the whole
+    vehicle unloadable.
+    """
+    path = journal_path(filename)
+    try:
+        fp = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return None, []
+    journal_id = None
+    entries = []
+    with fp:
+        for lineno, line in enumerate(fp, 1):
+            if not line.endswith("\n") or not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = None
+            if not isinstance(entry, dict):
+                logger.warning("%s:%d: skipping malformed journal line", path, lineno)
+                continue
+            if lineno == 1 and "journal" in entry:
+                journal_id = entry["journal"]
+                continue
+            entries.append(entry)
+    return journal_id, entries
+
+
+def _unfolded(
+    data: Dict[str, Any], journal_id: Optional[str], entries: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    The journal entries the YAML document does not already hold.
+
+    Folding rewrites the YAML and then deletes the journal; a crash in
+    between leaves both. The YAML records the journal id and how many of
+    its entries it took in (JOURNAL_FOLD_KEY), so those are not applied
+    twice, while entries appended after the crash still are.
+    """
+    fold = data.get(JOURNAL_FOLD_KEY) or {}
+    if journal_id is not None and fold.get("journal") == journal_id:
+        return entries[fold.get("entries", 0) :]
+    return entries
+
+
+def _terminate_journal(path: Path) -> None:
+    """
+    Cut an interrupted append (a last line without its newline) off a journal.
+
+    Appending after such a fragment would glue the new entry onto it; the
+    caller holds the exclusive lock, so no append is in progress.
+    """
+    try:
+        fp = open(path, "rb+")
+    except FileNotFoundError:
+        return
+    with fp:
+        size = fp.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        fp.seek(size - 1)
+        if fp.read(1) == b"\n":
+            return
+        fp.seek(0)
+        keep = fp.read().rfind(b"\n") + 1
+        fp.truncate(keep)
+        fp.flush()
+        os.fsync(fp.fileno())
+    logger.warning("%s: dropped %d bytes of an interrupted append", path, size - keep)
+
+
+def _load_document(filename: Union[str, Path]) -> Dict[str, Any]:
+    """Load the raw vehicle document with journaled history merged in."""
+    data = _load_yaml(filename)
+    _merge_journal(filename, data)
+    return data
+
+
+def _merge_journal(filename: Union[str, Path], data: Dict[str, Any]) -> int:
+    """Append the unfolded journal entries to data's history; return how many."""
+    journaled = _unfolded(data, *_read_journal(filename))
+    if journaled:
+        if data.get("history") is None:
+            data["history"] = []
+        data["history"].extend(journaled)
+    return len(journaled)
+
+
+def _write_document(filename: Union[str, Path], data: Dict[str, Any]) -> None:
+    """
+    Write the full vehicle document, folding away any journal.
+
+    data must already include the journal's entries (as _load_document
+    returns it). Callers bring the parsed-vehicle cache up to date
+    (_update_cached).
+    """
+    journal_id, entries = _read_journal(filename)
+    if journal_id is not None:
+        data[JOURNAL_FOLD_KEY] = {"journal": journal_id, "entries": len(entries)}
+    else:
+        data.pop(JOURNAL_FOLD_KEY, None)
+    _dump_yaml(filename, data)
+    journal_path(filename).unlink(missing_ok=True)
+
+
+def _parse_car(dct: Dict[str, Any]) -> Car:
+    """Build a Car from its YAML mapping."""
+    return Car(
+        dct["make"],
+        dct["model"],
+        dct.get("trim"),
+        dct["year"],
+        dct["purchaseDate"],
+        dct["purchaseMiles"],
+    )
+
+
+def _parse_rule(dct: Dict[str, Any]) -> Rule:
+    """Build a Rule from its YAML mapping."""
+    return Rule(
+        dct["item"],
+        dct["verb"],
+        dct.get("intervalMiles"),
+        dct.get("intervalMonths"),
+        dct.get("severeIntervalMiles"),
+        dct.get("severeIntervalMonths"),
+        dct.get("notes"),
+        dct.get("phase"),
+        dct.get("startMiles"),
+        dct.get("stopMiles"),
+        dct.get("startMonths"),
+        dct.get("stopMonths"),
+        dct.get("aftermarket"),
+        dct.get("countsAs"),
+    )
+
+
+def _parse_history_entry(dct: Dict[str, Any]) -> HistoryEntry:
+    """Build a HistoryEntry from its YAML mapping."""
+    return HistoryEntry(
+        dct["ruleKey"],
+        dct["date"],
+        dct.get("mileage"),
+        dct.get("performedBy"),
+        dct.get("notes"),
+        dct.get("cost"),
+    )
+
+
+def _parse_vehicle(data: Dict[str, Any]) -> Vehicle:
+    """Build a Vehicle directly from the SafeLoader document."""
+    state = data.get("state") or {}
+    return Vehicle(
+        _parse_car(data["car"]),
+        [_parse_rule(r) for r in data.get("rules") or []],
+        [_parse_history_entry(h) for h in data.get("history") or []],
+        state.get("asOfDate"),
+        state.get("currentMiles"),
+    )
+
+
+# =============================================================================
+# Parsed-vehicle cache
+# =============================================================================
+
+# Maximum number of parsed vehicles kept in memory (least recently used evicted)
+CACHE_MAXSIZE = 64
+
+
+class CacheInfo(NamedTuple):
+    """Hit/miss counters and occupancy of the parsed-vehicle cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+# abspath -> (file stamp, Vehicle), ordered oldest to newest use
+_cache: "OrderedDict[str, Tuple[Tuple[int, ...], Vehicle]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+# abspath -> seconds its most recent parse (cache miss) took
+_parse_seconds: Dict[str, float] = {}
+
+
+def _cache_key(filename: Union[str, Path]) -> str:
+    """Normalize a vehicle path so relative and absolute spellings share a slot."""
+    return os.path.abspath(filename)
+
+
+def file_stamp(filename: Union[str, Path]) -> Tuple[int, ...]:
+    """Return the (mtime_ns, size) of the file and its journal, if any."""
+    st = os.stat(filename)
+    try:
+        jst = os.stat(journal_path(filename))
+    except FileNotFoundError:
+        return (st.st_mtime_ns, st.st_size)
+    return (st.st_mtime_ns, st.st_size, jst.st_mtime_ns, jst.st_size)
+
+
+def cache_info() -> CacheInfo:
+    """Report hit/miss counters and current size of the parsed-vehicle cache."""
+    with _cache_lock:
+        return CacheInfo(_cache_hits, _cache_misses, CACHE_MAXSIZE, len(_cache))
+
+
+def invalidate_cache(filename: Union[str, Path]) -> None:
+    """Drop the cached vehicle for a file so the next load re-parses it."""
+    with _cache_lock:
+        _cache.pop(_cache_key(filename), None)
+
+
+def clear_cache() -> None:
+    """Empty the parsed-vehicle cache and reset its counters."""
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        _cache.clear()
+        _cache_hits = 0
+        _cache_misses = 0
+        _parse_seconds.clear()
+
+
+def _update_cached(
+    filename: Union[str, Path],
+    stamp: Tuple[int, ...],
+    ops: List[Tuple[Any, ...]],
+) -> Optional[Vehicle]:
+    """
+    Carry the cached vehicle for a file across a write instead of dropping it.
+
+    stamp is the file stamp the write started from (taken under the exclusive
+    lock) and ops the edits it made, as (Vehicle method name, *args) with
+    models in their written dict form. When the cached vehicle was parsed
+    from that same stamp, the edits are replayed on a copy of it (so callers
+    holding the old object see no change), which recomputes only the status
+    rows they touch, and the updated vehicle is returned. Otherwise the
+    entry is dropped and None returned.
+    """
+    key = _cache_key(filename)
+    new_stamp = file_stamp(filename)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] != stamp:
+            del _cache[key]
+            return None
+        try:
+            vehicle = cached[1].copy()
+            for name, *args in map(_replay_args, ops):
+                getattr(vehicle, name)(*args)
+        except Exception:
+            # The file is written either way; the next load re-parses it
+            del _cache[key]
+            return None
+        _cache[key] = (new_stamp, vehicle)
+        return vehicle
+
+
+# =============================================================================
+# Write listeners
+# =============================================================================
+
+WriteListener = Callable[[str, Optional[Vehicle]], None]
+
+_write_listeners: List[WriteListener] = []
+
+
+def add_write_listener(listener: WriteListener) -> WriteListener:
+    """
+    Call listener(path, vehicle) after every write made through this module.
+
+    path is the absolute path of the vehicle file; vehicle is the vehicle as
+    just written (None when the file was deleted). Listeners run in the
+    writing thread while the file is still locked, so they must not write to
+    it. Returns the listener, so this also works as a decorator.
+    """
+    _write_listeners.append(listener)
+    return listener
+
+
+def remove_write_listener(listener: WriteListener) -> None:
+    """Stop calling a listener registered with add_write_listener."""
+    _write_listeners.remove(listener)
+
+
+def _notify_write(
+    filename: Union[str, Path], vehicle: Callable[[], Optional[Vehicle]]
 ) -> None:
     """
-    Replace a history entry at the given index in a vehicle YAML file.
+    Tell the write listeners a file changed.
+
+    vehicle is only called when someone is listening, so writers without
+    listeners pay nothing for building the vehicle. A failing listener is
+    reported and does not undo or fail the write.
+    """
+    if not _write_listeners:
+        return
+    path = _cache_key(filename)
+    current = vehicle()
+    for listener in list(_write_listeners):
+        try:
+            listener(path, current)
+        except Exception:
+            logger.exception("%s: write listener %r failed", path, listener)
+
+
+def _replay_args(op: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Parse the dict arguments of a recorded edit back into models."""
+    name, *args = op
+    if name in ("add_history_entry", "update_history_entry"):
+        args[-1] = _parse_history_entry(args[-1])
+    elif name in ("add_rule", "update_rule"):
+        args[-1] = _parse_rule(args[-1])
+    elif name == "update_meta" and args[0] is not None:
+        args[0] = _parse_car(args[0])
+    return (name, *args)
+
+
+def _read_vehicle(filename: Union[str, Path]) -> Vehicle:
+    """Parse a vehicle YAML file (plus journal) into model objects (uncached)."""
+    return _parse_vehicle(_load_document(filename))
+
+
+def load_vehicle(filename: Union[str, Path]) -> Vehicle:
+    """
+    Load a vehicle from a YAML file.
+
+    History entries appended to the journal (see save_history_entry) are
+    merged in after those in the YAML. Parsed vehicles are cached per path
+    and reused for as long as the modification time and size of the file
+    and its journal are unchanged, so the returned Vehicle may be
+    shared with other callers and should be treated as read-only.
+    """
+    global _cache_hits, _cache_misses
+    key = _cache_key(filename)
+    stamp = file_stamp(filename)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _cache.move_to_end(key)
+            _cache_hits += 1
+            return cached[1]
+        _cache_misses += 1
+
+    # A shared lock keeps writers from swapping the YAML and journal mid-read
+    # without blocking other readers.
+    with _file_lock(filename, exclusive=False):
+        stamp = file_stamp(filename)
+        start = time.perf_counter()
+        vehicle = _read_vehicle(filename)
+        elapsed = time.perf_counter() - start
+
+    with _cache_lock:
+        _parse_seconds[key] = elapsed
+        _cache[key] = (stamp, vehicle)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAXSIZE:
+            _cache.popitem(last=False)
+    return vehicle
+
+
+class ParseTiming(NamedTuple):
+    """How long the most recent parse of one vehicle file took."""
+
+    path: str
+    seconds: float
+
+
+def parse_timings(limit: Optional[int] = None) -> List[ParseTiming]:
+    """Per-file parse times recorded by load_vehicle, slowest first."""
+    with _cache_lock:
+        timings = [ParseTiming(p, s) for p, s in _parse_seconds.items()]
+    timings.sort(key=lambda t: t.seconds, reverse=True)
+    return timings[:limit]
+
+
+# Threads used by load_vehicles. Parsing holds the GIL, so more threads than
+# cores only add switching; the pool mostly overlaps file reads, lock waits
+# and the NumPy parts of status evaluation.
+LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+T = TypeVar("T")
+
+
+def load_vehicles(
+    paths: Sequence[Union[str, Path]],
+    evaluate: Optional[Callable[[Vehicle], T]] = None,
+    workers: Optional[int] = None,
+    load: Callable[[Union[str, Path]], Vehicle] = load_vehicle,
+) -> List[Any]:
+    """
+    Load many vehicles on a bounded thread pool, in the order of paths.
 
-    Loads the raw YAML, replaces the entry at history[index],
-    and writes back to the file.
+    Each vehicle is loaded with load (load_vehicle, so through the cache)
+    and, when evaluate is given, passed to it in the same worker; the
+    result list then holds what evaluate returned. workers defaults to
+    LOAD_WORKERS; with one worker (or one path) everything runs inline.
+    The first exception raised by a worker is re-raised here.
     """
-    with open(filename, "r") as fp:
-        data = yaml.load(fp, Loader=yaml.SafeLoader)
 
-    history = data.get("history") or []
-    if index < 0 or index >= len(history):
-        raise IndexError(f"History index {index} out of range (0..{len(history) - 1})")
+    def work(path):
+        vehicle = load(path)
+        return vehicle if evaluate is None else evaluate(vehicle)
 
-    entry_dict = {"ruleKey": entry.rule_key, "date": entry.date}
+    workers = min(workers or LOAD_WORKERS, len(paths))
+    if workers <= 1:
+        return [work(path) for path in paths]
+    # Only needed here; keeps it out of CLI startup
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(workers, thread_name_prefix="load-vehicle") as pool:
+        return list(pool.map(work, paths))
+
+
+# =============================================================================
+# Serialization (model objects -> YAML dicts)
+# =============================================================================
+
+
+def _history_entry_to_dict(entry: HistoryEntry) -> Dict[str, Any]:
+    """Serialize a HistoryEntry to the YAML dict format, omitting None values."""
+    d: Dict[str, Any] = {"ruleKey": entry.rule_key, "date": entry.date}
     if entry.mileage is not None:
-        entry_dict["mileage"] = entry.mileage
+        d["mileage"] = entry.mileage
     if entry.performed_by is not None:
-        entry_dict["performedBy"] = entry.performed_by
+        d["performedBy"] = entry.performed_by
     if entry.notes is not None:
-        entry_dict["notes"] = entry.notes
+        d["notes"] = entry.notes
     if entry.cost is not None:
-        entry_dict["cost"] = entry.cost
-
-    history[index] = entry_dict
-
-    with open(filename, "w") as fp:
-        yaml.dump(
-            data,
-            fp,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=120,
-        )
+        d["cost"] = entry.cost
+    return d
 
 
 def _rule_to_dict(rule: Rule) -> Dict[str, Any]:
@@ -184,125 +757,290 @@ def _rule_to_dict(rule: Rule) -> Dict[str, Any]:
     return d
 
 
-def add_rule(filename: Union[str, Path], rule: Rule) -> None:
+def _car_to_dict(car: Car) -> Dict[str, Any]:
+    """Serialize a Car to the YAML dict format (camelCase keys)."""
+    d: Dict[str, Any] = {
+        "make": car.make,
+        "model": car.model,
+        "year": car.year,
+        "purchaseDate": car.purchase_date,
+        "purchaseMiles": car.purchase_miles,
+    }
+    if car.trim is not None:
+        d["trim"] = car.trim
+    return d
+
+
+# =============================================================================
+# Transactions
+# =============================================================================
+
+
+class VehicleFile:
     """
-    Append a rule to a vehicle YAML file.
+    Batch any number of edits to one vehicle file into a single load and write.
+
+    The raw document (with any journaled history folded in) is loaded once;
+    each edit is applied to it in memory, and the file is written once on
+    commit. Used as a context manager, the batch commits when the block exits
+    normally and rolls back (writes nothing) when it raises:
+
+        with VehicleFile(path) as vf:
+            vf.update_rule(0, rule)
+            vf.delete_history_entry(3)
 
-    Loads the raw YAML, appends the rule to the rules list,
-    and writes back to the file.
+    Index arguments refer to the document as already edited by earlier calls
+    in the same batch, exactly as if the edits had been made one at a time.
+
+    An exclusive lock on the file is held from construction until commit or
+    rollback, so concurrent writers in other processes queue up instead of
+    overwriting each other's changes. Raises LockTimeout if the lock is not
+    acquired within timeout seconds (default LOCK_TIMEOUT).
     """
-    with open(filename, "r") as fp:
-        data = yaml.load(fp, Loader=yaml.SafeLoader)
 
-    if data.get("rules") is None:
-        data["rules"] = []
+    def __init__(self, filename: Union[str, Path], timeout: Optional[float] = None):
+        self.filename = filename
+        self._lock = ExitStack()
+        self._lock.enter_context(_file_lock(filename, exclusive=True, timeout=timeout))
+        try:
+            self._stamp = file_stamp(filename)
+            self.data: Dict[str, Any] = _load_document(filename)
+        except BaseException:
+            self._lock.close()
+            raise
+        # Edits made so far, replayed on the cached vehicle after the write
+        self._ops: List[Tuple[Any, ...]] = []
+        self._dirty = False
+        self._closed = False
 
-    data["rules"].append(_rule_to_dict(rule))
+    def __enter__(self) -> "VehicleFile":
+        return self
 
-    with open(filename, "w") as fp:
-        yaml.dump(
-            data,
-            fp,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=120,
-        )
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._closed:
+            return
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
 
+    @property
+    def vehicle(self) -> Vehicle:
+        """The vehicle as it would be loaded after committing pending edits."""
+        return _parse_vehicle(self.data)
 
-def update_rule(filename: Union[str, Path], index: int, rule: Rule) -> None:
-    """
-    Replace a rule at the given index in a vehicle YAML file.
+    def _list(self, key: str) -> List[Dict[str, Any]]:
+        """Get (creating if missing) a top-level list such as rules or history."""
+        self._check_open()
+        if self.data.get(key) is None:
+            self.data[key] = []
+        return self.data[key]
 
-    Loads the raw YAML, replaces the rule at rules[index],
-    and writes back to the file.
-    """
-    with open(filename, "r") as fp:
-        data = yaml.load(fp, Loader=yaml.SafeLoader)
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("VehicleFile has already been committed or rolled back")
+
+    def add_history_entry(self, entry: HistoryEntry) -> None:
+        """Append a history entry."""
+        dct = _history_entry_to_dict(entry)
+        self._list("history").append(dct)
+        self._ops.append(("add_history_entry", dct))
+        self._dirty = True
+
+    def update_history_entry(self, index: int, entry: HistoryEntry) -> None:
+        """Replace the history entry at index."""
+        history = self._list("history")
+        if index < 0 or index >= len(history):
+            raise IndexError(
+                f"History index {index} out of range (0..{len(history) - 1})"
+            )
+        history[index] = _history_entry_to_dict(entry)
+        self._ops.append(("update_history_entry", index, history[index]))
+        self._dirty = True
+
+    def delete_history_entry(self, index: int) -> None:
+        """Remove the history entry at index."""
+        history = self._list("history")
+        if index < 0 or index >= len(history):
+            raise IndexError(
+                f"History index {index} out of range (0..{len(history) - 1})"
+            )
+        del history[index]
+        self._ops.append(("delete_history_entry", index))
+        self._dirty = True
 
-    rules = data.get("rules") or []
-    if index < 0 or index >= len(rules):
-        raise IndexError(f"Rule index {index} out of range (0..{len(rules) - 1})")
+    def add_rule(self, rule: Rule) -> None:
+        """Append a rule."""
+        dct = _rule_to_dict(rule)
+        self._list("rules").append(dct)
+        self._ops.append(("add_rule", dct))
+        self._dirty = True
 
-    rules[index] = _rule_to_dict(rule)
+    def update_rule(self, index: int, rule: Rule) -> None:
+        """Replace the rule at index."""
+        rules = self._list("rules")
+        if index < 0 or index >= len(rules):
+            raise IndexError(f"Rule index {index} out of range (0..{len(rules) - 1})")
+        rules[index] = _rule_to_dict(rule)
+        self._ops.append(("update_rule", index, rules[index]))
+        self._dirty = True
+
+    def delete_rule(self, index: int) -> None:
+        """Remove the rule at index."""
+        rules = self._list("rules")
+        if index < 0 or index >= len(rules):
+            raise IndexError(f"Rule index {index} out of range (0..{len(rules) - 1})")
+        del rules[index]
+        self._ops.append(("delete_rule", index))
+        self._dirty = True
+
+    def update_meta(
+        self,
+        car: Optional[Car] = None,
+        current_miles: Optional[float] = None,
+        as_of_date: Optional[str] = None,
+    ) -> None:
+        """Update car and/or state; only fields that are provided (non-None)."""
+        self._check_open()
+        if as_of_date is not None:
+            parse_date(as_of_date, "as-of date")
+        if car is not None:
+            self.data["car"] = _car_to_dict(car)
 
-    with open(filename, "w") as fp:
-        yaml.dump(
-            data,
-            fp,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=120,
+        if current_miles is not None or as_of_date is not None:
+            if self.data.get("state") is None:
+                self.data["state"] = {}
+            if current_miles is not None:
+                self.data["state"]["currentMiles"] = current_miles
+            if as_of_date is not None:
+                self.data["state"]["asOfDate"] = as_of_date
+        self._ops.append(
+            (
+                "update_meta",
+                self.data["car"] if car else None,
+                current_miles,
+                as_of_date,
+            )
         )
+        self._dirty = True
 
+    def commit(self) -> None:
+        """Write all pending edits in one go (no-op if nothing changed)."""
+        self._check_open()
+        try:
+            if self._dirty:
+                _write_document(self.filename, self.data)
+                vehicle = _update_cached(self.filename, self._stamp, self._ops)
+                _notify_write(
+                    self.filename, lambda: vehicle or _parse_vehicle(self.data)
+                )
+        finally:
+            self._close()
+
+    def rollback(self) -> None:
+        """Discard all pending edits without touching the file."""
+        self._close()
+
+    def _close(self) -> None:
+        self._closed = True
+        self._lock.close()
 
-def delete_rule(filename: Union[str, Path], index: int) -> None:
-    """
-    Remove a rule at the given index in a vehicle YAML file.
 
-    Loads the raw YAML, removes the rule at rules[index],
-    and writes back to the file.
+# =============================================================================
+# Single-edit helpers
+# =============================================================================
+
+
+def save_history_entry(
+    filename: Union[str, Path], entry: HistoryEntry, journal: bool = False
+) -> None:
     """
-    with open(filename, "r") as fp:
-        data = yaml.load(fp, Loader=yaml.SafeLoader)
+    Append a history entry to a vehicle YAML file.
 
-    rules = data.get("rules") or []
-    if index < 0 or index >= len(rules):
-        raise IndexError(f"Rule index {index} out of range (0..{len(rules) - 1})")
+    By default loads the raw YAML, appends the entry to the history list,
+    and writes back to the file. With journal=True the entry is instead
+    appended as one line to the sidecar journal (see journal_path), which
+    costs the same no matter how long the history is; load_vehicle merges
+    the journal and compact_history folds it back into the YAML.
+    """
+    if journal:
+        path = journal_path(filename)
+        dct = _history_entry_to_dict(entry)
+        line = json.dumps(dct, ensure_ascii=False)
+        # Exclusive so compact_history cannot fold and unlink mid-append
+        with _file_lock(filename, exclusive=True):
+            stamp = file_stamp(filename)
+            _terminate_journal(path)
+            created = not path.exists()
+            with open(path, "a", encoding="utf-8") as fp:
+                if fp.tell() == 0:
+                    import secrets
 
-    del rules[index]
+                    header = {"journal": secrets.token_hex(8)}
+                    fp.write(json.dumps(header) + "\n")
+                fp.write(line + "\n")
+                fp.flush()
+                os.fsync(fp.fileno())
+            if created:
+                _fsync_dir(path.parent)
+            vehicle = _update_cached(filename, stamp, [("add_history_entry", dct)])
+            _notify_write(filename, lambda: vehicle or _read_vehicle(filename))
+        return
 
-    with open(filename, "w") as fp:
-        yaml.dump(
-            data,
-            fp,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=120,
-        )
+    with VehicleFile(filename) as vf:
+        vf.add_history_entry(entry)
 
 
-def delete_history_entry(filename: Union[str, Path], index: int) -> None:
+def compact_history(filename: Union[str, Path]) -> int:
     """
-    Remove a history entry at the given index in a vehicle YAML file.
+    Fold the history journal back into the vehicle YAML file.
 
-    Loads the raw YAML, removes the entry at history[index],
-    and writes back to the file.
+    Returns the number of journaled entries that were folded in (0 when
+    there was no journal, in which case the file is left untouched).
     """
-    with open(filename, "r") as fp:
-        data = yaml.load(fp, Loader=yaml.SafeLoader)
+    with _file_lock(filename, exclusive=True):
+        if not journal_path(filename).exists():
+            return 0
+        stamp = file_stamp(filename)
+        data = _load_yaml(filename)
+        folded = _merge_journal(filename, data)
+        _write_document(filename, data)
+        # Same content, so the cached vehicle only needs the new stamp
+        vehicle = _update_cached(filename, stamp, [])
+        _notify_write(filename, lambda: vehicle or _parse_vehicle(data))
+    return folded
 
-    history = data.get("history") or []
-    if index < 0 or index >= len(history):
-        raise IndexError(f"History index {index} out of range (0..{len(history) - 1})")
 
-    del history[index]
+def update_history_entry(
+    filename: Union[str, Path], index: int, entry: HistoryEntry
+) -> None:
+    """Replace a history entry at the given index in a vehicle YAML file."""
+    with VehicleFile(filename) as vf:
+        vf.update_history_entry(index, entry)
 
-    with open(filename, "w") as fp:
-        yaml.dump(
-            data,
-            fp,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=120,
-        )
 
+def delete_history_entry(filename: Union[str, Path], index: int) -> None:
+    """Remove a history entry at the given index in a vehicle YAML file."""
+    with VehicleFile(filename) as vf:
+        vf.delete_history_entry(index)
 
-def _car_to_dict(car: Car) -> Dict[str, Any]:
-    """Serialize a Car to the YAML dict format (camelCase keys)."""
-    d: Dict[str, Any] = {
-        "make": car.make,
-        "model": car.model,
-        "year": car.year,
-        "purchaseDate": car.purchase_date,
-        "purchaseMiles": car.purchase_miles,
-    }
-    if car.trim is not None:
-        d["trim"] = car.trim
-    return d
+
+def add_rule(filename: Union[str, Path], rule: Rule) -> None:
+    """Append a rule to a vehicle YAML file."""
+    with VehicleFile(filename) as vf:
+        vf.add_rule(rule)
+
+
+def update_rule(filename: Union[str, Path], index: int, rule: Rule) -> None:
+    """Replace a rule at the given index in a vehicle YAML file."""
+    with VehicleFile(filename) as vf:
+        vf.update_rule(index, rule)
+
+
+def delete_rule(filename: Union[str, Path], index: int) -> None:
+    """Remove a rule at the given index in a vehicle YAML file."""
+    with VehicleFile(filename) as vf:
+        vf.delete_rule(index)
 
 
 def create_vehicle(
@@ -316,6 +1054,8 @@ def create_vehicle(
 
     Initializes with empty rules and history.
     """
+    if as_of_date is not None:
+        parse_date(as_of_date, "as-of date")
     data: Dict[str, Any] = {
         "car": _car_to_dict(car),
         "state": {},
@@ -329,15 +1069,10 @@ def create_vehicle(
     if not data["state"]:
         data["state"] = {"currentMiles": car.purchase_miles}
 
-    with open(filename, "w") as fp:
-        yaml.dump(
-            data,
-            fp,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=120,
-        )
+    with _file_lock(filename, exclusive=True):
+        _write_document(filename, data)
+        invalidate_cache(filename)
+        _notify_write(filename, lambda: _parse_vehicle(data))
 
 
 def update_vehicle_meta(
@@ -351,31 +1086,20 @@ def update_vehicle_meta(
 
     Only updates fields that are provided (non-None). Leaves other keys unchanged.
     """
-    with open(filename, "r") as fp:
-        data = yaml.load(fp, Loader=yaml.SafeLoader)
-
-    if car is not None:
-        data["car"] = _car_to_dict(car)
-
-    if current_miles is not None or as_of_date is not None:
-        if data.get("state") is None:
-            data["state"] = {}
-        if current_miles is not None:
-            data["state"]["currentMiles"] = current_miles
-        if as_of_date is not None:
-            data["state"]["asOfDate"] = as_of_date
-
-    with open(filename, "w") as fp:
-        yaml.dump(
-            data,
-            fp,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=120,
-        )
+    with VehicleFile(filename) as vf:
+        vf.update_meta(car=car, current_miles=current_miles, as_of_date=as_of_date)
 
 
 def delete_vehicle(filename: Union[str, Path]) -> None:
-    """Remove a vehicle YAML file from disk."""
-    Path(filename).unlink()
+    """
+    Remove a vehicle YAML file (and its journal) from disk.
+
+    The empty lock file stays: removing it while other processes may be
+    waiting on it would let one of them and a newcomer, locking a freshly
+    created file at the same path, hold the exclusive lock at once.
+    """
+    with _file_lock(filename, exclusive=True):
+        Path(filename).unlink()
+        journal_path(filename).unlink(missing_ok=True)
+        invalidate_cache(filename)
+        _notify_write(filename, lambda: None)
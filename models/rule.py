@@ -1,11 +1,32 @@
 """Rule class for maintenance interval definitions."""
 
+import sys
 from typing import List, Optional
 
 
 class Rule:
     """A maintenance rule defining when a service should be performed."""
 
+    __slots__ = (
+        "_item",
+        "_verb",
+        "_phase",
+        "_key",
+        "_base_key",
+        "_display_name",
+        "interval_miles",
+        "interval_months",
+        "severe_interval_miles",
+        "severe_interval_months",
+        "notes",
+        "start_miles",
+        "stop_miles",
+        "start_months",
+        "stop_months",
+        "aftermarket",
+        "counts_as",
+    )
+
     def __init__(
         self,
         item: str,
@@ -23,9 +44,10 @@ class Rule:
         aftermarket: bool = False,
         counts_as: Optional[List[str]] = None,
     ):
-        self.item = item
-        self.verb = verb
-        self.phase = phase
+        self._item = sys.intern(item)
+        self._verb = sys.intern(verb)
+        self._phase = phase
+        self._update_keys()
         self.interval_miles = interval_miles
         self.interval_months = interval_months
         self.severe_interval_miles = severe_interval_miles
@@ -36,28 +58,59 @@ class Rule:
         self.start_months = start_months or 0
         self.stop_months = stop_months or 9999
         self.aftermarket = aftermarket or False
-        self.counts_as: List[str] = counts_as or []
+        self.counts_as: List[str] = [sys.intern(v) for v in counts_as or []]
+
+    def _update_keys(self) -> None:
+        """Recompute the cached key, base_key and display_name."""
+        # Keys are interned so they share storage with history rule keys
+        self._base_key = sys.intern(f"{self._item}/{self._verb}")
+        self._key = self._base_key
+        self._display_name = f"{self._verb.title()} - {self._item}"
+        if self._phase:
+            self._key = sys.intern(f"{self._base_key}/{self._phase}")
+            self._display_name += f" [{self._phase}]"
+
+    @property
+    def item(self) -> str:
+        return self._item
+
+    @item.setter
+    def item(self, value: str) -> None:
+        self._item = sys.intern(value)
+        self._update_keys()
+
+    @property
+    def verb(self) -> str:
+        return self._verb
+
+    @verb.setter
+    def verb(self, value: str) -> None:
+        self._verb = sys.intern(value)
+        self._update_keys()
+
+    @property
+    def phase(self) -> Optional[str]:
+        return self._phase
+
+    @phase.setter
+    def phase(self, value: Optional[str]) -> None:
+        self._phase = value
+        self._update_keys()
 
     @property
     def key(self) -> str:
-        """Generate natural key from item/verb/phase."""
-        base = f"{self.item}/{self.verb}"
-        if self.phase:
-            return f"{base}/{self.phase}"
-        return base
+        """Natural key from item/verb/phase."""
+        return self._key
 
     @property
     def base_key(self) -> str:
-        """Generate base key from item/verb (without phase)."""
-        return f"{self.item}/{self.verb}"
+        """Base key from item/verb (without phase)."""
+        return self._base_key
 
     @property
     def display_name(self) -> str:
-        """Generate human-readable display name: Verb - item [phase] (title case)."""
-        name = f"{self.verb.title()} - {self.item}"
-        if self.phase:
-            name += f" [{self.phase}]"
-        return name
+        """Human-readable display name: Verb - item [phase] (title case)."""
+        return self._display_name
 
     def is_active_at(self, miles: float) -> bool:
         """Check if this rule applies at the given mileage."""
@@ -9,7 +9,7 @@ if TYPE_CHECKING:
     from .rule import Rule
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceDue:
     """Calculated service due information for a rule."""
 
@@ -23,6 +23,9 @@ class ServiceDue:
     severe_due_date: Optional[str] = None
     miles_remaining: Optional[float] = None
     time_remaining_days: Optional[int] = None
+    # Earlier of due_date and the date miles_remaining runs out at the
+    # vehicle's observed mileage rate (see models.forecast)
+    projected_date: Optional[str] = None
 
     @property
     def is_due(self) -> bool:
@@ -0,0 +1,62 @@
+"""StatusBundle: every status variant of a vehicle, computed in one pass."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .service_due import ServiceDue
+
+if TYPE_CHECKING:
+    from .rule import Rule
+
+# (severe, miles_only, time_only) for normal/severe x all/mileage/time
+BUNDLE_VARIANTS: List[Tuple[bool, bool, bool]] = [
+    (severe, miles_only, time_only)
+    for severe in (False, True)
+    for miles_only, time_only in ((False, False), (True, False), (False, True))
+]
+
+
+def _filter_by_verbs(
+    rules: List["Rule"],
+    rows: List[ServiceDue],
+    exclude_verbs: Optional[List[str]],
+    include_verbs: Optional[List[str]],
+) -> List[ServiceDue]:
+    """Pick the status rows whose rule passes the verb filters."""
+    # include_verbs takes precedence over exclude_verbs when both present
+    if include_verbs:
+        include = [v.lower() for v in include_verbs]
+        return [row for r, row in zip(rules, rows) if r.verb.lower() in include]
+    if exclude_verbs:
+        exclude = [v.lower() for v in exclude_verbs]
+        return [row for r, row in zip(rules, rows) if r.verb.lower() not in exclude]
+    return list(rows)
+
+
+@dataclass(slots=True)
+class StatusBundle:
+    """
+    Service status of every rule under each BUNDLE_VARIANTS combination.
+
+    Built by Vehicle.status_bundle; get() then serves any severe/basis toggle
+    and verb filter without recomputing.
+    """
+
+    rules: List["Rule"]
+    tables: Dict[Tuple[bool, bool, bool], List[ServiceDue]]
+
+    def get(
+        self,
+        severe: bool = False,
+        miles_only: bool = False,
+        time_only: bool = False,
+        exclude_verbs: Optional[List[str]] = None,
+        include_verbs: Optional[List[str]] = None,
+    ) -> List[ServiceDue]:
+        """
+        Same result as Vehicle.get_all_service_status with these arguments.
+
+        miles_only and time_only cannot both be set (no such variant).
+        """
+        rows = self.tables[(severe, miles_only, time_only)]
+        return _filter_by_verbs(self.rules, rows, exclude_verbs, include_verbs)
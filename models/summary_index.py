@@ -0,0 +1,202 @@
+"""
+Precomputed per-vehicle summaries for the fleet dashboard.
+
+SummaryIndex keeps, for every vehicle file in a directory, the name, current
+miles, last service and counts of overdue / due-soon / OK services, so the
+dashboard renders without loading a single vehicle. Entries are kept current
+from two sides:
+
+- on_write, a loader write listener, gets the vehicle as just written by this
+  process and summarizes it without reading the file back;
+- on_change, a VehicleWatcher subscriber, re-reads vehicles changed by anyone
+  else (on the watcher thread, not the request).
+
+Without a watcher, sync() stats every file and re-reads the changed ones.
+Statuses depend on today's date, so every entry is recomputed the first time
+summaries() is called on a new day.
+"""
+
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .fleet_status import HAS_NUMPY, fleet_service_status
+from .history_entry import HistoryEntry
+from .loader import file_stamp, load_vehicle, load_vehicles
+from .service_due import ServiceDue
+from .status import Status
+from .vehicle import Vehicle
+from .watcher import ChangeKind, VehicleChange
+
+
+class VehicleSummary(NamedTuple):
+    """What the dashboard shows for one vehicle."""
+
+    id: str
+    name: str
+    current_miles: Optional[float]
+    overdue: int
+    due_soon: int
+    ok: int
+    total_rules: int
+    last_service: Optional[HistoryEntry]
+    # File stamp (see loader.file_stamp) the summary was computed from
+    stamp: Tuple[int, ...]
+
+
+def summarize(
+    vehicle_id: str,
+    vehicle: Vehicle,
+    stamp: Tuple[int, ...],
+    all_status: Optional[List[ServiceDue]] = None,
+) -> VehicleSummary:
+    """Summary of a vehicle (all_status: its default service status, if known)."""
+    if all_status is None:
+        all_status = vehicle.get_all_service_status()
+    counts = {Status.OVERDUE: 0, Status.DUE_SOON: 0, Status.OK: 0}
+    for service in all_status:
+        if service.status in counts:
+            counts[service.status] += 1
+    return VehicleSummary(
+        id=vehicle_id,
+        name=vehicle.car.name,
+        current_miles=vehicle.current_miles,
+        overdue=counts[Status.OVERDUE],
+        due_soon=counts[Status.DUE_SOON],
+        ok=counts[Status.OK],
+        total_rules=len(vehicle.rules),
+        last_service=vehicle.last_service,
+        stamp=stamp,
+    )
+
+
+def _evaluate(vehicle: Vehicle) -> Vehicle:
+    """Materialize a vehicle's default status table (kept on the vehicle)."""
+    vehicle.get_all_service_status()
+    return vehicle
+
+
+class SummaryIndex:
+    """
+    Vehicle summaries for one directory, maintained as its files change.
+
+    Loading and status calculation happen outside the index lock: a loader
+    write listener runs while the file is locked for writing, and must not
+    wait on a thread that holds the index lock while reading that file.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        load: Callable[[Path], Vehicle] = load_vehicle,
+    ):
+        self.directory = Path(os.path.abspath(directory))
+        self.load = load
+        # vehicle id -> summary, or None when it must be recomputed
+        self._entries: Dict[str, Optional[VehicleSummary]] = {}
+        self._lock = threading.Lock()
+        self._built = False
+        self._day: Optional[date] = None
+
+    def path_for(self, vehicle_id: str) -> Path:
+        return self.directory / f"{vehicle_id}.yaml"
+
+    def _vehicle_id(self, path: Union[str, Path]) -> Optional[str]:
+        path = Path(path)
+        if path.suffix != ".yaml" or path.parent != self.directory:
+            return None
+        return path.stem
+
+    # ---- updates ------------------------------------------------------
+
+    def on_write(self, path: str, vehicle: Optional[Vehicle]) -> None:
+        """Loader write listener (see loader.add_write_listener)."""
+        vehicle_id = self._vehicle_id(path)
+        if vehicle_id is None:
+            return
+        if vehicle is None:
+            with self._lock:
+                self._entries.pop(vehicle_id, None)
+            return
+        summary = summarize(vehicle_id, vehicle, file_stamp(path))
+        with self._lock:
+            self._entries[vehicle_id] = summary
+
+    def on_change(self, change: VehicleChange) -> None:
+        """VehicleWatcher subscriber: re-read a vehicle changed on disk."""
+        if change.kind is ChangeKind.DELETED:
+            with self._lock:
+                self._entries.pop(change.vehicle_id, None)
+            return
+        try:
+            self._refresh([change.vehicle_id])
+        except Exception:
+            # Caught mid-edit or invalid: summaries() retries (and raises)
+            with self._lock:
+                self._entries[change.vehicle_id] = None
+
+    def sync(self) -> None:
+        """Bring the index in line with the directory by stat-ing every file."""
+        ids = {path.stem for path in self.directory.glob("*.yaml")}
+        with self._lock:
+            for vehicle_id in set(self._entries) - ids:
+                del self._entries[vehicle_id]
+            self._built = True
+        self._refresh(ids)
+
+    def _refresh(self, ids: Iterable[str]) -> None:
+        """Recompute the summaries of ids whose files changed since computed."""
+        with self._lock:
+            entries = dict(self._entries)
+        changed = []
+        for vehicle_id in ids:
+            try:
+                stamp = file_stamp(self.path_for(vehicle_id))
+            except FileNotFoundError:
+                with self._lock:
+                    self._entries.pop(vehicle_id, None)
+                continue
+            entry = entries.get(vehicle_id)
+            if entry is None or entry.stamp != stamp:
+                changed.append((vehicle_id, stamp))
+        if not changed:
+            return
+        # Parse (and, without NumPy, evaluate) on the load pool; the
+        # vectorized pass then serves the tables computed there
+        fleet = load_vehicles(
+            [self.path_for(vehicle_id) for vehicle_id, _ in changed],
+            evaluate=None if HAS_NUMPY else _evaluate,
+            load=self.load,
+        )
+        statuses = fleet_service_status(fleet)
+        summaries = [
+            summarize(vehicle_id, vehicle, stamp, all_status)
+            for (vehicle_id, stamp), vehicle, all_status in zip(
+                changed, fleet, statuses
+            )
+        ]
+        with self._lock:
+            for summary in summaries:
+                self._entries[summary.id] = summary
+
+    # ---- queries ------------------------------------------------------
+
+    def summaries(self) -> List[VehicleSummary]:
+        """Every vehicle's summary, in file name order."""
+        today = date.today()
+        with self._lock:
+            if self._day != today:
+                # Due-soon and overdue move with the calendar
+                self._entries = dict.fromkeys(self._entries)
+                self._day = today
+            built = self._built
+            stale = [v for v, summary in self._entries.items() if summary is None]
+        if not built:
+            self.sync()
+        elif stale:
+            self._refresh(stale)
+        with self._lock:
+            summaries = [s for s in self._entries.values() if s is not None]
+        return sorted(summaries, key=lambda s: f"{s.id}.yaml")
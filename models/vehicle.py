@@ -1,18 +1,250 @@
 """Vehicle class - the main aggregate for vehicle data and calculations."""
 
+import bisect
+import threading
+from dataclasses import replace
 from datetime import date
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from .car import Car
 from .rule import Rule
 from .history_entry import HistoryEntry
 from .service_due import ServiceDue
+from .status_bundle import BUNDLE_VARIANTS, StatusBundle, _filter_by_verbs
 from .status import Status
-from .calculations import calc_due_miles, calc_due_date, check_status
+from .calculations import calc_due_miles, calc_due_dates, check_status, parse_date
+from .forecast import MileageRate, project_date
+
+
+class _ObservedList(list):
+    """
+    A list that counts its in-place modifications.
+
+    Vehicle compares the count with the one its history index was built
+    from, so appending, removing or reordering rules or history entries
+    causes the index to be rebuilt on the next lookup.
+    """
+
+    def __init__(self, iterable: Iterable = ()):
+        super().__init__(iterable)
+        self.version = 0
+
+
+def _counting(name: str):
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_ObservedList, _name, _counting(_name))
+
+
+class _HistoryIndex:
+    """
+    Lookup tables over a vehicle's history and rules.
+
+    Rules are mapped by key (the first rule wins, as in a linear scan).
+    History entries are grouped by full rule key up front; the entries matching an
+    item/verb prefix are gathered from those groups (not the whole history)
+    the first time the prefix is asked for, sorted newest first by
+    (date, mileage) with ties kept in history order.
+    """
+
+    def __init__(self, rules: List[Rule], history: List[HistoryEntry]):
+        # rule key -> entries in history order
+        self.by_rule_key: Dict[str, List[HistoryEntry]] = {}
+        # id(entry) -> position in history, to break (date, mileage) ties
+        self._position: Dict[int, int] = {}
+        for pos, entry in enumerate(history):
+            self.by_rule_key.setdefault(entry.rule_key, []).append(entry)
+            self._position[id(entry)] = pos
+
+        mileages = [h.mileage for h in history if h.mileage is not None]
+        self.max_mileage: Optional[float] = max(mileages) if mileages else None
+
+        # rule key -> first rule with that key
+        self.rule_by_key: Dict[str, Rule] = {}
+        # (item, verb) -> base keys of same-item rules whose counts_as has verb
+        self.aliases: Dict[Tuple[str, str], List[str]] = {}
+        for rule in rules:
+            self.rule_by_key.setdefault(rule.key, rule)
+            for verb in dict.fromkeys(rule.counts_as):
+                self.aliases.setdefault((rule.item, verb), []).append(rule.base_key)
+
+        # lookup base key -> indices of rules whose last service reads it
+        self.dependents: Dict[str, List[int]] = {}
+        for i, rule in enumerate(rules):
+            bases = [rule.base_key, *self.aliases.get((rule.item, rule.verb), ())]
+            for base in dict.fromkeys(bases):
+                self.dependents.setdefault(base, []).append(i)
+
+        self._by_base: Dict[str, List[HistoryEntry]] = {}
+        self._last: Dict[Tuple[str, str], Optional[HistoryEntry]] = {}
+
+    def copy(self) -> "_HistoryIndex":
+        """Copy whose groups can be extended without touching this index."""
+        other = object.__new__(_HistoryIndex)
+        other.by_rule_key = {k: list(v) for k, v in self.by_rule_key.items()}
+        other._position = dict(self._position)
+        other.max_mileage = self.max_mileage
+        other.rule_by_key = self.rule_by_key
+        other.aliases = self.aliases
+        other.dependents = self.dependents
+        other._by_base = dict(self._by_base)
+        other._last = dict(self._last)
+        return other
+
+    def add(self, entry: HistoryEntry, position: int) -> None:
+        """Index an entry appended to the history at position."""
+        self.by_rule_key.setdefault(entry.rule_key, []).append(entry)
+        self._position[id(entry)] = position
+        if entry.mileage is not None and (
+            self.max_mileage is None or entry.mileage > self.max_mileage
+        ):
+            self.max_mileage = entry.mileage
+        for base in [b for b in self._by_base if entry.rule_key.startswith(b)]:
+            del self._by_base[base]
+        self._last.clear()
+
+    def rules_reading(self, rule_key: str) -> List[int]:
+        """Indices of rules whose last service can come from rule_key entries."""
+        rows = set()
+        for base, indices in self.dependents.items():
+            if rule_key.startswith(base):
+                rows.update(indices)
+        return sorted(rows)
+
+    def for_base(self, base_key: str) -> List[HistoryEntry]:
+        """Entries whose rule key starts with base_key, newest first."""
+        entries = self._by_base.get(base_key)
+        if entries is None:
+            entries = [
+                h
+                for key, group in self.by_rule_key.items()
+                if key.startswith(base_key)
+                for h in group
+            ]
+            position = self._position
+            entries.sort(
+                key=lambda h: (h.date_ordinal, h.mileage or 0, -position[id(h)]),
+                reverse=True,
+            )
+            self._by_base[base_key] = entries
+        return entries
+
+    def last_service(self, item: str, verb: str) -> Optional[HistoryEntry]:
+        """Most recent entry for item/verb or its counts_as aliases (memoized)."""
+        key = (item, verb)
+        if key in self._last:
+            return self._last[key]
+
+        groups = [self.for_base(f"{item}/{verb}")]
+        groups.extend(self.for_base(alias) for alias in self.aliases.get(key, ()))
+        # Newest entry with mileage from each group; groups are newest first
+        with_mileage = [
+            next(h for h in group if h.mileage is not None)
+            for group in groups
+            if any(h.mileage is not None for h in group)
+        ]
+        if with_mileage:
+            last = max(with_mileage, key=lambda h: (h.date_ordinal, h.mileage))
+        else:
+            newest = [group[0] for group in groups if group]
+            last = max(newest, key=lambda h: h.date_ordinal) if newest else None
+
+        self._last[key] = last
+        return last
+
+
+class _DatedHistory:
+    """A vehicle's history in date order, and its odometer readings by date."""
+
+    def __init__(self, vehicle: "Vehicle"):
+        history = vehicle.history
+        self.key = vehicle._dated_key()
+        # Stable, so same-day entries keep their history order (which breaks
+        # last-service ties)
+        self.entries: List[HistoryEntry] = sorted(history, key=_date_ordinal)
+        self.ordinals: List[int] = [h.date_ordinal for h in self.entries]
+
+        readings = [(vehicle.car.purchase_date_ordinal, vehicle.car.purchase_miles)]
+        readings.extend(
+            (h.date_ordinal, h.mileage) for h in self.entries if h.mileage is not None
+        )
+        if (
+            vehicle._state_as_of_ordinal is not None
+            and vehicle._state_current_miles is not None
+        ):
+            readings.append(
+                (vehicle._state_as_of_ordinal, vehicle._state_current_miles)
+            )
+        # One reading per day (the highest), in date order
+        by_day: Dict[int, float] = {}
+        for ordinal, miles in readings:
+            if miles > by_day.get(ordinal, float("-inf")):
+                by_day[ordinal] = miles
+        self.reading_days = sorted(by_day)
+        self.reading_miles = [by_day[d] for d in self.reading_days]
+
+    def miles_at(self, ordinal: int) -> float:
+        """Odometer on a day, interpolated between readings (whole miles)."""
+        days, miles = self.reading_days, self.reading_miles
+        i = bisect.bisect_right(days, ordinal)
+        if i == 0:
+            return miles[0]
+        if i == len(days):
+            return miles[-1]
+        fraction = (ordinal - days[i - 1]) / (days[i] - days[i - 1])
+        return round(miles[i - 1] + fraction * (miles[i] - miles[i - 1]))
+
+
+def _date_ordinal(entry: HistoryEntry) -> int:
+    return entry.date_ordinal
+
+
+# Status option combinations (due-soon thresholds, severe, miles/time only)
+# kept materialized per vehicle; the oldest is dropped beyond this
+MAX_STATUS_TABLES = 8
+
+StatusOptions = Tuple[float, float, bool, bool, bool]
+
+# (severe, miles_only, time_only)
+Variant = Tuple[bool, bool, bool]
+
+# Marks rules that are not active at the current mileage in _status_rows
+_INACTIVE = object()
 
 
 class Vehicle:
-    """Complete vehicle record with car info, rules, and maintenance history."""
+    """
+    Complete vehicle record with car info, rules, and maintenance history.
+
+    Service status is materialized: get_all_service_status keeps one table of
+    ServiceDue rows (aligned with rules) per option combination. The edit
+    methods (add_history_entry, update_rule, update_meta, ...) recompute only
+    the rows an edit can affect; any other change to the rules or history
+    lists, or a new current mileage or as-of date, recomputes the tables in
+    full on next use.
+    """
 
     def __init__(
         self,
@@ -26,7 +258,119 @@ class Vehicle:
         self.rules = rules
         self.history = history or []
         self._state_as_of_date = state_as_of_date
+        self._state_as_of_ordinal = (
+            parse_date(state_as_of_date, "as-of date").toordinal()
+            if state_as_of_date
+            else None
+        )
         self._state_current_miles = state_current_miles
+        self._status_basis: Optional[tuple] = None
+        # Cached vehicles are shared between threads (web requests, the load
+        # pool, the watcher); the status tables are filled in lazily, so
+        # every read-modify-write of them holds this lock
+        self._status_lock = threading.RLock()
+
+    def copy(self) -> "Vehicle":
+        """
+        Copy with its own lists, index and status tables.
+
+        Rules and history entries are shared, so edits made through the
+        copy's methods (which replace rather than modify them) leave this
+        vehicle untouched.
+        """
+        other = object.__new__(Vehicle)
+        other.car = self.car
+        other._rules = _ObservedList(self._rules)
+        other._rules.version = self._rules.version
+        other._history = _ObservedList(self._history)
+        other._history.version = self._history.version
+        other._state_as_of_date = self._state_as_of_date
+        other._state_as_of_ordinal = self._state_as_of_ordinal
+        other._state_current_miles = self._state_current_miles
+        other._index = self._index.copy() if self._index_in_sync() else None
+        other._index_versions = (self._rules.version, self._history.version)
+        other._rate = self._rate.copy() if self._rate_in_sync() else None
+        other._rate_version = self._history.version
+        other._dated = self._dated
+        with self._status_lock:
+            other._status_tables = {k: list(v) for k, v in self._status_tables.items()}
+            other._status_basis = self._status_basis
+        other._status_lock = threading.RLock()
+        return other
+
+    @property
+    def rules(self) -> List[Rule]:
+        """Maintenance rules (changes to the list are tracked by the index)."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, value: List[Rule]) -> None:
+        self._rules = _ObservedList(value)
+        self._index: Optional[_HistoryIndex] = None
+        # A new list starts its version count over, so drop what was built
+        self._status_tables: Dict[StatusOptions, List[ServiceDue]] = {}
+
+    @property
+    def history(self) -> List[HistoryEntry]:
+        """Service records (changes to the list are tracked by the index)."""
+        return self._history
+
+    @history.setter
+    def history(self, value: List[HistoryEntry]) -> None:
+        self._history = _ObservedList(value)
+        self._index = None
+        self._status_tables = {}
+        self._rate: Optional[MileageRate] = None
+        self._dated: Optional[_DatedHistory] = None
+
+    def _index_in_sync(self) -> bool:
+        return self._index is not None and self._index_versions == (
+            self._rules.version,
+            self._history.version,
+        )
+
+    def _history_index(self) -> _HistoryIndex:
+        """Build the history index on first use and whenever the lists changed."""
+        if not self._index_in_sync():
+            self._index = _HistoryIndex(self._rules, self._history)
+            self._index_versions = (self._rules.version, self._history.version)
+        return self._index
+
+    def _rate_in_sync(self) -> bool:
+        return self._rate is not None and self._rate_version == self._history.version
+
+    def mileage_rate(self) -> MileageRate:
+        """
+        Observed mileage rate, fitted over the recent history.
+
+        Built on first use and whenever the history list changed;
+        add_history_entry updates it in place.
+        """
+        if not self._rate_in_sync():
+            self._rate = MileageRate(
+                (h.date_ordinal, h.mileage)
+                for h in self._history
+                if h.mileage is not None
+            )
+            self._rate_version = self._history.version
+        return self._rate
+
+    def invalidate_index(self) -> None:
+        """
+        Discard everything derived from the rules and history.
+
+        That is the history and rule-key index, the materialized status
+        tables, the dated history and the mileage-rate fit. Changes to the
+        rules and history lists are noticed automatically; call this after
+        editing a Rule or HistoryEntry in place (e.g. its item, verb, phase,
+        counts_as, rule_key, date or mileage).
+        """
+        self._index = None
+        with self._status_lock:
+            self._status_tables = {}
+            self._status_basis = None
+        self._dated = None
+        self._rate = None
 
     @property
     def current_miles(self) -> Optional[float]:
@@ -34,12 +378,9 @@ class Vehicle:
         if self._state_current_miles is not None:
             return self._state_current_miles
         # Auto-compute from history
-        if self.history:
-            miles_from_history = [
-                h.mileage for h in self.history if h.mileage is not None
-            ]
-            if miles_from_history:
-                return max(miles_from_history)
+        max_mileage = self._history_index().max_mileage
+        if max_mileage is not None:
+            return max_mileage
         return self.car.purchase_miles
 
     @property
@@ -49,30 +390,34 @@ class Vehicle:
             return self._state_as_of_date
         return date.today().isoformat()
 
+    @property
+    def as_of_ordinal(self) -> int:
+        """as_of_date as a date ordinal (parsed once at construction)."""
+        if self._state_as_of_ordinal is not None:
+            return self._state_as_of_ordinal
+        return date.today().toordinal()
+
     @property
     def last_service(self) -> Optional[HistoryEntry]:
         """Get the most recent service entry overall."""
         if not self.history:
             return None
-        return max(self.history, key=lambda h: (h.date, h.mileage or 0))
+        return max(self.history, key=lambda h: (h.date_ordinal, h.mileage or 0))
 
     def get_rule(self, key: str) -> Optional[Rule]:
         """Find a rule by its natural key."""
-        for rule in self.rules:
-            if rule.key == key:
-                return rule
-        return None
+        return self._history_index().rule_by_key.get(key)
 
     def get_history_for_rule(self, key: str) -> List[HistoryEntry]:
         """Get all history entries for a specific rule."""
-        return [h for h in self.history if h.rule_key == key]
+        return list(self._history_index().by_rule_key.get(key, ()))
 
     def get_last_service(self, key: str) -> Optional[HistoryEntry]:
         """Get the most recent service for a rule."""
         entries = self.get_history_for_rule(key)
         if not entries:
             return None
-        return max(entries, key=lambda h: h.date)
+        return max(entries, key=lambda h: h.date_ordinal)
 
     def get_last_service_for_item(self, item: str, verb: str) -> Optional[HistoryEntry]:
         """
@@ -82,23 +427,11 @@ class Vehicle:
 
         Also considers history from rules whose counts_as includes this verb,
         so that e.g. a replacement can satisfy an inspection interval.
+
+        Entries with mileage are preferred for calculation. Lookups go through
+        an index built once per version of the rules and history.
         """
-        base_key = f"{item}/{verb}"
-        matching = [h for h in self.history if h.rule_key.startswith(base_key)]
-        # Include history from same-item rules that count as this verb
-        for rule in self.rules:
-            if rule.item == item and verb in rule.counts_as:
-                alias_base = f"{item}/{rule.verb}"
-                matching.extend(
-                    h for h in self.history if h.rule_key.startswith(alias_base)
-                )
-        if not matching:
-            return None
-        # Prefer entries with mileage for calculation
-        with_mileage = [h for h in matching if h.mileage is not None]
-        if with_mileage:
-            return max(with_mileage, key=lambda h: (h.date, h.mileage))
-        return max(matching, key=lambda h: h.date)
+        return self._history_index().last_service(item, verb)
 
     def get_history_sorted(
         self, sort_by: str = "date", reverse: bool = True
@@ -111,12 +444,14 @@ class Vehicle:
             reverse: If True, newest/highest first (default)
         """
         if sort_by == "date":
-            return sorted(self.history, key=lambda h: h.date, reverse=reverse)
+            return sorted(self.history, key=lambda h: h.date_ordinal, reverse=reverse)
         elif sort_by == "miles":
             return sorted(self.history, key=lambda h: h.mileage or 0, reverse=reverse)
         elif sort_by == "rule":
             return sorted(
-                self.history, key=lambda h: (h.rule_key, h.date), reverse=reverse
+                self.history,
+                key=lambda h: (h.rule_key, h.date_ordinal),
+                reverse=reverse,
             )
         return self.history
 
@@ -144,69 +479,135 @@ class Vehicle:
             miles_only: If True, only consider mileage-based intervals (ignore time)
             time_only: If True, only consider time-based intervals (ignore mileage)
         """
+        return self._status_rows(
+            [rule], due_soon_miles, due_soon_months, [(severe, miles_only, time_only)]
+        )[0][0]
+
+    def _status_rows(
+        self,
+        rules: List[Rule],
+        due_soon_miles: float,
+        due_soon_months: float,
+        variants: Sequence[Variant],
+    ) -> List[List[ServiceDue]]:
+        """
+        calculate_service_due for several rules and (severe, miles_only,
+        time_only) variants at once, one list of rows per variant.
+
+        Activity and the last-service lookup are done once per rule for all
+        variants. Due dates are computed per group of rules sharing a time
+        interval, through one calc_due_dates call each.
+        """
         current_miles = self.current_miles
-        current_date = date.fromisoformat(self.as_of_date)
-
-        # Check if rule is active at current mileage
-        if not rule.is_active_at(current_miles):
-            return ServiceDue(rule=rule, status=Status.INACTIVE)
-
-        # Find last service (match on item/verb, ignore phase)
-        last_service = self.get_last_service_for_item(rule.item, rule.verb)
-        last_miles = last_service.mileage if last_service else None
-        last_date_str = last_service.date if last_service else None
-        last_date = date.fromisoformat(last_date_str) if last_date_str else None
-
-        # Select intervals based on mode (severe falls back to normal if not defined)
-        if severe:
-            interval_miles = rule.severe_interval_miles or rule.interval_miles
-            interval_months = rule.severe_interval_months or rule.interval_months
-        else:
-            interval_miles = rule.interval_miles
-            interval_months = rule.interval_months
-
-        # Apply miles_only or time_only filters
-        if miles_only:
-            interval_months = None  # Ignore time-based intervals
-        if time_only:
-            interval_miles = None  # Ignore mileage-based intervals
-
-        # Calculate due points
-        due_miles = calc_due_miles(last_miles, interval_miles, rule.start_miles)
-        due_date = calc_due_date(last_date, interval_months)
-
-        # Determine status
-        if due_miles is None and due_date is None:
-            status = Status.UNKNOWN
-        else:
-            status = Status.OK
-            if due_miles is not None:
-                status = check_status(current_miles, due_miles, due_soon_miles)
-            if due_date is not None:
-                date_status = check_status(
-                    current_date.toordinal(),
-                    due_date.toordinal(),
-                    int(due_soon_months * 30),
+        current_ordinal = self.as_of_ordinal
+        soon_days = int(due_soon_months * 30)
+        miles_per_day = self.mileage_rate().miles_per_day
+
+        # Check if each rule is active at current mileage, and find its last
+        # service (match on item/verb, ignore phase)
+        last_services = []
+        for rule in rules:
+            if rule.is_active_at(current_miles):
+                last_services.append(
+                    self.get_last_service_for_item(rule.item, rule.verb)
                 )
-                # Escalate status if date check is worse
-                if date_status.value < status.value:  # OVERDUE < DUE_SOON < OK
-                    status = date_status
-
-        miles_remaining = (due_miles - current_miles) if due_miles else None
-        time_remaining_days = (due_date - current_date).days if due_date else None
-
-        return ServiceDue(
-            rule=rule,
-            status=status,
-            last_service_miles=last_miles,
-            last_service_date=last_date_str,
-            due_miles=due_miles,
-            due_date=due_date.isoformat() if due_date else None,
-            severe_due_miles=None,
-            severe_due_date=None,
-            miles_remaining=miles_remaining,
-            time_remaining_days=time_remaining_days,
-        )
+            else:
+                last_services.append(_INACTIVE)
+        last_dates = {
+            id(h): date.fromordinal(h.date_ordinal)
+            for h in last_services
+            if h is not None and h is not _INACTIVE
+        }
+
+        results = []
+        for severe, miles_only, time_only in variants:
+            # Select intervals based on mode (severe falls back to normal if
+            # not defined), then apply miles_only or time_only filters
+            intervals = []
+            by_interval: Dict[Optional[float], List[int]] = {}
+            for i, (rule, last_service) in enumerate(zip(rules, last_services)):
+                if last_service is _INACTIVE:
+                    intervals.append(None)
+                    continue
+                if severe:
+                    interval_miles = rule.severe_interval_miles or rule.interval_miles
+                    interval_months = (
+                        rule.severe_interval_months or rule.interval_months
+                    )
+                else:
+                    interval_miles = rule.interval_miles
+                    interval_months = rule.interval_months
+                if miles_only:
+                    interval_months = None  # Ignore time-based intervals
+                if time_only:
+                    interval_miles = None  # Ignore mileage-based intervals
+                intervals.append(interval_miles)
+                by_interval.setdefault(interval_months, []).append(i)
+
+            due_dates: List[Optional[date]] = [None] * len(rules)
+            for interval_months, group in by_interval.items():
+                group_dates = [last_dates.get(id(last_services[i])) for i in group]
+                for i, due_date in zip(
+                    group, calc_due_dates(group_dates, interval_months)
+                ):
+                    due_dates[i] = due_date
+
+            rows = []
+            for rule, last_service, interval_miles, due_date in zip(
+                rules, last_services, intervals, due_dates
+            ):
+                if last_service is _INACTIVE:
+                    rows.append(ServiceDue(rule=rule, status=Status.INACTIVE))
+                    continue
+                last_miles = last_service.mileage if last_service else None
+
+                # Calculate due points
+                due_miles = calc_due_miles(last_miles, interval_miles, rule.start_miles)
+                due_ordinal = due_date.toordinal() if due_date else None
+
+                # Determine status
+                if due_miles is None and due_date is None:
+                    status = Status.UNKNOWN
+                else:
+                    status = Status.OK
+                    if due_miles is not None:
+                        status = check_status(current_miles, due_miles, due_soon_miles)
+                    if due_date is not None:
+                        date_status = check_status(
+                            current_ordinal, due_ordinal, soon_days
+                        )
+                        # Escalate status if date check is worse
+                        if date_status.value < status.value:  # OVERDUE < DUE_SOON < OK
+                            status = date_status
+
+                due_date_str = due_date.isoformat() if due_date else None
+                miles_remaining = (due_miles - current_miles) if due_miles else None
+
+                # Positional in field order: rule, status, last service
+                # miles/date, due miles/date, severe due miles/date,
+                # miles/days remaining, projected date
+                rows.append(
+                    ServiceDue(
+                        rule,
+                        status,
+                        last_miles,
+                        last_service.date if last_service else None,
+                        due_miles,
+                        due_date_str,
+                        None,
+                        None,
+                        miles_remaining,
+                        due_ordinal - current_ordinal if due_date else None,
+                        project_date(
+                            due_date_str,
+                            miles_remaining,
+                            miles_per_day,
+                            current_ordinal,
+                        ),
+                    )
+                )
+            results.append(rows)
+        return results
 
     def get_all_service_status(
         self,
@@ -226,22 +627,336 @@ class Vehicle:
             include_verbs: List of verbs to include; when set, only these verbs are shown.
                           When None or empty, no verb filter (show all).
         """
-        # Filter rules by verb: include_verbs takes precedence over exclude_verbs when both present
-        rules_to_check = self.rules
-        if include_verbs:
-            include_verbs_lower = [v.lower() for v in include_verbs]
-            rules_to_check = [
-                r for r in self.rules if r.verb.lower() in include_verbs_lower
-            ]
-        elif exclude_verbs:
-            exclude_verbs_lower = [v.lower() for v in exclude_verbs]
-            rules_to_check = [
-                r for r in self.rules if r.verb.lower() not in exclude_verbs_lower
-            ]
+        options = (due_soon_miles, due_soon_months, severe, miles_only, time_only)
+        rows = self.cached_status(options)
+        if rows is None:
+            (rows,) = self._status_rows(self._rules, *options[:2], [options[2:]])
+            self.store_status(options, rows)
+        return _filter_by_verbs(self._rules, rows, exclude_verbs, include_verbs)
+
+    def status_bundle(
+        self, due_soon_miles: float = 1000, due_soon_months: float = 1
+    ) -> StatusBundle:
+        """
+        Calculate status under every severe x all/mileage/time variant at once.
 
-        return [
-            self.calculate_service_due(
-                rule, due_soon_miles, due_soon_months, severe, miles_only, time_only
+        Variants not already materialized are computed in a single pass over
+        the rules, sharing each rule's last-service lookup, and kept for later
+        get_all_service_status calls. Verb filters are applied by the
+        bundle's get().
+        """
+        tables = {}
+        missing = []
+        for variant in BUNDLE_VARIANTS:
+            rows = self.cached_status((due_soon_miles, due_soon_months, *variant))
+            if rows is None:
+                missing.append(variant)
+            else:
+                tables[variant] = list(rows)
+        if missing:
+            computed = self._status_rows(
+                self._rules, due_soon_miles, due_soon_months, missing
             )
-            for rule in rules_to_check
-        ]
+            for variant, rows in zip(missing, computed):
+                self.store_status((due_soon_miles, due_soon_months, *variant), rows)
+                tables[variant] = list(rows)
+        return StatusBundle(list(self._rules), tables)
+
+    # -------------------------------------------------------------------------
+    # Point-in-time status
+    # -------------------------------------------------------------------------
+
+    def _dated_history(self) -> "_DatedHistory":
+        """History sorted by date plus odometer readings, rebuilt when it changed."""
+        if self._dated is None or self._dated.key != self._dated_key():
+            self._dated = _DatedHistory(self)
+        return self._dated
+
+    def _dated_key(self) -> tuple:
+        return (
+            self._history.version,
+            id(self.car),
+            self._state_as_of_ordinal,
+            self._state_current_miles,
+        )
+
+    def miles_as_of(self, as_of: Union[str, date]) -> float:
+        """
+        Estimated odometer reading on a date.
+
+        Interpolated linearly between the nearest known readings: the
+        purchase, history entries with a mileage and the current state (when
+        it has both a date and a mileage). Before the first or after the last
+        reading, that reading is used.
+        """
+        ordinal = parse_date(as_of, "as-of date").toordinal()
+        return self._dated_history().miles_at(ordinal)
+
+    def status_as_of(
+        self,
+        as_of: Union[str, date],
+        due_soon_miles: float = 1000,
+        due_soon_months: float = 1,
+        severe: bool = False,
+        miles_only: bool = False,
+        time_only: bool = False,
+        exclude_verbs: Optional[List[str]] = None,
+        include_verbs: Optional[List[str]] = None,
+    ) -> List[ServiceDue]:
+        """
+        Service status as it stood on a past (or future) date.
+
+        Only history up to and including that date counts, and the current
+        mileage is miles_as_of(as_of). Other arguments match
+        get_all_service_status.
+        """
+        ordinal = parse_date(as_of, "as-of date").toordinal()
+        dated = self._dated_history()
+        entries = dated.entries[: bisect.bisect_right(dated.ordinals, ordinal)]
+        probe = Vehicle(
+            self.car,
+            list(self._rules),
+            entries,
+            date.fromordinal(ordinal).isoformat(),
+            dated.miles_at(ordinal),
+        )
+        return probe.get_all_service_status(
+            due_soon_miles,
+            due_soon_months,
+            severe,
+            miles_only,
+            time_only,
+            exclude_verbs,
+            include_verbs,
+        )
+
+    def status_series(
+        self,
+        dates: Iterable[Union[str, date]],
+        due_soon_miles: float = 1000,
+        due_soon_months: float = 1,
+        severe: bool = False,
+        miles_only: bool = False,
+        time_only: bool = False,
+        exclude_verbs: Optional[List[str]] = None,
+        include_verbs: Optional[List[str]] = None,
+    ) -> List[List[ServiceDue]]:
+        """
+        status_as_of for many dates, one result list per date in the order given.
+
+        The dates are visited in order on a single working vehicle: history
+        entries are added as each date passes them, so its history index and
+        mileage rate are extended rather than rebuilt for every date.
+        """
+        ordinals = [parse_date(d, "as-of date").toordinal() for d in dates]
+        dated = self._dated_history()
+        probe = Vehicle(self.car, list(self._rules))
+        results: Dict[int, List[ServiceDue]] = {}
+        added = 0
+        for ordinal in sorted(set(ordinals)):
+            while added < len(dated.entries) and dated.ordinals[added] <= ordinal:
+                probe.add_history_entry(dated.entries[added])
+                added += 1
+            probe.update_meta(
+                current_miles=dated.miles_at(ordinal),
+                as_of_date=date.fromordinal(ordinal).isoformat(),
+            )
+            results[ordinal] = probe.get_all_service_status(
+                due_soon_miles,
+                due_soon_months,
+                severe,
+                miles_only,
+                time_only,
+                exclude_verbs,
+                include_verbs,
+            )
+        return [results[ordinal] for ordinal in ordinals]
+
+    # -------------------------------------------------------------------------
+    # Materialized status
+    # -------------------------------------------------------------------------
+
+    def _current_basis(self) -> tuple:
+        """What every status row depends on besides its own rule's history."""
+        return (
+            self.current_miles,
+            self.as_of_ordinal,
+            self.mileage_rate().miles_per_day,
+            self._rules.version,
+            self._history.version,
+        )
+
+    def cached_status(self, options: StatusOptions) -> Optional[List[ServiceDue]]:
+        """
+        The materialized status rows for options, if still valid.
+
+        options is (due_soon_miles, due_soon_months, severe, miles_only,
+        time_only); the rows cover every active rule, before verb filters.
+        None when they were never computed or the vehicle changed since.
+        Treat the rows as read-only.
+        """
+        basis = self._current_basis()
+        with self._status_lock:
+            if basis != self._status_basis:
+                self._status_tables = {}
+                self._status_basis = basis
+            return self._status_tables.get(options)
+
+    def store_status(self, options: StatusOptions, rows: List[ServiceDue]) -> None:
+        """
+        Keep status rows computed elsewhere (e.g. the fleet engine) for options.
+
+        rows must equal what get_all_service_status would compute for options
+        without verb filters; edits then keep them up to date like the
+        vehicle's own tables.
+        """
+        with self._status_lock:
+            tables = self._status_tables
+            if options not in tables and len(tables) >= MAX_STATUS_TABLES:
+                tables.pop(next(iter(tables)), None)
+            tables[options] = rows
+
+    def _tables_in_sync(self) -> bool:
+        return bool(self._status_tables) and self._status_basis == (
+            self._current_basis()
+        )
+
+    def _refresh_rows(self, in_sync: bool, rows: Sequence[int]) -> None:
+        """
+        Recompute the given rows of every status table after an edit.
+
+        Falls back to dropping the tables when they were already stale or
+        the edit moved the current mileage or as-of date (which every row
+        depends on).
+        """
+        basis = self._current_basis()
+        with self._status_lock:
+            if not in_sync or basis[:2] != self._status_basis[:2]:
+                self._status_tables = {}
+                return
+            if basis[2] != self._status_basis[2]:
+                self._reproject(basis[2])
+            rules = [self._rules[i] for i in rows]
+            # One pass per due-soon threshold pair covers all its variants
+            by_thresholds: Dict[Tuple[float, float], List[StatusOptions]] = {}
+            for options in self._status_tables:
+                by_thresholds.setdefault(options[:2], []).append(options)
+            for thresholds, group in by_thresholds.items():
+                variants = [options[2:] for options in group]
+                for options, new_rows in zip(
+                    group, self._status_rows(rules, *thresholds, variants)
+                ):
+                    table = self._status_tables[options]
+                    for i, row in zip(rows, new_rows):
+                        table[i] = row
+            self._status_basis = basis
+
+    def _reproject(self, miles_per_day: Optional[float]) -> None:
+        """Redo every row's projected date for a new mileage rate."""
+        as_of_ordinal = self.as_of_ordinal
+        for table in self._status_tables.values():
+            for i, row in enumerate(table):
+                if row.status != Status.INACTIVE:
+                    table[i] = replace(
+                        row,
+                        projected_date=project_date(
+                            row.due_date,
+                            row.miles_remaining,
+                            miles_per_day,
+                            as_of_ordinal,
+                        ),
+                    )
+
+    def _rows_for_item(self, *items: str) -> List[int]:
+        """Indices of rules for the given items (counts_as links stay within one)."""
+        return [i for i, rule in enumerate(self._rules) if rule.item in items]
+
+    def _check_history_index(self, index: int) -> None:
+        if index < 0 or index >= len(self._history):
+            raise IndexError(
+                f"History index {index} out of range (0..{len(self._history) - 1})"
+            )
+
+    def _check_rule_index(self, index: int) -> None:
+        if index < 0 or index >= len(self._rules):
+            raise IndexError(
+                f"Rule index {index} out of range (0..{len(self._rules) - 1})"
+            )
+
+    def add_history_entry(self, entry: HistoryEntry) -> None:
+        """Append a history entry, updating the index and affected status rows."""
+        in_sync = self._tables_in_sync()
+        index = self._history_index()
+        rate = self.mileage_rate()
+        self._history.append(entry)
+        index.add(entry, len(self._history) - 1)
+        self._index_versions = (self._rules.version, self._history.version)
+        if entry.mileage is not None:
+            rate.add(entry.date_ordinal, entry.mileage)
+        self._rate_version = self._history.version
+        self._refresh_rows(in_sync, index.rules_reading(entry.rule_key))
+
+    def update_history_entry(self, index: int, entry: HistoryEntry) -> None:
+        """Replace the history entry at index."""
+        self._check_history_index(index)
+        in_sync = self._tables_in_sync()
+        old_key = self._history[index].rule_key
+        history_index = self._history_index()
+        rows = set(history_index.rules_reading(old_key))
+        rows.update(history_index.rules_reading(entry.rule_key))
+        self._history[index] = entry
+        self._refresh_rows(in_sync, sorted(rows))
+
+    def delete_history_entry(self, index: int) -> None:
+        """Remove the history entry at index."""
+        self._check_history_index(index)
+        in_sync = self._tables_in_sync()
+        rows = self._history_index().rules_reading(self._history[index].rule_key)
+        del self._history[index]
+        self._refresh_rows(in_sync, rows)
+
+    def add_rule(self, rule: Rule) -> None:
+        """Append a rule."""
+        in_sync = self._tables_in_sync()
+        self._rules.append(rule)
+        with self._status_lock:
+            for table in self._status_tables.values():
+                table.append(None)
+        self._refresh_rows(in_sync, self._rows_for_item(rule.item))
+
+    def update_rule(self, index: int, rule: Rule) -> None:
+        """Replace the rule at index."""
+        self._check_rule_index(index)
+        in_sync = self._tables_in_sync()
+        old_item = self._rules[index].item
+        self._rules[index] = rule
+        self._refresh_rows(in_sync, self._rows_for_item(old_item, rule.item))
+
+    def delete_rule(self, index: int) -> None:
+        """Remove the rule at index."""
+        self._check_rule_index(index)
+        in_sync = self._tables_in_sync()
+        old_item = self._rules[index].item
+        del self._rules[index]
+        with self._status_lock:
+            for table in self._status_tables.values():
+                del table[index]
+        self._refresh_rows(in_sync, self._rows_for_item(old_item))
+
+    def update_meta(
+        self,
+        car: Optional[Car] = None,
+        current_miles: Optional[float] = None,
+        as_of_date: Optional[str] = None,
+    ) -> None:
+        """Update car and/or state; only fields that are provided (non-None)."""
+        in_sync = self._tables_in_sync()
+        if as_of_date is not None:
+            self._state_as_of_ordinal = parse_date(as_of_date, "as-of date").toordinal()
+            self._state_as_of_date = as_of_date
+        if car is not None:
+            self.car = car
+        if current_miles is not None:
+            self._state_current_miles = current_miles
+        # Only the car's purchase mileage, through current_miles, feeds status
+        self._refresh_rows(in_sync, ())
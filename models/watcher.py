@@ -0,0 +1,329 @@
+"""
+Vehicle directory watcher.
+
+VehicleWatcher reports vehicle files created, modified or deleted in a
+directory, by whoever changed them (hand edits, git pulls, the CLI), to
+subscribed callbacks on a background thread. It uses inotify (through
+ctypes, Linux only) when available and otherwise polls the directory's
+modification times every poll_interval seconds.
+
+A vehicle is "<id>.yaml"; appends to its history journal count as
+modifications of it. Lock files and the temporary files of atomic writes
+are ignored. Bursts of raw events (an atomic write is a create, a write
+and a rename) are coalesced into one change per vehicle.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .loader import JOURNAL_SUFFIX
+
+# Seconds between directory scans when inotify is unavailable
+POLL_INTERVAL = 1.0
+
+# Seconds to keep collecting inotify events before publishing a batch
+COALESCE_DELAY = 0.05
+
+_VEHICLE_SUFFIX = ".yaml"
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) event bits
+_IN_MODIFY = 0x2
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class ChangeKind(Enum):
+    """What happened to a vehicle file."""
+
+    CREATED = "created"
+    MODIFIED = "modified"
+    DELETED = "deleted"
+
+
+@dataclass(frozen=True, slots=True)
+class VehicleChange:
+    """One vehicle file change, published to watcher subscribers."""
+
+    kind: ChangeKind
+    vehicle_id: str
+
+
+Subscriber = Callable[[VehicleChange], None]
+
+
+def vehicle_id_for(name: str) -> Optional[str]:
+    """The vehicle a file name in the directory belongs to, if any."""
+    if name.startswith("."):
+        # Lock files and in-progress atomic writes
+        return None
+    if name.endswith(JOURNAL_SUFFIX):
+        return name[: -len(JOURNAL_SUFFIX)]
+    if name.endswith(_VEHICLE_SUFFIX):
+        return name[: -len(_VEHICLE_SUFFIX)]
+    return None
+
+
+def _load_libc():
+    """libc with the inotify calls, or None where they do not exist."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class VehicleWatcher:
+    """
+    Publish VehicleChange events for a directory of vehicle files.
+
+    Subscribers are called on the watcher thread, in order, for every change;
+    an exception in one is printed and does not stop the others. Use as a
+    context manager, or call start() and stop().
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self._use_inotify = use_inotify
+        self._subscribers: List[Subscriber] = []
+        self._subscribers_lock = threading.Lock()
+        # vehicle id -> (yaml stamp, journal stamp) as last published
+        self._stamps: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify_fd: Optional[int] = None
+        # Written to wake the inotify loop on stop()
+        self._wake_r = self._wake_w = -1
+
+    # ---- subscribers --------------------------------------------------
+
+    def subscribe(self, callback: Subscriber) -> Subscriber:
+        """Call callback(change) for every change; returns it (decorator-friendly)."""
+        with self._subscribers_lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        with self._subscribers_lock:
+            self._subscribers.remove(callback)
+
+    def _publish(self, changes: List[VehicleChange]) -> None:
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for change in changes:
+            for callback in subscribers:
+                try:
+                    callback(change)
+                except Exception:
+                    logger.exception(
+                        "%s: subscriber %r failed", change.vehicle_id, callback
+                    )
+
+    # ---- lifecycle ----------------------------------------------------
+
+    @property
+    def backend(self) -> Optional[str]:
+        """'inotify' or 'polling' while running, else None."""
+        if self._thread is None:
+            return None
+        return "inotify" if self._inotify_fd is not None else "polling"
+
+    def start(self) -> "VehicleWatcher":
+        """Take the initial snapshot and start watching in a daemon thread."""
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        if self._use_inotify:
+            self._inotify_fd = self._open_inotify()
+        # Snapshot after the watch is in place so no change falls in between
+        self._stamps = self._scan()
+        if self._inotify_fd is not None:
+            self._wake_r, self._wake_w = os.pipe()
+            target = self._run_inotify
+        else:
+            target = self._run_polling
+        self._thread = threading.Thread(
+            target=target, name="vehicle-watcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching; no callbacks run after this returns."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._wake_w >= 0:
+            os.write(self._wake_w, b"x")
+        self._thread.join()
+        self._thread = None
+        for fd in (self._inotify_fd, self._wake_r, self._wake_w):
+            if fd is not None and fd >= 0:
+                os.close(fd)
+        self._inotify_fd = None
+        self._wake_r = self._wake_w = -1
+
+    def __enter__(self) -> "VehicleWatcher":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---- change detection -------------------------------------------
+
+    def _scan(self, only: Optional[Set[str]] = None) -> Dict[str, tuple]:
+        """Stamps of the vehicles in the directory (or of just those in only)."""
+        stamps: Dict[str, list] = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return {}
+        for entry in entries:
+            vehicle_id = vehicle_id_for(entry.name)
+            if vehicle_id is None or (only is not None and vehicle_id not in only):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            slot = 1 if entry.name.endswith(JOURNAL_SUFFIX) else 0
+            stamps.setdefault(vehicle_id, [None, None])[slot] = (
+                st.st_mtime_ns,
+                st.st_size,
+            )
+        # A journal without its vehicle file is not a vehicle
+        return {v: tuple(s) for v, s in stamps.items() if s[0] is not None}
+
+    def _diff(self, current: Dict[str, tuple], ids: Set[str]) -> List[VehicleChange]:
+        """Changes among ids between the published stamps and current."""
+        changes = []
+        for vehicle_id in sorted(ids):
+            old = self._stamps.get(vehicle_id)
+            new = current.get(vehicle_id)
+            if old is None and new is not None:
+                changes.append(VehicleChange(ChangeKind.CREATED, vehicle_id))
+            elif old is not None and new is None:
+                changes.append(VehicleChange(ChangeKind.DELETED, vehicle_id))
+            elif old != new:
+                changes.append(VehicleChange(ChangeKind.MODIFIED, vehicle_id))
+            if new is None:
+                self._stamps.pop(vehicle_id, None)
+            else:
+                self._stamps[vehicle_id] = new
+        return changes
+
+    def check(self, ids: Optional[Set[str]] = None) -> List[VehicleChange]:
+        """
+        Rescan now and publish what changed since the last check.
+
+        ids limits the scan to those vehicles (all when None). The polling
+        loop calls this every poll_interval; it is also safe to call while
+        stopped, e.g. from tests.
+        """
+        if ids is None:
+            current = self._scan()
+            ids = set(current) | set(self._stamps)
+        else:
+            current = self._scan(ids)
+        changes = self._diff(current, ids)
+        if changes:
+            self._publish(changes)
+        return changes
+
+    def _run_polling(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+
+    # ---- inotify ----------------------------------------------------
+
+    def _open_inotify(self) -> Optional[int]:
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(self.directory), _WATCH_MASK) < 0:
+            # Missing directory, or out of watches: poll instead
+            os.close(fd)
+            return None
+        return fd
+
+    def _read_events(self) -> Tuple[Set[str], bool]:
+        """Drain the inotify fd: (vehicle ids touched, whether it overflowed)."""
+        ids: Set[str] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._inotify_fd, 65536)
+            except BlockingIOError:
+                return ids, overflow
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                vehicle_id = vehicle_id_for(os.fsdecode(name))
+                if vehicle_id is not None:
+                    ids.add(vehicle_id)
+
+    def _run_inotify(self) -> None:
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._inotify_fd, self._wake_r], [], [])
+            if self._stop.is_set():
+                return
+            if self._inotify_fd not in readable:
+                continue
+            ids, overflow = self._read_events()
+            # Let the rest of a burst (e.g. an atomic write) arrive
+            if self._stop.wait(COALESCE_DELAY):
+                return
+            more, more_overflow = self._read_events()
+            ids |= more
+            if overflow or more_overflow:
+                self.check()
+            elif ids:
+                self.check(ids)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Tests for the Flask web app (in-process, through its test client)."""
+
+import os
+import shutil
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from models import cache_info
+from models.loader import LOAD_WORKERS, LockTimeout
+
+ROOT = Path(__file__).parent.parent
+FIXTURE = ROOT / "tests" / "e2e" / "fixtures" / "test_vehicle.yaml"
+
+sys.path.insert(0, str(ROOT / "web"))
+import app as web_app  # noqa: E402
+
+
+@pytest.fixture
+def vehicle_path(tmp_path, monkeypatch):
+    """The e2e fixture vehicle, in a vehicles directory of its own."""
+    monkeypatch.setattr(web_app, "VEHICLES_DIR", tmp_path)
+    # Leave the watcher off; these tests don't change files behind the app
+    monkeypatch.setattr(web_app, "_watcher_checked", True)
+    path = tmp_path / "test_vehicle.yaml"
+    shutil.copy(FIXTURE, path)
+    return path
+
+
+@pytest.fixture
+def client(vehicle_path):
+    web_app.app.config["TESTING"] = True
+    return web_app.app.test_client()
+
+
+class TestDiagnostics:
+    """Tests for the /diagnostics page."""
+
+    def test_renders_cache_and_pool_figures(self, client):
+        assert client.get("/vehicle/test_vehicle").status_code == 200
+        info = cache_info()
+
+        response = client.get("/diagnostics")
+        assert response.status_code == 200
+        page = response.get_data(as_text=True)
+        assert f"{info.hits} hits, {info.misses} misses" in page
+        assert f"{info.currsize} / {info.maxsize} vehicles" in page
+        assert f"loaded on up to {LOAD_WORKERS} threads" in page
+        assert "File watcher: off" in page
+        # The vehicle just loaded is in the parse timings
+        assert ">test_vehicle</td>" in page
+
+
+VEHICLE_PAGES = [
+    "/vehicle/test_vehicle",
+    "/vehicle/test_vehicle/history",
+    "/vehicle/test_vehicle/chart",
+    "/vehicle/test_vehicle/rules",
+]
+
+
+def touch(path, seconds):
+    """Move path's mtime forward, as an edit by another process would."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + int(seconds * 1e9)))
+
+
+class TestConditionalVehiclePage:
+    """Tests for ETag / Last-Modified revalidation of vehicle pages."""
+
+    @pytest.mark.parametrize("url", VEHICLE_PAGES)
+    def test_matching_etag_is_not_modified(self, client, monkeypatch, url):
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        def not_loaded(path):
+            raise AssertionError(f"{path} loaded for a 304")
+
+        monkeypatch.setattr(web_app, "load_vehicle", not_loaded)
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+
+    def test_if_modified_since(self, client):
+        url = VEHICLE_PAGES[0]
+        last_modified = client.get(url).headers["Last-Modified"]
+        response = client.get(url, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+    def test_changed_file_is_rendered(self, client, vehicle_path):
+        url = VEHICLE_PAGES[0]
+        first = client.get(url)
+        touch(vehicle_path, 1)
+
+        response = client.get(
+            url,
+            headers={
+                "If-None-Match": first.headers["ETag"],
+                "If-Modified-Since": first.headers["Last-Modified"],
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != first.headers["ETag"]
+
+    def test_restart_changes_validators(self, client, monkeypatch):
+        url = VEHICLE_PAGES[0]
+        first = client.get(url)
+        restarted = max(web_app.STARTED, first.last_modified) + timedelta(seconds=1)
+        monkeypatch.setattr(web_app, "STARTED", restarted)
+
+        response = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != first.headers["ETag"]
+        response = client.get(
+            url, headers={"If-Modified-Since": first.headers["Last-Modified"]}
+        )
+        assert response.status_code == 200
+
+    def test_validators_per_query_string(self, client):
+        url = "/vehicle/test_vehicle/history"
+        etag = client.get(url).headers["ETag"]
+        sorted_page = client.get(url + "?sort=date", headers={"If-None-Match": etag})
+        assert sorted_page.status_code == 200
+        assert sorted_page.headers["ETag"] != etag
+
+    def test_validators_per_htmx_request(self, client):
+        url = VEHICLE_PAGES[0]
+        etag = client.get(url).headers["ETag"]
+        partial = client.get(url, headers={"If-None-Match": etag, "HX-Request": "true"})
+        assert partial.status_code == 200
+        assert partial.headers["ETag"] != etag
+
+    def test_pending_flashes_bypass_not_modified(self, client):
+        url = VEHICLE_PAGES[0]
+        etag = client.get(url).headers["ETag"]
+        with client.session_transaction() as session:
+            session["_flashes"] = [("success", "Service logged")]
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert "Service logged" in response.get_data(as_text=True)
+        assert "ETag" not in response.headers
+
+    def test_cache_headers(self, client):
+        response = client.get(VEHICLE_PAGES[0])
+        assert "HX-Request" in response.headers["Vary"]
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "Last-Modified" in response.headers
+
+    def test_missing_vehicle_is_not_tagged(self, client):
+        response = client.get("/vehicle/missing")
+        assert "ETag" not in response.headers
+
+
+class TestLockTimeout:
+    """Tests for writes that time out waiting for the vehicle file lock."""
+
+    @pytest.fixture
+    def busy(self, monkeypatch):
+        def busy(*args, **kwargs):
+            raise LockTimeout("test_vehicle.yaml is locked")
+
+        for name in ("save_history_entry", "delete_history_entry", "delete_rule"):
+            monkeypatch.setattr(web_app, name, busy)
+
+    @pytest.mark.parametrize(
+        "url, data",
+        [
+            (
+                "/vehicle/test_vehicle/log",
+                {"rule_key": "oil/replace", "date": "2024-06-01", "mileage": "1000"},
+            ),
+            ("/vehicle/test_vehicle/history/0/delete", {}),
+            ("/vehicle/test_vehicle/rules/0/delete", {}),
+        ],
+    )
+    def test_write_redirects_with_busy_message(self, client, busy, url, data):
+        response = client.post(url, data=data)
+        assert response.status_code == 302
+        assert response.headers["Location"] == "/vehicle/test_vehicle"
+        with client.session_transaction() as session:
+            assert session["_flashes"] == [
+                ("error", "Vehicle file is busy, please try again")
+            ]
+
+    def test_htmx_write_gets_hx_redirect(self, client, busy):
+        response = client.post(
+            "/vehicle/test_vehicle/history/0/delete", headers={"HX-Request": "true"}
+        )
+        assert response.status_code == 200
+        assert response.headers["HX-Redirect"] == "/vehicle/test_vehicle"
@@ -1,8 +1,47 @@
 #!/usr/bin/env python3
 """Tests for calculation helper functions."""
 
-from datetime import date
-from models import calc_due_miles, calc_due_date, check_status, Status
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from dateutil.relativedelta import relativedelta
+from models import (
+    calc_due_miles,
+    calc_due_date,
+    calc_due_dates,
+    due_date_cache_info,
+    clear_due_date_cache,
+    check_status,
+    parse_date,
+    Status,
+)
+
+
+class TestParseDate:
+    """Tests for parse_date helper function."""
+
+    def test_parses_iso_string(self):
+        assert parse_date("2024-02-29") == date(2024, 2, 29)
+
+    def test_passes_date_through(self):
+        assert parse_date(date(2024, 2, 29)) == date(2024, 2, 29)
+
+    @pytest.mark.parametrize(
+        "value",
+        ["2023-02-29", "2024-1-5", "20240105", "01/05/2024", "", None, 20240105],
+    )
+    def test_rejects_malformed(self, value):
+        with pytest.raises(ValueError, match="expected YYYY-MM-DD"):
+            parse_date(value)
+
+    def test_rejects_datetime(self):
+        with pytest.raises(ValueError):
+            parse_date(datetime(2024, 1, 5, 12, 0))
+
+    def test_error_names_field(self):
+        with pytest.raises(ValueError, match="Invalid purchase date"):
+            parse_date("soon", "purchase date")
 
 
 class TestCalcDueMiles:
@@ -53,6 +92,58 @@ class TestCalcDueDate:
         """None when no interval defined."""
         assert calc_due_date(date(2025, 1, 15), None) is None
 
+    def test_month_end_clamps_before_adding_days(self):
+        """Jan 31 + 1.5 months: Feb 29 (leap year), then 15 days."""
+        assert calc_due_date(date(2024, 1, 31), 1.5) == date(2024, 3, 15)
+
+    def test_memo_matches_relativedelta(self):
+        """Memoized results equal the plain months-plus-days arithmetic."""
+        rng = random.Random(14)
+        for _ in range(2000):
+            last = date(2020, 1, 1) + timedelta(days=rng.randrange(2000))
+            interval = rng.choice([0, 1, 6, 12, 1.5, 7.25, 0.9, 24, 120])
+            months = int(interval)
+            expected = last + relativedelta(
+                months=months, days=int((interval - months) * 30)
+            )
+            assert calc_due_date(last, interval) == expected
+
+
+class TestCalcDueDates:
+    """Tests for the bulk calc_due_dates helper and the due date memo."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_due_date_cache()
+        yield
+        clear_due_date_cache()
+
+    def test_matches_calc_due_date(self):
+        last_dates = [date(2024, 1, 31), None, date(2024, 2, 29), date(2024, 1, 31)]
+        assert calc_due_dates(last_dates, 1.5) == [
+            calc_due_date(d, 1.5) for d in last_dates
+        ]
+
+    def test_no_interval(self):
+        assert calc_due_dates([date(2025, 1, 15), None], None) == [None, None]
+
+    def test_empty(self):
+        assert calc_due_dates([], 6) == []
+
+    def test_computes_each_distinct_date_once(self):
+        calc_due_dates([date(2025, 1, 15)] * 5 + [date(2025, 2, 15)], 6)
+        info = due_date_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (0, 2, 2)
+
+    def test_cache_stats(self):
+        calc_due_date(date(2025, 1, 15), 6)
+        calc_due_date(date(2025, 1, 15), 6.0)
+        calc_due_dates([date(2025, 1, 15)], 6)
+        info = due_date_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+        clear_due_date_cache()
+        assert due_date_cache_info().currsize == 0
+
 
 class TestCheckStatus:
     """Tests for check_status helper function."""
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Tests for Car class."""
 
+from datetime import date
+
+import pytest
 from models import Car
 
 
@@ -28,3 +31,18 @@ class TestCar:
         assert car_none.name == "2024 Honda CBR600RR"
         car_empty = Car("Honda", "CBR600RR", "", 2024, "2024-01-01", 0)
         assert car_empty.name == "2024 Honda CBR600RR"
+
+    def test_uses_slots(self):
+        """Cars carry no per-instance __dict__."""
+        car = Car("Subaru", "WRX", "Limited", 2012, "2012-03-23", 6)
+        assert not hasattr(car, "__dict__")
+
+    def test_purchase_date_ordinal(self):
+        """purchase_date_ordinal holds the parsed purchase date."""
+        car = Car("Subaru", "WRX", "Limited", 2012, "2012-03-23", 6)
+        assert car.purchase_date_ordinal == date(2012, 3, 23).toordinal()
+
+    def test_malformed_purchase_date_rejected(self):
+        """An invalid purchase date fails when the car is built."""
+        with pytest.raises(ValueError, match="purchase date"):
+            Car("Subaru", "WRX", "Limited", 2012, "March 2012", 6)
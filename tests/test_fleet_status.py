@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Tests for the vectorized fleet status engine."""
+
+import random
+from dataclasses import fields
+from datetime import date
+
+import pytest
+from models import Car, HistoryEntry, Rule, Status, Vehicle
+from models import fleet_status
+from models.fleet_status import fleet_due_within, fleet_service_status
+
+np = pytest.importorskip("numpy")
+
+ITEMS = ["oil", "coolant", "air filter"]
+VERBS = ["replace", "inspect", "rotate"]
+INTERVAL_MILES = [None, 0, 3000, 7500, 15000.5]
+INTERVAL_MONTHS = [None, 0, 1, 6, 12, 1.5, 7.25, 24]
+
+
+def random_date(rng: random.Random) -> str:
+    """A date biased toward month ends, where month arithmetic clamps."""
+    year = rng.randint(2019, 2025)
+    month = rng.randint(1, 12)
+    day = rng.choice([1, 15, 28, 29, 30, 31])
+    while True:
+        try:
+            return date(year, month, day).isoformat()
+        except ValueError:
+            day -= 1
+
+
+def random_vehicle(rng: random.Random) -> Vehicle:
+    car = Car("Make", "Model", None, 2019, "2019-01-01", rng.choice([0, 500]))
+    rules = [
+        Rule(
+            rng.choice(ITEMS),
+            rng.choice(VERBS),
+            interval_miles=rng.choice(INTERVAL_MILES),
+            interval_months=rng.choice(INTERVAL_MONTHS),
+            severe_interval_miles=rng.choice(INTERVAL_MILES),
+            severe_interval_months=rng.choice(INTERVAL_MONTHS),
+            phase=rng.choice([None, None, "initial"]),
+            start_miles=rng.choice([0, 0, 20000]),
+            stop_miles=rng.choice([None, None, 60000]),
+            counts_as=rng.sample(VERBS, rng.randint(0, 1)),
+        )
+        for _ in range(rng.randint(0, 8))
+    ]
+    history = [
+        HistoryEntry(
+            f"{rng.choice(ITEMS)}/{rng.choice(VERBS)}",
+            random_date(rng),
+            rng.choice([None, rng.randint(0, 80000)]),
+        )
+        for _ in range(rng.randint(0, 10))
+    ]
+    return Vehicle(
+        car,
+        rules,
+        history,
+        state_as_of_date=rng.choice([None, random_date(rng)]),
+        state_current_miles=rng.choice([None, rng.randint(0, 90000)]),
+    )
+
+
+def comparable(results):
+    """Status results with each rule (compared by identity) swapped for its key."""
+    return [
+        [
+            (svc.rule.key, *(getattr(svc, f.name) for f in fields(svc)[1:]))
+            for svc in rows
+        ]
+        for rows in results
+    ]
+
+
+class TestFleetServiceStatusParity:
+    """The vectorized engine must match Vehicle.get_all_service_status."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"severe": True},
+            {"miles_only": True},
+            {"time_only": True},
+            {"due_soon_miles": 2500, "due_soon_months": 2.5},
+            {"exclude_verbs": ["Inspect"]},
+            {"include_verbs": ["rotate", "replace"]},
+        ],
+    )
+    def test_random_fleets(self, options):
+        # Twin fleets from one seed, so neither side reads the other's
+        # materialized status tables
+        rng, twin_rng = random.Random(12), random.Random(12)
+        for _ in range(30):
+            fleet = [random_vehicle(rng) for _ in range(rng.randint(0, 12))]
+            twins = [random_vehicle(twin_rng) for _ in range(twin_rng.randint(0, 12))]
+            expected = [v.get_all_service_status(**options) for v in twins]
+            assert comparable(fleet_service_status(fleet, **options)) == comparable(
+                expected
+            )
+
+    def test_month_end_clamping(self):
+        """Jan 31 + 1.5 months clamps to Feb 29, then adds 15 days."""
+        car = Car("Make", "Model", None, 2019, "2019-01-01", 0)
+        rule = Rule("oil", "replace", interval_months=1.5)
+        vehicle = Vehicle(
+            car,
+            [rule],
+            [HistoryEntry("oil/replace", "2024-01-31", 1000)],
+            state_as_of_date="2024-03-01",
+        )
+        (svc,) = fleet_service_status([vehicle])[0]
+        assert svc.due_date == "2024-03-15"
+        assert svc == vehicle.calculate_service_due(rule)
+
+
+class TestFleetServiceStatus:
+    """Tests for fleet_service_status behaviour around the NumPy engine."""
+
+    def test_empty_fleet(self):
+        assert fleet_service_status([]) == []
+
+    def test_vehicles_without_rules(self):
+        car = Car("Make", "Model", None, 2019, "2019-01-01", 0)
+        assert fleet_service_status([Vehicle(car, []), Vehicle(car, [])]) == [[], []]
+
+    def test_inactive_rule(self):
+        car = Car("Make", "Model", None, 2019, "2019-01-01", 0)
+        rule = Rule("timing belt", "replace", interval_miles=100000, start_miles=50000)
+        (svc,) = fleet_service_status([Vehicle(car, [rule])])[0]
+        assert svc.status == Status.INACTIVE
+        assert svc.due_miles is None
+
+    def test_falls_back_without_numpy(self, monkeypatch):
+        """Without NumPy the scalar path produces the results."""
+        monkeypatch.setattr(fleet_status, "np", None)
+        rng = random.Random(1)
+        fleet = [random_vehicle(rng) for _ in range(5)]
+        assert fleet_service_status(fleet) == [
+            v.get_all_service_status() for v in fleet
+        ]
+
+    def test_shares_status_tables_with_vehicles(self, monkeypatch):
+        """Tables computed for the fleet serve later per-vehicle calls, and back."""
+        rng = random.Random(3)
+        fleet = [random_vehicle(rng) for _ in range(4)]
+        first = fleet_service_status(fleet, exclude_verbs=["inspect"])
+
+        calls = []
+        original = Vehicle._status_rows
+        monkeypatch.setattr(
+            Vehicle,
+            "_status_rows",
+            lambda self, *a: calls.append(a) or original(self, *a),
+        )
+        assert [v.get_all_service_status(exclude_verbs=["inspect"]) for v in fleet] == (
+            first
+        )
+        assert fleet_service_status(fleet, exclude_verbs=["inspect"]) == first
+        assert calls == []
+
+
+class TestFleetDueWithin:
+    """Tests for the fleet-wide "due in the next N days" query."""
+
+    def test_matches_projected_dates(self):
+        rng = random.Random(16)
+        fleet = [random_vehicle(rng) for _ in range(40)]
+        statuses = fleet_service_status(fleet)
+        due = fleet_due_within(fleet, 90)
+
+        expected = []
+        for i, (vehicle, rows) in enumerate(zip(fleet, statuses)):
+            horizon = date.fromordinal(vehicle.as_of_ordinal + 90).isoformat()
+            expected.extend(
+                (i, row.rule.key)
+                for row in rows
+                if row.projected_date and row.projected_date <= horizon
+            )
+        assert sorted(expected) == sorted((i, row.rule.key) for i, row in due)
+        dates = [row.projected_date for _, row in due]
+        assert dates == sorted(dates)
+
+    @pytest.mark.parametrize(
+        "options",
+        [{}, {"severe": True, "time_only": True}, {"exclude_verbs": ["inspect"]}],
+    )
+    def test_cold_fleet_matches_status_tables(self, options):
+        """Without status tables, the rows come straight from the fleet arrays."""
+        rng, twin_rng = random.Random(17), random.Random(17)
+        fleet = [random_vehicle(rng) for _ in range(60)]
+        twins = [random_vehicle(twin_rng) for _ in range(60)]
+        fleet_service_status(twins, **options)
+
+        cold = fleet_due_within(fleet, 120, **options)
+        assert comparable([[row for _, row in cold]]) == comparable(
+            [[row for _, row in fleet_due_within(twins, 120, **options)]]
+        )
+        assert [i for i, _ in cold] == [
+            i for i, _ in fleet_due_within(twins, 120, **options)
+        ]
+        # Answering from the arrays leaves no tables behind
+        key = (
+            options.get("due_soon_miles", 1000),
+            options.get("due_soon_months", 1),
+            options.get("severe", False),
+            options.get("miles_only", False),
+            options.get("time_only", False),
+        )
+        assert all(v.cached_status(key) is None for v in fleet)
+
+    def test_falls_back_without_numpy(self, monkeypatch):
+        rng, twin_rng = random.Random(5), random.Random(5)
+        fleet = [random_vehicle(rng) for _ in range(20)]
+        twins = [random_vehicle(twin_rng) for _ in range(20)]
+        expected = fleet_due_within(twins, 120)
+        monkeypatch.setattr(fleet_status, "np", None)
+        due = fleet_due_within(fleet, 120)
+        assert [i for i, _ in due] == [i for i, _ in expected]
+        assert comparable([[row for _, row in due]]) == comparable(
+            [[row for _, row in expected]]
+        )
+
+    def test_mileage_rate_projection(self):
+        car = Car("Make", "Model", None, 2019, "2019-01-01", 0)
+        rules = [Rule("oil", "replace", interval_miles=3000)]
+        history = [
+            HistoryEntry("oil/replace", "2024-01-01", 10000),
+            HistoryEntry("oil/replace", "2024-03-01", 12400),
+        ]
+        fleet = [Vehicle(car, rules, history, state_as_of_date="2024-03-01")]
+        # ~40 mi/day: 3000 mi lasts ~75 days
+        assert fleet_due_within(fleet, 60) == []
+        ((i, svc),) = fleet_due_within(fleet, 90)
+        assert (i, svc.projected_date) == (0, "2024-05-15")
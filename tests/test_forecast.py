@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Tests for mileage forecasting."""
+
+import random
+from datetime import date
+
+import pytest
+from models.forecast import FORECAST_WINDOW_DAYS, MileageRate, project_date
+
+DAY = date(2024, 1, 1).toordinal()
+
+
+class TestMileageRate:
+    """Tests for the rolling-window mileage regression."""
+
+    def test_linear_readings(self):
+        rate = MileageRate([(DAY, 1000), (DAY + 10, 1300), (DAY + 20, 1600)])
+        assert rate.miles_per_day == pytest.approx(30)
+        assert rate.points == 3
+
+    def test_least_squares_fit(self):
+        """Noisy readings give the least-squares slope."""
+        rate = MileageRate([(DAY, 0), (DAY + 1, 10), (DAY + 2, 14)])
+        assert rate.miles_per_day == pytest.approx(7)
+
+    def test_unknown_without_two_dates(self):
+        assert MileageRate().miles_per_day is None
+        assert MileageRate([(DAY, 1000)]).miles_per_day is None
+        assert MileageRate([(DAY, 1000), (DAY, 1200)]).miles_per_day is None
+
+    def test_unknown_when_not_increasing(self):
+        assert MileageRate([(DAY, 1000), (DAY + 10, 1000)]).miles_per_day is None
+        assert MileageRate([(DAY, 1000), (DAY + 10, 900)]).miles_per_day is None
+
+    def test_old_readings_leave_the_window(self):
+        """Only readings near the newest one count."""
+        rate = MileageRate([(DAY, 0), (DAY + 100, 100)])
+        assert rate.miles_per_day == pytest.approx(1)
+        start = DAY + 100 + FORECAST_WINDOW_DAYS
+        rate.add(start, 50000)
+        rate.add(start + 10, 50500)
+        assert rate.points == 2
+        assert rate.miles_per_day == pytest.approx(50)
+
+    def test_reading_older_than_window_is_ignored(self):
+        rate = MileageRate([(DAY, 0), (DAY + 10, 100)], window_days=30)
+        rate.add(DAY - 100, 5000)
+        assert rate.points == 2
+        assert rate.miles_per_day == pytest.approx(10)
+
+    def test_incremental_matches_batch_fit(self):
+        """Adding readings one by one, in any order, equals fitting them at once."""
+        rng = random.Random(16)
+        for _ in range(200):
+            # All within one window, so arrival order cannot change membership
+            points = [
+                (DAY + rng.randrange(FORECAST_WINDOW_DAYS), rng.randint(0, 90000) + 0.5)
+                for _ in range(rng.randint(0, 15))
+            ]
+            rate = MileageRate()
+            for point in points:
+                rate.add(*point)
+            assert rate.miles_per_day == MileageRate(points).miles_per_day
+
+    def test_rolling_window_matches_batch_fit(self):
+        """Readings added in date order keep the same window as a batch fit."""
+        rng = random.Random(61)
+        for _ in range(100):
+            points = sorted(
+                (DAY + rng.randrange(4 * FORECAST_WINDOW_DAYS), rng.randint(0, 90000))
+                for _ in range(rng.randint(0, 30))
+            )
+            rate = MileageRate()
+            for point in points:
+                rate.add(*point)
+            batch = MileageRate(points)
+            assert (rate.points, rate.miles_per_day) == (
+                batch.points,
+                batch.miles_per_day,
+            )
+
+    def test_copy_is_independent(self):
+        rate = MileageRate([(DAY, 0), (DAY + 10, 100)])
+        copy = rate.copy()
+        copy.add(DAY + 20, 1000)
+        assert rate.miles_per_day == pytest.approx(10)
+        assert copy.points == 3
+
+
+class TestProjectDate:
+    """Tests for project_date."""
+
+    def test_mileage_only(self):
+        assert project_date(None, 1000, 40, DAY) == "2024-01-26"
+
+    def test_date_only(self):
+        assert project_date("2024-06-01", None, 40, DAY) == "2024-06-01"
+        assert project_date("2024-06-01", 1000, None, DAY) == "2024-06-01"
+
+    def test_earlier_of_both(self):
+        assert project_date("2024-01-10", 1000, 40, DAY) == "2024-01-10"
+        assert project_date("2024-06-01", 1000, 40, DAY) == "2024-01-26"
+
+    def test_overdue_miles_project_to_as_of_date(self):
+        assert project_date(None, -5000, 40, DAY) == "2024-01-01"
+
+    def test_unreachable(self):
+        assert project_date(None, 1e12, 1e-6, DAY) is None
+        assert project_date(None, None, None, DAY) is None
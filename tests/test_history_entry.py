@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Tests for HistoryEntry class."""
 
+from datetime import date
+
+import pytest
 from models import HistoryEntry
 
 
@@ -35,3 +38,33 @@ class TestHistoryEntry:
         assert entry.performed_by is None
         assert entry.notes is None
         assert entry.cost is None
+
+    def test_uses_slots(self):
+        """Entries carry no per-instance __dict__."""
+        entry = HistoryEntry("oil/replace", "2025-01-15")
+        assert not hasattr(entry, "__dict__")
+
+    def test_repeated_strings_are_shared(self):
+        """Equal rule keys, dates and performers share one string object."""
+        a = HistoryEntry("".join(["oil/", "replace"]), "2025-01-15", None, "self")
+        b = HistoryEntry("".join(["oil/", "replace"]), "2025-01-15", None, "self")
+        assert a.rule_key is b.rule_key
+        assert a.date is b.date
+        assert a.performed_by is b.performed_by
+
+    def test_date_ordinal_parsed_once(self):
+        """date_ordinal holds the parsed date and follows reassignment."""
+        entry = HistoryEntry("oil/replace", "2025-01-15")
+        assert entry.date_ordinal == date(2025, 1, 15).toordinal()
+        entry.date = "2025-02-01"
+        assert entry.date_ordinal == date(2025, 2, 1).toordinal()
+
+    def test_date_object_is_stored_as_iso_string(self):
+        """Unquoted YAML dates (date objects) are normalized to strings."""
+        entry = HistoryEntry("oil/replace", date(2025, 1, 15))
+        assert entry.date == "2025-01-15"
+
+    def test_malformed_date_rejected(self):
+        """An invalid date fails when the entry is built."""
+        with pytest.raises(ValueError, match="Invalid date '2025-13-01'"):
+            HistoryEntry("oil/replace", "2025-13-01")
@@ -1,14 +1,34 @@
 #!/usr/bin/env python3
 """Tests for YAML loading and saving utilities."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 import yaml
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from models import loader
 from models import (
     load_vehicle,
+    load_vehicles,
+    parse_timings,
+    cache_info,
+    invalidate_cache,
+    clear_cache,
+    yaml_backend,
+    add_write_listener,
+    remove_write_listener,
+    VehicleFile,
+    LockTimeout,
     save_history_entry,
+    compact_history,
+    journal_path,
     update_history_entry,
     delete_history_entry,
     add_rule,
@@ -169,6 +189,57 @@ rules:
         assert rule.stop_miles == 999999
         assert rule.aftermarket is False
 
+    def test_null_sections_load_as_empty_lists(self, tmp_path):
+        """Explicit nulls for rules/history/state yield empty collections."""
+        yaml_content = """
+car:
+  make: Test
+  model: Car
+  year: 2020
+  purchaseDate: '2020-01-01'
+  purchaseMiles: 0
+state:
+rules:
+history:
+"""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(yaml_content)
+
+        vehicle = load_vehicle(yaml_file)
+
+        assert vehicle.rules == []
+        assert vehicle.history == []
+        assert vehicle.car.trim is None
+        assert vehicle.current_miles == 0
+
+    def test_malformed_history_date_rejected(self, tmp_path):
+        """A bad history date fails the load instead of a later status call."""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(
+            MINIMAL_VEHICLE.replace(
+                "history: []",
+                "history:\n  - ruleKey: oil/replace\n    date: '2024-02-30'",
+            )
+        )
+
+        with pytest.raises(ValueError, match="2024-02-30"):
+            load_vehicle(yaml_file)
+
+    def test_unquoted_dates_load(self, tmp_path):
+        """Unquoted YAML dates (parsed to date objects) are accepted."""
+        yaml_file = tmp_path / "test.yaml"
+        yaml_file.write_text(
+            MINIMAL_VEHICLE.replace("'2016-11-12'", "2016-11-12").replace(
+                "history: []",
+                "history:\n  - ruleKey: oil/replace\n    date: 2024-02-01",
+            )
+        )
+
+        vehicle = load_vehicle(yaml_file)
+
+        assert vehicle.car.purchase_date == "2016-11-12"
+        assert vehicle.history[0].date == "2024-02-01"
+
     def test_accepts_path_object(self, tmp_path):
         """load_vehicle accepts Path objects."""
         yaml_content = """
@@ -793,3 +864,855 @@ class TestDeleteVehicle:
         assert path.exists()
         delete_vehicle(path)
         assert not path.exists()
+
+
+# =============================================================================
+# Parsed-vehicle cache tests
+# =============================================================================
+
+MINIMAL_VEHICLE = """
+car:
+  make: Subaru
+  model: BRZ
+  year: 2015
+  purchaseDate: '2016-11-12'
+  purchaseMiles: 21216
+rules:
+  - item: oil
+    verb: replace
+    intervalMiles: 7500
+history: []
+"""
+
+SERVICED_VEHICLE = """
+car:
+  make: Subaru
+  model: BRZ
+  year: 2015
+  purchaseDate: '2016-11-12'
+  purchaseMiles: 21216
+state:
+  asOfDate: '2025-03-01'
+rules:
+  - item: oil
+    verb: replace
+    intervalMiles: 7500
+    intervalMonths: 6
+  - item: brake fluid
+    verb: replace
+    intervalMonths: 24
+    severeIntervalMonths: 12
+  - item: brake pads
+    verb: inspect
+    intervalMiles: 15000
+history:
+  - ruleKey: oil/replace
+    date: '2024-09-01'
+    mileage: 45000
+  - ruleKey: brake fluid/replace
+    date: '2023-05-01'
+    mileage: 38000
+  - ruleKey: brake pads/inspect
+    date: '2024-09-01'
+    mileage: 45000
+"""
+
+
+class TestVehicleCache:
+    """Tests for the mtime-keyed parsed-vehicle cache in load_vehicle."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_cache()
+        yield
+        clear_cache()
+
+    def test_second_load_is_a_hit(self, tmp_path):
+        """Unchanged file returns the same parsed Vehicle and counts a hit."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        first = load_vehicle(path)
+        second = load_vehicle(str(path))
+
+        assert second is first
+        info = cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+        assert info.currsize == 1
+
+    def test_external_change_is_reparsed(self, tmp_path):
+        """A file edited outside the loader is picked up via mtime/size."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        first = load_vehicle(path)
+
+        path.write_text(MINIMAL_VEHICLE.replace("BRZ", "BRZ tS"))
+        second = load_vehicle(path)
+
+        assert second is not first
+        assert second.car.model == "BRZ tS"
+        assert cache_info().misses == 2
+
+    def test_mutator_updates_cached_vehicle(self, tmp_path):
+        """Loader writes carry the cached vehicle forward with the edit applied."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        before = load_vehicle(path)
+
+        save_history_entry(
+            path, HistoryEntry(rule_key="oil/replace", date="2025-01-01", mileage=1)
+        )
+
+        after = load_vehicle(path)
+        assert cache_info().hits == 1
+        assert len(after.history) == 1
+        # Callers holding the old object do not see the edit
+        assert after is not before
+        assert before.history == []
+
+    @pytest.mark.parametrize("journal", [False, True])
+    def test_cached_vehicle_matches_fresh_parse_after_edits(self, tmp_path, journal):
+        """Each kind of edit leaves the cache equal to re-reading the file."""
+        path = tmp_path / "car.yaml"
+        path.write_text(SERVICED_VEHICLE)
+        options = [{}, {"severe": True}, {"exclude_verbs": ["inspect"]}]
+
+        def check():
+            cached = load_vehicle(path)
+            fresh = loader._read_vehicle(path)
+            for kwargs in options:
+                assert [
+                    (s.rule.key, s.status, s.due_miles, s.due_date)
+                    for s in cached.get_all_service_status(**kwargs)
+                ] == [
+                    (s.rule.key, s.status, s.due_miles, s.due_date)
+                    for s in fresh.get_all_service_status(**kwargs)
+                ]
+            assert [r.key for r in cached.rules] == [r.key for r in fresh.rules]
+            assert [(h.rule_key, h.date, h.mileage) for h in cached.history] == [
+                (h.rule_key, h.date, h.mileage) for h in fresh.history
+            ]
+            assert cached.current_miles == fresh.current_miles
+            assert cached.car.purchase_miles == fresh.car.purchase_miles
+            assert cached.as_of_date == fresh.as_of_date
+
+        check()
+        save_history_entry(
+            path, HistoryEntry("oil/replace", "2025-02-01", 52000), journal=journal
+        )
+        check()
+        compact_history(path)
+        check()
+        update_history_entry(path, 0, HistoryEntry("oil/replace", "2024-12-01", 49000))
+        check()
+        delete_history_entry(path, 1)
+        check()
+        add_rule(path, Rule("coolant", "replace", interval_months=60))
+        check()
+        update_rule(path, 0, Rule("oil", "replace", interval_miles=5000))
+        check()
+        delete_rule(path, 1)
+        check()
+        update_vehicle_meta(path, current_miles=60000, as_of_date="2025-06-01")
+        check()
+        with VehicleFile(path) as vf:
+            vf.add_history_entry(HistoryEntry("coolant/replace", "2025-05-01", 59000))
+            vf.update_meta(car=Car("Make", "Model", None, 2019, "2019-01-01", 100))
+        check()
+        assert cache_info().misses == 1
+
+    def test_write_after_foreign_change_drops_cached_vehicle(self, tmp_path):
+        """A cached vehicle older than the file being edited is not replayed onto."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        load_vehicle(path)
+        path.write_text(
+            MINIMAL_VEHICLE.replace("purchaseMiles: 21216", "purchaseMiles: 5")
+        )
+
+        save_history_entry(
+            path, HistoryEntry(rule_key="oil/replace", date="2025-01-01", mileage=1)
+        )
+
+        assert cache_info().currsize == 0
+        assert load_vehicle(path).car.purchase_miles == 5
+
+    def test_failed_cache_update_does_not_fail_the_write(self, tmp_path, monkeypatch):
+        """A write that reached the file succeeds even if the cache can't follow."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        load_vehicle(path)
+
+        def copy(self):
+            raise RuntimeError("dictionary keys changed during iteration")
+
+        monkeypatch.setattr(Vehicle, "copy", copy)
+        save_history_entry(
+            path, HistoryEntry(rule_key="oil/replace", date="2025-01-01", mileage=1)
+        )
+        monkeypatch.undo()
+
+        assert cache_info().currsize == 0
+        assert [h.mileage for h in load_vehicle(path).history] == [1]
+
+    def test_delete_vehicle_invalidates(self, tmp_path):
+        """Deleting a vehicle removes it from the cache."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        load_vehicle(path)
+
+        delete_vehicle(path)
+
+        assert cache_info().currsize == 0
+
+    def test_invalidate_cache_forces_reparse(self, tmp_path):
+        """invalidate_cache drops a single entry."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        first = load_vehicle(path)
+
+        invalidate_cache(path)
+
+        assert load_vehicle(path) is not first
+
+    def test_lru_eviction(self, tmp_path, monkeypatch):
+        """Least recently used vehicle is evicted once maxsize is exceeded."""
+        monkeypatch.setattr(loader, "CACHE_MAXSIZE", 2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.yaml"
+            path.write_text(MINIMAL_VEHICLE)
+            paths.append(path)
+
+        a = load_vehicle(paths[0])
+        load_vehicle(paths[1])
+        load_vehicle(paths[0])  # a is now most recently used
+        load_vehicle(paths[2])  # evicts b
+
+        assert cache_info().currsize == 2
+        assert load_vehicle(paths[0]) is a
+        load_vehicle(paths[1])
+        assert cache_info().misses == 4
+
+
+# =============================================================================
+# YAML backend tests
+# =============================================================================
+
+VEHICLES_DIR = Path(__file__).parent.parent / "vehicles"
+
+
+class TestYamlBackend:
+    """Tests for libyaml detection and canonical output."""
+
+    def test_reports_backend_names(self):
+        """yaml_backend names the loader and dumper implementations."""
+        backend = yaml_backend()
+        expected_loader = "libyaml" if yaml.__with_libyaml__ else "python"
+        assert backend.loader == expected_loader
+        assert backend.dumper == "python"
+
+    def test_pure_python_fallback(self, tmp_path, monkeypatch):
+        """Loading works when libyaml is unavailable."""
+        monkeypatch.setattr(loader, "_YAML_LOADER", yaml.SafeLoader)
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        assert loader._read_vehicle(path).car.model == "BRZ"
+        assert yaml_backend().loader == "python"
+
+    @pytest.mark.parametrize("name", ["brz.yaml", "wrx.yaml"])
+    def test_rewrite_is_byte_identical(self, tmp_path, name):
+        """A no-op rewrite of a canonical vehicle file does not churn bytes."""
+        original = (VEHICLES_DIR / name).read_bytes()
+        path = tmp_path / name
+        path.write_bytes(original)
+
+        update_vehicle_meta(path)
+
+        assert path.read_bytes() == original
+
+
+# =============================================================================
+# History journal tests
+# =============================================================================
+
+
+class TestHistoryJournal:
+    """Tests for the append-only history journal sidecar."""
+
+    def _entry(self, mileage, date="2025-01-01"):
+        return HistoryEntry(rule_key="oil/replace", date=date, mileage=mileage)
+
+    def test_journal_append_leaves_yaml_untouched(self, tmp_path):
+        """journal=True writes only the sidecar."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        save_history_entry(path, self._entry(1000), journal=True)
+
+        assert path.read_text() == MINIMAL_VEHICLE
+        assert journal_path(path) == tmp_path / "car.history.log"
+        assert journal_path(path).exists()
+
+    def test_load_merges_journal_after_yaml_history(self, tmp_path):
+        """Journaled entries follow the YAML history, in append order."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        save_history_entry(path, self._entry(1000))
+        save_history_entry(path, self._entry(2000), journal=True)
+        save_history_entry(path, self._entry(3000), journal=True)
+
+        vehicle = load_vehicle(path)
+
+        assert [h.mileage for h in vehicle.history] == [1000, 2000, 3000]
+
+    def test_journal_shared_through_symlink(self, tmp_path):
+        """Writers reaching the vehicle through a symlink share its journal."""
+        target_dir = tmp_path / "data"
+        target_dir.mkdir()
+        target = target_dir / "car.yaml"
+        target.write_text(MINIMAL_VEHICLE)
+        link = tmp_path / "car.yaml"
+        link.symlink_to(target)
+
+        save_history_entry(link, self._entry(1000), journal=True)
+
+        assert journal_path(link) == journal_path(target)
+        assert journal_path(link).parent == target_dir
+        assert [h.mileage for h in load_vehicle(target).history] == [1000]
+
+    def test_journal_append_invalidates_cache(self, tmp_path):
+        """A cached vehicle is refreshed after a journal append."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        assert load_vehicle(path).history == []
+
+        save_history_entry(path, self._entry(1000), journal=True)
+
+        assert len(load_vehicle(path).history) == 1
+
+    def test_compact_folds_journal_into_yaml(self, tmp_path):
+        """compact_history moves entries into the YAML and removes the journal."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        save_history_entry(path, self._entry(1000), journal=True)
+        save_history_entry(path, self._entry(2000), journal=True)
+
+        assert compact_history(path) == 2
+
+        assert not journal_path(path).exists()
+        with open(path) as f:
+            data = yaml.safe_load(f)
+        assert [h["mileage"] for h in data["history"]] == [1000, 2000]
+
+    def test_compact_without_journal_is_noop(self, tmp_path):
+        """No journal means nothing to fold and no rewrite."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        assert compact_history(path) == 0
+        assert path.read_text() == MINIMAL_VEHICLE
+
+    def test_index_mutators_see_journaled_entries(self, tmp_path):
+        """Indices from load_vehicle stay valid for update/delete."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        save_history_entry(path, self._entry(1000))
+        save_history_entry(path, self._entry(2000), journal=True)
+
+        update_history_entry(path, 1, self._entry(2500))
+
+        assert not journal_path(path).exists()
+        assert [h.mileage for h in load_vehicle(path).history] == [1000, 2500]
+
+    def test_torn_final_line_is_ignored(self, tmp_path):
+        """An append interrupted before its newline is skipped."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        save_history_entry(path, self._entry(1000), journal=True)
+        with open(journal_path(path), "a") as f:
+            f.write('{"ruleKey": "oil/repl')
+
+        assert [h.mileage for h in load_vehicle(path).history] == [1000]
+
+    def test_append_after_torn_line(self, tmp_path):
+        """An interrupted append is cut off before the next one lands."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        save_history_entry(path, self._entry(1000), journal=True)
+        with open(journal_path(path), "a") as f:
+            f.write('{"ruleKey": "oil/repl')
+
+        save_history_entry(path, self._entry(2000), journal=True)
+        clear_cache()
+
+        assert [h.mileage for h in load_vehicle(path).history] == [1000, 2000]
+        assert compact_history(path) == 2
+
+    def test_malformed_line_is_skipped(self, tmp_path, caplog):
+        """A corrupt line in the middle is logged, not fatal."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        save_history_entry(path, self._entry(1000), journal=True)
+        with open(journal_path(path), "a") as f:
+            f.write("not json\n[1, 2]\n")
+        save_history_entry(path, self._entry(2000), journal=True)
+        clear_cache()
+
+        assert [h.mileage for h in load_vehicle(path).history] == [1000, 2000]
+        assert "car.history.log:3: skipping malformed journal line" in caplog.text
+        assert "car.history.log:4: skipping" in caplog.text
+
+    def test_crash_after_fold_does_not_duplicate(self, tmp_path):
+        """A journal left behind by an interrupted fold is not applied twice."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        save_history_entry(path, self._entry(1000), journal=True)
+        save_history_entry(path, self._entry(2000), journal=True)
+        journal = journal_path(path).read_bytes()
+        compact_history(path)
+        # As if the process died between replacing the YAML and the unlink
+        journal_path(path).write_bytes(journal)
+        clear_cache()
+
+        assert [h.mileage for h in load_vehicle(path).history] == [1000, 2000]
+
+        save_history_entry(path, self._entry(3000), journal=True)
+        clear_cache()
+        assert [h.mileage for h in load_vehicle(path).history] == [1000, 2000, 3000]
+        assert compact_history(path) == 1
+        assert [h.mileage for h in load_vehicle(path).history] == [1000, 2000, 3000]
+
+    def test_journal_without_header(self, tmp_path):
+        """Journals from before headers load as before."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        journal_path(path).write_text(
+            '{"ruleKey": "oil/replace", "date": "2025-01-01", "mileage": 1000}\n'
+        )
+
+        assert [h.mileage for h in load_vehicle(path).history] == [1000]
+        assert compact_history(path) == 1
+        assert "journalFold" not in path.read_text()
+
+    def test_delete_vehicle_removes_journal(self, tmp_path):
+        """Deleting a vehicle also deletes its journal."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        save_history_entry(path, self._entry(1000), journal=True)
+
+        delete_vehicle(path)
+
+        assert not journal_path(path).exists()
+
+
+# =============================================================================
+# VehicleFile transaction tests
+# =============================================================================
+
+
+class TestVehicleFile:
+    """Tests for batching edits with the VehicleFile transaction."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        return path
+
+    @pytest.fixture
+    def dumps(self, monkeypatch):
+        """Count full-document writes."""
+        calls = []
+        real_dump = loader._dump_yaml
+
+        def counting_dump(filename, data):
+            calls.append(filename)
+            real_dump(filename, data)
+
+        monkeypatch.setattr(loader, "_dump_yaml", counting_dump)
+        return calls
+
+    def test_many_edits_write_once(self, path, dumps):
+        """Rule, history and meta edits in one batch cost a single write."""
+        with VehicleFile(path) as vf:
+            for miles in (5000, 12000, 19500):
+                vf.add_history_entry(
+                    HistoryEntry(
+                        rule_key="oil/replace", date="2025-01-01", mileage=miles
+                    )
+                )
+            vf.add_rule(Rule(item="tires", verb="rotate", interval_miles=5000))
+            vf.update_rule(0, Rule(item="oil", verb="replace", interval_miles=5000))
+            vf.delete_history_entry(0)
+            vf.update_meta(current_miles=20000)
+
+        assert len(dumps) == 1
+        vehicle = load_vehicle(path)
+        assert [h.mileage for h in vehicle.history] == [12000, 19500]
+        assert [r.key for r in vehicle.rules] == ["oil/replace", "tires/rotate"]
+        assert vehicle.rules[0].interval_miles == 5000
+        assert vehicle.current_miles == 20000
+
+    def test_exception_rolls_back(self, path, dumps):
+        """An error inside the block leaves the file untouched."""
+        with pytest.raises(IndexError):
+            with VehicleFile(path) as vf:
+                vf.add_rule(Rule(item="tires", verb="rotate", interval_miles=5000))
+                vf.delete_rule(5)
+
+        assert dumps == []
+        assert path.read_text() == MINIMAL_VEHICLE
+
+    def test_explicit_rollback(self, path, dumps):
+        """rollback() discards pending edits."""
+        vf = VehicleFile(path)
+        vf.delete_rule(0)
+        vf.rollback()
+
+        assert dumps == []
+        with pytest.raises(RuntimeError):
+            vf.commit()
+
+    def test_no_edits_no_write(self, path, dumps):
+        """A read-only transaction does not rewrite the file."""
+        with VehicleFile(path) as vf:
+            assert vf.vehicle.rules[0].key == "oil/replace"
+
+        assert dumps == []
+
+    def test_vehicle_reflects_pending_edits(self, path):
+        """vehicle shows the document as edited so far."""
+        with VehicleFile(path) as vf:
+            vf.add_rule(Rule(item="tires", verb="rotate", interval_miles=5000))
+            assert vf.vehicle.get_rule("tires/rotate") is not None
+            vf.rollback()
+
+        assert load_vehicle(path).get_rule("tires/rotate") is None
+
+
+# =============================================================================
+# Atomic write tests
+# =============================================================================
+
+
+class TestAtomicWrites:
+    """Tests for temp-file + fsync + rename writes."""
+
+    def test_leaves_no_temp_files(self, tmp_path):
+        """Only the vehicle file remains after a write."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        add_rule(path, Rule(item="tires", verb="rotate", interval_miles=5000))
+
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_failed_dump_keeps_original(self, tmp_path, monkeypatch):
+        """A crash mid-dump leaves the old file intact and cleans up."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        def exploding_dump(*args, **kwargs):
+            raise RuntimeError("disk on fire")
+
+        monkeypatch.setattr(yaml, "dump", exploding_dump)
+        with pytest.raises(RuntimeError):
+            add_rule(path, Rule(item="tires", verb="rotate", interval_miles=5000))
+
+        assert path.read_text() == MINIMAL_VEHICLE
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_preserves_file_mode(self, tmp_path):
+        """The replacement keeps the original permission bits."""
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        path.chmod(0o640)
+
+        update_vehicle_meta(path, current_miles=30000)
+
+        assert path.stat().st_mode & 0o777 == 0o640
+
+    def test_writes_through_symlink(self, tmp_path):
+        """A symlinked vehicle file stays a symlink to the updated target."""
+        target = tmp_path / "real.yaml"
+        target.write_text(MINIMAL_VEHICLE)
+        link = tmp_path / "car.yaml"
+        link.symlink_to(target)
+
+        update_vehicle_meta(link, current_miles=30000)
+
+        assert link.is_symlink()
+        assert load_vehicle(target).current_miles == 30000
+
+
+# =============================================================================
+# File locking tests
+# =============================================================================
+
+
+@pytest.mark.skipif(fcntl is None, reason="advisory locks need fcntl")
+class TestFileLocking:
+    """Tests for the advisory locks around vehicle file reads and writes."""
+
+    @pytest.fixture(autouse=True)
+    def _reset(self, monkeypatch):
+        monkeypatch.setattr(loader, "LOCK_TIMEOUT", 0.1)
+        clear_cache()
+        loader.reset_lock_stats()
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        return path
+
+    def _hold(self, path, kind):
+        """Take a lock on the vehicle file through a separate descriptor."""
+        fp = open(loader.lock_path(path), "a")
+        fcntl.flock(fp, kind)
+        return fp
+
+    def test_concurrent_saves_keep_every_entry(self, path, monkeypatch):
+        """Parallel read-modify-write saves do not lose history entries."""
+        monkeypatch.setattr(loader, "LOCK_TIMEOUT", 30.0)
+
+        def log(n):
+            save_history_entry(path, HistoryEntry("oil/replace", "2024-01-01", n))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(log, range(40)))
+
+        mileages = sorted(h.mileage for h in load_vehicle(path).history)
+        assert mileages == list(range(40))
+
+    def test_readers_do_not_block_each_other(self, path):
+        """A load succeeds while another reader holds a shared lock."""
+        with self._hold(path, fcntl.LOCK_SH):
+            assert load_vehicle(path).car.model == "BRZ"
+
+    def test_reader_waits_for_writer(self, path):
+        """A load times out while a writer holds the exclusive lock."""
+        with self._hold(path, fcntl.LOCK_EX):
+            with pytest.raises(LockTimeout):
+                load_vehicle(path)
+        assert loader.lock_stats().timeouts == 1
+
+    def test_writer_waits_for_reader(self, path):
+        """A write times out while a reader holds a shared lock."""
+        with self._hold(path, fcntl.LOCK_SH):
+            with pytest.raises(LockTimeout):
+                VehicleFile(path, timeout=0.05)
+        assert "car" in yaml.safe_load(path.read_text())
+
+    def test_journal_append_is_locked(self, path):
+        """Journal appends take the exclusive lock too."""
+        with self._hold(path, fcntl.LOCK_SH):
+            with pytest.raises(LockTimeout):
+                save_history_entry(
+                    path, HistoryEntry("oil/replace", "2024-01-01"), journal=True
+                )
+        assert not journal_path(path).exists()
+
+    def test_lock_released_after_commit_and_rollback(self, path):
+        """Both ways of closing a VehicleFile release the lock."""
+        VehicleFile(path).commit()
+        VehicleFile(path).rollback()
+        with pytest.raises(ValueError), VehicleFile(path):
+            raise ValueError
+        with self._hold(path, fcntl.LOCK_EX | fcntl.LOCK_NB):
+            pass
+
+    def test_nested_use_in_one_thread_does_not_deadlock(self, path):
+        """Loading a file inside its own VehicleFile block does not self-block."""
+        with VehicleFile(path) as vf:
+            vf.update_meta(current_miles=20000)
+            assert load_vehicle(path).current_miles == 21216
+        assert load_vehicle(path).current_miles == 20000
+
+    def test_contention_is_recorded(self, path):
+        """Waiting for a lock shows up in lock_stats."""
+        holder = self._hold(path, fcntl.LOCK_EX)
+        timer = threading.Timer(0.03, holder.close)
+        timer.start()
+        load_vehicle(path)
+        timer.join()
+
+        stats = loader.lock_stats()
+        assert stats.acquired == 1
+        assert stats.contended == 1
+        assert stats.max_wait_seconds > 0
+
+    def test_delete_vehicle_keeps_lock_file(self, path):
+        """
+        The lock file outlives the vehicle.
+
+        Unlinking it while locked would let a waiter on the old inode and a
+        newcomer locking a fresh one both hold the "exclusive" lock.
+        """
+        load_vehicle(path)
+        inode = loader.lock_path(path).stat().st_ino
+        delete_vehicle(path)
+        assert loader.lock_path(path).stat().st_ino == inode
+
+
+class TestLoadVehicles:
+    """Tests for load_vehicles and parse_timings."""
+
+    @pytest.fixture
+    def paths(self, tmp_path):
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"car{i}.yaml"
+            path.write_text(MINIMAL_VEHICLE.replace("21216", str(1000 * i)))
+            paths.append(path)
+        return paths
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_keeps_path_order(self, paths, workers):
+        vehicles = load_vehicles(paths, workers=workers)
+        assert [v.car.purchase_miles for v in vehicles] == [1000 * i for i in range(6)]
+        assert vehicles[0] is load_vehicle(paths[0])
+
+    def test_evaluate_runs_per_vehicle(self, paths):
+        threads = set()
+
+        def evaluate(vehicle):
+            threads.add(threading.current_thread().name)
+            return vehicle.car.purchase_miles
+
+        assert load_vehicles(paths, evaluate=evaluate, workers=3) == [
+            1000 * i for i in range(6)
+        ]
+        assert threads and all(t.startswith("load-vehicle") for t in threads)
+
+    def test_worker_error_is_raised(self, paths):
+        paths[3].write_text("car: [")
+        with pytest.raises(yaml.YAMLError):
+            load_vehicles(paths, workers=4)
+
+    def test_parse_timings(self, paths):
+        clear_cache()
+        load_vehicles(paths, workers=2)
+        load_vehicle(paths[0])  # cache hit, not a parse
+
+        timings = parse_timings()
+        assert sorted(t.path for t in timings) == sorted(
+            str(p.resolve()) for p in paths
+        )
+        seconds = [t.seconds for t in timings]
+        assert seconds == sorted(seconds, reverse=True)
+        assert len(parse_timings(limit=2)) == 2
+
+        clear_cache()
+        assert parse_timings() == []
+
+
+class TestWriteListeners:
+    """Tests for add_write_listener."""
+
+    @pytest.fixture
+    def writes(self):
+        calls = []
+
+        def listener(path, vehicle):
+            calls.append((path, vehicle))
+
+        add_write_listener(listener)
+        yield calls
+        remove_write_listener(listener)
+
+    def test_edit_passes_vehicle_as_written(self, tmp_path, writes):
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        update_vehicle_meta(path, current_miles=30000)
+
+        [(written, vehicle)] = writes
+        assert written == str(path.resolve())
+        assert vehicle.current_miles == 30000
+
+    def test_edit_of_cached_vehicle_reuses_it(self, tmp_path, writes):
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+        load_vehicle(path)
+
+        save_history_entry(path, HistoryEntry("oil/replace", "2024-01-01", 25000))
+
+        [(_, vehicle)] = writes
+        assert vehicle is load_vehicle(path)
+        assert len(vehicle.history) == 1
+
+    def test_journal_append(self, tmp_path, writes):
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        save_history_entry(
+            path, HistoryEntry("oil/replace", "2024-01-01", 25000), journal=True
+        )
+
+        [(_, vehicle)] = writes
+        assert vehicle.history[0].mileage == 25000
+
+    def test_create_and_delete(self, tmp_path, writes):
+        path = tmp_path / "car.yaml"
+        create_vehicle(path, Car("Subaru", "BRZ", None, 2015, "2016-11-12", 21216))
+        delete_vehicle(path)
+
+        [(_, created), (_, deleted)] = writes
+        assert created.car.model == "BRZ"
+        assert deleted is None
+
+    def test_rollback_and_failed_write_notify_nobody(self, tmp_path, writes):
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        with VehicleFile(path) as vf:
+            vf.update_meta(current_miles=30000)
+            vf.rollback()
+        with pytest.raises(IndexError):
+            delete_rule(path, 5)
+
+        assert writes == []
+
+    def test_listener_error_does_not_fail_write(self, tmp_path, writes, caplog):
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        def broken(path, vehicle):
+            raise RuntimeError("boom")
+
+        add_write_listener(broken)
+        try:
+            update_vehicle_meta(path, current_miles=30000)
+        finally:
+            remove_write_listener(broken)
+
+        assert load_vehicle(path).current_miles == 30000
+        assert len(writes) == 1
+        [record] = [r for r in caplog.records if r.name == "models.loader"]
+        assert record.levelname == "ERROR"
+        assert "write listener" in record.getMessage()
+        assert "RuntimeError: boom" in caplog.text
+
+
+class TestDateValidationOnWrite:
+    """Malformed as-of dates are rejected before anything is written."""
+
+    def test_update_vehicle_meta_rejects_bad_as_of_date(self, tmp_path):
+        path = tmp_path / "car.yaml"
+        path.write_text(MINIMAL_VEHICLE)
+
+        with pytest.raises(ValueError, match="as-of date"):
+            update_vehicle_meta(path, as_of_date="yesterday")
+        assert path.read_text() == MINIMAL_VEHICLE
+
+    def test_create_vehicle_rejects_bad_as_of_date(self, tmp_path):
+        path = tmp_path / "car.yaml"
+        car = Car("Subaru", "BRZ", None, 2015, "2016-11-12", 21216)
+
+        with pytest.raises(ValueError, match="as-of date"):
+            create_vehicle(path, car, as_of_date="2025-13-01")
+        assert not path.exists()
@@ -1,8 +1,19 @@
 #!/usr/bin/env python3
 """Tests for maint CLI formatting and table helpers."""
 
+import argparse
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
 from models import Car, Rule, HistoryEntry, ServiceDue, Status, Vehicle
 from maint import (
+    iso_date,
     format_miles,
     format_cost,
     format_remaining,
@@ -12,6 +23,18 @@ from maint import (
     make_history_table,
     extract_chart_data,
     cmd_chart,
+    cmd_status,
+    cmd_history,
+    build_parser,
+    requested_command,
+    cmd_rules,
+    write_records,
+    HISTORY_FIELDS,
+    RULE_FIELDS,
+    STATUS_FIELDS,
+    SCHEMA_VERSION,
+    cmd_fleet_status,
+    iter_fleet_status,
 )
 
 
@@ -106,6 +129,17 @@ class TestTruncate:
         assert truncate("hello world", max_len=8) == "hello..."
 
 
+class TestIsoDate:
+    """Tests for the iso_date argparse type."""
+
+    def test_valid_date_returned_unchanged(self):
+        assert iso_date("2025-01-15") == "2025-01-15"
+
+    def test_malformed_date_is_argument_error(self):
+        with pytest.raises(argparse.ArgumentTypeError, match="expected YYYY-MM-DD"):
+            iso_date("2025-1-15")
+
+
 class TestMakeStatusTable:
     """Tests for make_status_table."""
 
@@ -323,3 +357,315 @@ class TestCmdChartEdgeCases:
         result = cmd_chart(args)
         assert result == 0
         assert "No mileage data to chart." in capsys.readouterr().out
+
+
+class TestCmdStatusAsOf:
+    """Tests for cmd_status --as-of."""
+
+    def test_header_and_history_cut_off(self, capsys, tmp_path):
+        yaml_path = tmp_path / "test.yaml"
+        yaml_path.write_text(
+            "car:\n  make: Test\n  model: Car\n  trim: Base\n"
+            "  year: 2020\n  purchaseDate: '2020-01-01'\n  purchaseMiles: 0\n"
+            "history:\n"
+            "- ruleKey: oil/replace\n  date: '2020-03-01'\n  mileage: 3000\n"
+            "- ruleKey: oil/replace\n  date: '2020-09-01'\n  mileage: 9000\n"
+            "rules:\n- item: oil\n  verb: replace\n  intervalMiles: 5000\n"
+        )
+        args = argparse.Namespace(
+            vehicle_file=yaml_path,
+            severe=False,
+            miles_only=False,
+            time_only=False,
+            exclude_verbs=None,
+            as_of="2020-06-01",
+            format="table",
+        )
+        assert cmd_status(args) == 0
+        out = capsys.readouterr().out
+        assert "Mileage: 6,000 (estimated, as of 2020-06-01)" in out
+        assert "History entries: 1 (of 2)" in out
+        # Due at 8,000 from the March change, not 14,000 from September
+        assert "8,000" in out
+
+
+VEHICLE_YAML = (
+    "car:\n  make: Test\n  model: {model}\n  trim: Base\n"
+    "  year: 2020\n  purchaseDate: '2020-01-01'\n  purchaseMiles: 0\n"
+    "state:\n  currentMiles: {miles}\n  asOfDate: '2020-06-01'\n"
+    "history:\n- ruleKey: oil/replace\n  date: '2020-01-01'\n  mileage: 0\n"
+    "rules:\n- item: oil\n  verb: replace\n  intervalMiles: 5000\n"
+)
+
+
+class TestFleetStatus:
+    """Tests for the fleet status command."""
+
+    @pytest.fixture
+    def fleet_dir(self, tmp_path):
+        # Oil due at 5,000: overdue, due soon and OK
+        for model, miles in [("A", 6000), ("B", 4500), ("C", 1000)]:
+            (tmp_path / f"{model.lower()}.yaml").write_text(
+                VEHICLE_YAML.format(model=model, miles=miles)
+            )
+        return tmp_path
+
+    def fleet_args(self, path, **overrides):
+        options = dict(
+            vehicle_file=path,
+            workers=1,
+            chunksize=1,
+            severe=False,
+            miles_only=False,
+            time_only=False,
+            exclude_verbs=None,
+        )
+        options.update(overrides)
+        return argparse.Namespace(**options)
+
+    def test_pool_matches_serial(self, fleet_dir):
+        paths = sorted(fleet_dir.glob("*.yaml"))
+        options = dict(severe=False)
+        serial = list(iter_fleet_status(paths, options))
+        pooled = list(iter_fleet_status(paths, options, workers=2, chunksize=2))
+
+        def summary(results):
+            return sorted(
+                (path, name, [s.rule.key for s in overdue], [s.rule.key for s in soon])
+                for path, name, _, overdue, soon, _ in results
+            )
+
+        assert summary(pooled) == summary(serial)
+        assert [r[1] for r in serial] == [
+            "2020 Test A Base",
+            "2020 Test B Base",
+            "2020 Test C Base",
+        ]
+
+    def test_summary(self, capsys, fleet_dir):
+        assert cmd_fleet_status(self.fleet_args(fleet_dir)) == 0
+        out = capsys.readouterr().out
+        assert "2020 Test A Base" in out
+        assert "1 overdue, 0 due soon" in out
+        assert "0 overdue, 1 due soon" in out
+        assert "Vehicles: 3" in out
+        assert "Needing service: 2" in out
+        assert "Overdue: 1" in out
+        assert "Due soon: 1" in out
+
+    def test_bad_file_reported_not_fatal(self, capsys, fleet_dir):
+        (fleet_dir / "broken.yaml").write_text("car: [\n")
+        assert cmd_fleet_status(self.fleet_args(fleet_dir, workers=2)) == 1
+        out = capsys.readouterr().out
+        assert "broken.yaml: ERROR" in out
+        assert "Vehicles: 3" in out
+        assert "Failed to load: 1" in out
+
+    def test_rejects_exclusive_filters(self, capsys, fleet_dir):
+        args = self.fleet_args(fleet_dir, miles_only=True, time_only=True)
+        assert cmd_fleet_status(args) == 1
+
+
+class TestMachineReadableOutput:
+    """Tests for --format json/ndjson/csv on status, history and rules."""
+
+    @pytest.fixture
+    def yaml_path(self, tmp_path):
+        path = tmp_path / "test.yaml"
+        path.write_text(
+            "car:\n  make: Test\n  model: Car\n  trim: Base\n"
+            "  year: 2020\n  purchaseDate: '2020-01-01'\n  purchaseMiles: 0\n"
+            "state:\n  currentMiles: 6000\n  asOfDate: '2020-06-01'\n"
+            "history:\n"
+            "- ruleKey: oil/replace\n  date: '2020-01-01'\n  mileage: 0\n"
+            "  notes: 'Synthetic, 5qt'\n"
+            "- ruleKey: tires/rotate\n  date: '2020-03-01'\n  mileage: 3000\n"
+            "  cost: 25.0\n"
+            "rules:\n- item: tires\n  verb: rotate\n  intervalMiles: 7500\n"
+            "- item: oil\n  verb: replace\n  intervalMiles: 5000\n"
+        )
+        return path
+
+    def status_args(self, path, fmt):
+        return argparse.Namespace(
+            vehicle_file=path,
+            severe=False,
+            miles_only=False,
+            time_only=False,
+            exclude_verbs=None,
+            as_of=None,
+            format=fmt,
+        )
+
+    def history_args(self, path, fmt, **overrides):
+        options = dict(
+            vehicle_file=path,
+            rule=None,
+            since=None,
+            sort="date",
+            asc=False,
+            show_index=False,
+            format=fmt,
+        )
+        options.update(overrides)
+        return argparse.Namespace(**options)
+
+    def test_status_json(self, capsys, yaml_path):
+        assert cmd_status(self.status_args(yaml_path, "json")) == 0
+        doc = json.loads(capsys.readouterr().out)
+        assert doc["schema"] == "maint.status/1"
+        assert doc["vehicle"]["current_miles"] == 6000
+        # Most urgent first, raw values
+        assert [r["rule_key"] for r in doc["rows"]] == ["oil/replace", "tires/rotate"]
+        assert list(doc["rows"][0]) == STATUS_FIELDS
+        assert doc["rows"][0]["status"] == "OVERDUE"
+        assert doc["rows"][0]["miles_remaining"] == -1000
+
+    def test_status_ndjson_matches_json(self, capsys, yaml_path):
+        cmd_status(self.status_args(yaml_path, "json"))
+        doc = json.loads(capsys.readouterr().out)
+        cmd_status(self.status_args(yaml_path, "ndjson"))
+        header, *rows = map(json.loads, capsys.readouterr().out.splitlines())
+        assert header["schema"] == "maint.status/1"
+        assert header["fields"] == STATUS_FIELDS
+        assert rows == doc["rows"]
+
+    def test_history_csv(self, capsys, yaml_path):
+        assert cmd_history(self.history_args(yaml_path, "csv")) == 0
+        out = capsys.readouterr().out
+        assert out.splitlines()[0] == ",".join([*HISTORY_FIELDS, "schema"])
+        rows = list(csv.DictReader(io.StringIO(out)))
+        assert {r["schema"] for r in rows} == {"maint.history/1"}
+        assert [r["index"] for r in rows] == ["1", "0"]
+        assert rows[0]["cost"] == "25.0"
+        assert rows[0]["notes"] == ""
+        assert rows[1]["notes"] == "Synthetic, 5qt"
+
+    def test_history_filters_apply(self, capsys, yaml_path):
+        cmd_history(self.history_args(yaml_path, "ndjson", rule="oil"))
+        lines = capsys.readouterr().out.splitlines()
+        assert json.loads(lines[0])["schema"] == "maint.history/1"
+        assert [json.loads(line)["rule_key"] for line in lines[1:]] == ["oil/replace"]
+
+    def test_rules_json(self, capsys, yaml_path):
+        args = argparse.Namespace(
+            vehicle_file=yaml_path, show_index=False, format="json"
+        )
+        assert cmd_rules(args) == 0
+        doc = json.loads(capsys.readouterr().out)
+        assert doc["schema"] == "maint.rules/1"
+        assert [(r["index"], r["rule_key"]) for r in doc["rows"]] == [
+            (1, "oil/replace"),
+            (0, "tires/rotate"),
+        ]
+        assert list(doc["rows"][0]) == RULE_FIELDS
+        assert doc["rows"][0]["aftermarket"] is False
+
+    @pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+    def test_rows_streamed(self, capsys, fmt):
+        """Each row is written before the next one is produced."""
+        seen = []
+
+        def records():
+            for i in range(3):
+                seen.append(capsys.readouterr().out)
+                yield {"n": i}
+
+        write_records(fmt, "test", ["n"], records(), {})
+        tail = capsys.readouterr().out
+        assert seen[0]  # header before the first row
+        assert all("1" in chunk for chunk in seen[2:])
+        assert "2" in tail
+
+    def test_csv_carries_schema(self, capsys):
+        write_records("csv", "test", ["n", "s"], iter([{"n": 1, "s": None}]), {})
+        assert capsys.readouterr().out == (
+            f"n,s,schema\n1,,maint.test/{SCHEMA_VERSION}\n"
+        )
+
+    def test_empty_json_is_valid(self, capsys):
+        write_records("json", "test", ["n"], iter(()), {"name": "x"})
+        assert json.loads(capsys.readouterr().out)["rows"] == []
+
+
+ROOT = Path(__file__).parent.parent
+
+
+def imported_modules(*argv):
+    """Top-level package names imported by a fresh `maint.py` run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "maint.py", *argv],
+        cwd=ROOT,
+        # A running daemon would answer instead of the fresh process
+        env={**os.environ, "MAINT_NO_DAEMON": "1"},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+class TestStartup:
+    """Guards against heavy imports creeping back into CLI startup."""
+
+    # Only needed by some commands, so imported where they are used
+    DEFERRED = {
+        "tabulate",
+        "dateutil",
+        "numpy",
+        "plotext",
+        "multiprocessing",
+        "concurrent",
+    }
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--help"],
+            ["vehicles/brz.yaml", "rules", "--format", "csv"],
+            ["vehicles/brz.yaml", "history", "--format", "ndjson"],
+        ],
+    )
+    def test_light_commands_skip_deferred_imports(self, argv):
+        assert imported_modules(*argv) & self.DEFERRED == set()
+
+    def test_table_output_imports_what_it_needs(self):
+        modules = imported_modules("vehicles/brz.yaml", "status")
+        assert {"tabulate", "dateutil"} <= modules
+        assert "multiprocessing" not in modules
+
+
+class TestDeferredParser:
+    """Building only the invoked subcommand's parser must not change parsing."""
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["v.yaml", "status", "--severe", "--as-of", "2024-01-01"],
+            ["v.yaml", "history", "--rule", "status", "--format", "csv"],
+            ["v.yaml", "history", "add", "oil/replace", "--mileage", "1000"],
+            ["v.yaml", "rules", "edit", "0", "--notes", "rules"],
+            ["v.yaml", "edit", "--current-miles", "5"],
+            ["dir", "fleet", "status", "--workers", "2"],
+            ["v.yaml", "chart", "--rule", "oil"],
+            ["v.yaml", "compact"],
+        ],
+    )
+    def test_matches_full_parser(self, argv):
+        deferred = build_parser(requested_command(argv)).parse_args(argv)
+        assert vars(deferred) == vars(build_parser().parse_args(argv))
+
+    def test_requested_command(self):
+        assert requested_command(["v.yaml", "history", "--rule", "rules"]) == "history"
+        assert requested_command(["--yaml-backend"]) is None
+        assert requested_command(["v.yaml", "bogus"]) is None
+
+    def test_other_commands_are_listed_in_help(self, capsys):
+        with pytest.raises(SystemExit):
+            build_parser("status").parse_args(["--help"])
+        out = capsys.readouterr().out
+        assert "Fold the append-only history journal" in out
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Tests for the maint.py daemon and command forwarding."""
+
+import os
+import socket
+import threading
+
+import pytest
+from maint import main
+import maint_daemon
+from maint_daemon import _SERVED_OPTIONS, forward, forwardable, make_server, serve
+from models import HistoryEntry, save_history_entry
+
+VEHICLE_YAML = (
+    "car:\n  make: Test\n  model: Car\n  trim: Base\n"
+    "  year: 2020\n  purchaseDate: '2020-01-01'\n  purchaseMiles: 0\n"
+    "state:\n  currentMiles: 6000\n  asOfDate: '2020-06-01'\n"
+    "history:\n- ruleKey: oil/replace\n  date: '2020-01-01'\n  mileage: 0\n"
+    "rules:\n- item: oil\n  verb: replace\n  intervalMiles: 5000\n"
+)
+
+
+@pytest.fixture
+def yaml_path(tmp_path):
+    path = tmp_path / "test.yaml"
+    path.write_text(VEHICLE_YAML)
+    return path
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """A daemon serving from a thread; yields its socket path."""
+    monkeypatch.delenv("MAINT_NO_DAEMON", raising=False)
+    cwd = os.getcwd()
+    path = str(tmp_path / "maint.sock")
+    server = make_server(path)
+    thread = threading.Thread(target=serve, args=(server,), daemon=True)
+    thread.start()
+    yield path
+    # Wakes the blocked accept() so serve() returns
+    server.shutdown(socket.SHUT_RDWR)
+    server.close()
+    thread.join(timeout=5)
+    os.chdir(cwd)
+
+
+def run_local(argv, capsys):
+    code = main(argv)
+    return code, capsys.readouterr()
+
+
+class TestForwardable:
+    """Tests for which commands the daemon serves."""
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["v.yaml", "status", "--severe"],
+            ["v.yaml", "history", "--rule", "oil"],
+            ["v.yaml", "rules", "--format", "csv"],
+            ["v.yaml", "history", "--rule", "edit"],
+            ["v.yaml", "history", "--sort=date", "--asc"],
+            ["v.yaml", "status", "--exclude", "inspect", "--as-of", "2024-01-01"],
+        ],
+    )
+    def test_read_only_commands(self, argv):
+        assert forwardable(argv)
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["v.yaml", "history", "add", "oil/replace"],
+            ["v.yaml", "rules", "delete", "0"],
+            ["v.yaml", "edit", "--current-miles", "5"],
+            ["dir", "fleet", "status"],
+            ["v.yaml", "status", "--help"],
+            ["serve-daemon"],
+            ["--yaml-backend"],
+            ["v.yaml", "history", "--rule", "oil"] + ["--"],
+            ["v.yaml", "status", "--severe=yes"],
+            ["v.yaml", "history", "--rule"],
+        ],
+    )
+    def test_writes_and_others_run_locally(self, argv):
+        assert not forwardable(argv)
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["v.yaml", "history", "--rule", "oil", "add", "oil/replace"],
+            ["v.yaml", "history", "--since", "2024-01-01", "delete", "0"],
+            ["v.yaml", "history", "--sort=date", "edit", "0", "--notes", "x"],
+            ["v.yaml", "history", "--ru", "oil", "delete", "0"],
+            ["v.yaml", "rules", "--format", "json", "add", "--item", "oil"],
+            ["v.yaml", "rules", "--show-index", "edit", "0"],
+            ["v.yaml", "rules", "--fo", "csv", "delete", "0"],
+        ],
+    )
+    def test_subcommand_after_options_runs_locally(self, argv):
+        assert not forwardable(argv)
+
+    @pytest.mark.parametrize("command", sorted(_SERVED_OPTIONS))
+    def test_options_match_parser(self, command):
+        import argparse
+
+        from maint import build_parser
+
+        subparsers = next(
+            action
+            for action in build_parser()._actions
+            if isinstance(action, argparse._SubParsersAction)
+        )
+        options = {
+            option: action.nargs != 0
+            for action in subparsers.choices[command]._actions
+            for option in action.option_strings
+            if option not in ("-h", "--help")
+        }
+        assert _SERVED_OPTIONS[command] == options
+
+
+class TestForward:
+    """Tests for forwarding commands to a running daemon."""
+
+    @pytest.mark.parametrize(
+        "command",
+        [["status"], ["status", "--format", "json"], ["history"], ["rules"]],
+    )
+    def test_same_output_as_local(self, daemon, yaml_path, capsys, command):
+        argv = [str(yaml_path), *command]
+        assert forward(argv, daemon) == 0
+        forwarded = capsys.readouterr()
+        assert run_local(argv, capsys) == (0, forwarded)
+
+    def test_errors_and_exit_status(self, daemon, tmp_path, capsys):
+        assert forward([str(tmp_path / "missing.yaml"), "status"], daemon) == 1
+        assert "File not found" in capsys.readouterr().out
+        argv = [str(tmp_path / "x.yaml"), "status", "--format", "bogus"]
+        assert forward(argv, daemon) == 2
+        assert "invalid choice" in capsys.readouterr().err
+        # Options the daemon does not know are left to the local parser
+        assert forward([str(tmp_path / "x.yaml"), "status", "--bogus"], daemon) is None
+
+    def test_relative_paths_use_client_cwd(self, daemon, yaml_path, capsys):
+        os.chdir(yaml_path.parent)
+        assert forward(["test.yaml", "status"], daemon) == 0
+        assert "Vehicle: 2020 Test Car Base" in capsys.readouterr().out
+
+    def test_file_changes_are_seen(self, daemon, yaml_path, capsys):
+        argv = [str(yaml_path), "status", "--format", "csv"]
+        forward(argv, daemon)
+        assert ",OVERDUE," in capsys.readouterr().out
+        save_history_entry(yaml_path, HistoryEntry("oil/replace", "2020-05-01", 5900))
+        forward(argv, daemon)
+        assert ",OK," in capsys.readouterr().out
+
+    def test_no_daemon_runs_locally(self, tmp_path, yaml_path, capsys):
+        assert forward([str(yaml_path), "status"], str(tmp_path / "none")) is None
+        assert capsys.readouterr().out == ""
+
+    def test_opt_out(self, daemon, yaml_path, monkeypatch):
+        monkeypatch.setenv("MAINT_NO_DAEMON", "1")
+        assert forward([str(yaml_path), "status"], daemon) is None
+
+    def test_writes_are_not_forwarded(self, daemon, yaml_path):
+        assert (
+            forward([str(yaml_path), "history", "add", "oil/replace"], daemon) is None
+        )
+
+    def test_socket_of_another_user_is_not_used(self, daemon, yaml_path, monkeypatch):
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(daemon).st_uid + 1)
+        assert forward([str(yaml_path), "status"], daemon) is None
+
+    def test_symlink_and_regular_file_are_not_used(self, daemon, tmp_path, yaml_path):
+        link = tmp_path / "link.sock"
+        link.symlink_to(daemon)
+        assert forward([str(yaml_path), "status"], str(link)) is None
+        plain = tmp_path / "plain.sock"
+        plain.write_text("")
+        assert forward([str(yaml_path), "status"], str(plain)) is None
+
+    def test_daemon_running_other_code_is_not_used(
+        self, daemon, yaml_path, capsys, monkeypatch
+    ):
+        # The first answer shows the daemon has taken its own version
+        assert forward([str(yaml_path), "status"], daemon) == 0
+        capsys.readouterr()
+        monkeypatch.setattr(maint_daemon, "code_version", lambda: "0-upgraded")
+        assert forward([str(yaml_path), "status"], daemon) is None
+        assert capsys.readouterr() == ("", "")
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            b"[]",
+            b'{"exit": 0, "stdout": "x"}',
+            b'{"exit": "0", "stdout": "", "stderr": ""}',
+            b'{"exit": 0, "stdout": 1, "stderr": ""}',
+        ],
+    )
+    def test_malformed_response_runs_locally(
+        self, tmp_path, yaml_path, capsys, response
+    ):
+        path = str(tmp_path / "fake.sock")
+        server = make_server(path)
+
+        def answer():
+            conn, _ = server.accept()
+            with conn:
+                conn.recv(65536)
+                conn.sendall(response)
+
+        thread = threading.Thread(target=answer, daemon=True)
+        thread.start()
+        try:
+            assert forward([str(yaml_path), "status"], path) is None
+        finally:
+            thread.join(timeout=5)
+            server.close()
+        assert capsys.readouterr() == ("", "")
+
+
+class TestMakeServer:
+    """Tests for binding the daemon socket."""
+
+    def test_refuses_second_daemon(self, daemon):
+        with pytest.raises(FileExistsError):
+            make_server(daemon)
+
+    def test_replaces_stale_socket(self, tmp_path):
+        path = str(tmp_path / "maint.sock")
+        make_server(path).close()  # left behind, nobody listening
+        server = make_server(path)
+        assert os.stat(path).st_mode & 0o077 == 0
+        server.close()
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Tests for Rule class."""
 
+import sys
+
 from models import Rule
 
 
@@ -29,6 +31,20 @@ class TestRule:
         )
         assert rule.base_key == "engine coolant/replace"
 
+    def test_keys_follow_item_verb_phase_changes(self):
+        """Cached key, base_key and display_name update when fields change."""
+        rule = Rule(item="engine coolant", verb="replace", interval_miles=75000)
+        rule.phase = "initial"
+        assert rule.key == "engine coolant/replace/initial"
+        assert rule.display_name == "Replace - engine coolant [initial]"
+
+        rule.item = "brake fluid"
+        rule.verb = "flush"
+        rule.phase = None
+        assert rule.key == "brake fluid/flush"
+        assert rule.base_key == "brake fluid/flush"
+        assert rule.display_name == "Flush - brake fluid"
+
     def test_is_active_at_default_range(self):
         """Rule with default start/stop is always active."""
         rule = Rule(item="oil", verb="replace", interval_miles=7500)
@@ -107,3 +123,13 @@ class TestRule:
             counts_as=["inspect", "clean"],
         )
         assert rule.counts_as == ["inspect", "clean"]
+
+    def test_uses_slots(self):
+        """Rules carry no per-instance __dict__."""
+        rule = Rule(item="oil", verb="replace", interval_miles=7500)
+        assert not hasattr(rule, "__dict__")
+
+    def test_key_is_shared_with_history_rule_keys(self):
+        """Rule keys are interned like history entry rule keys."""
+        rule = Rule(item="oil", verb="replace", phase="initial")
+        assert rule.key is sys.intern("".join(["oil/replace", "/initial"]))
@@ -36,3 +36,9 @@ class TestServiceDue:
         rule = Rule(item="oil", verb="replace", interval_miles=7500)
         svc = ServiceDue(rule=rule, status=Status.UNKNOWN)
         assert svc.is_due is False
+
+    def test_uses_slots(self):
+        """ServiceDue carries no per-instance __dict__."""
+        rule = Rule(item="oil", verb="replace", interval_miles=7500)
+        svc = ServiceDue(rule=rule, status=Status.OK)
+        assert not hasattr(svc, "__dict__")
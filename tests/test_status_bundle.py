@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Tests for StatusBundle."""
+
+import pytest
+from models import Rule, ServiceDue, Status, StatusBundle
+from models.status_bundle import BUNDLE_VARIANTS
+
+
+@pytest.fixture
+def bundle():
+    rules = [Rule("oil", "replace"), Rule("tires", "Rotate"), Rule("belts", "inspect")]
+    tables = {
+        variant: [ServiceDue(rule=r, status=Status.OK) for r in rules]
+        for variant in BUNDLE_VARIANTS
+    }
+    return StatusBundle(rules, tables)
+
+
+class TestStatusBundle:
+    """Tests for StatusBundle.get."""
+
+    def test_variants(self):
+        """Normal and severe, each for all, mileage-only and time-only."""
+        assert len(set(BUNDLE_VARIANTS)) == 6
+        assert all(not (miles and time) for _, miles, time in BUNDLE_VARIANTS)
+
+    def test_no_filter_returns_every_rule(self, bundle):
+        assert [s.rule.item for s in bundle.get()] == ["oil", "tires", "belts"]
+
+    def test_exclude_verbs_case_insensitive(self, bundle):
+        rows = bundle.get(severe=True, exclude_verbs=["INSPECT", "rotate"])
+        assert [s.rule.item for s in rows] == ["oil"]
+
+    def test_include_takes_precedence(self, bundle):
+        rows = bundle.get(exclude_verbs=["rotate"], include_verbs=["rotate"])
+        assert [s.rule.item for s in rows] == ["tires"]
+
+    def test_returns_fresh_list(self, bundle):
+        bundle.get(time_only=True).clear()
+        assert len(bundle.get(time_only=True)) == 3
+
+    def test_both_bases_is_not_a_variant(self, bundle):
+        with pytest.raises(KeyError):
+            bundle.get(miles_only=True, time_only=True)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Tests for the dashboard summary index."""
+
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pytest
+from models import (
+    HistoryEntry,
+    Status,
+    add_write_listener,
+    delete_vehicle,
+    load_vehicle,
+    remove_write_listener,
+    save_history_entry,
+    update_vehicle_meta,
+)
+from models.summary_index import SummaryIndex
+from models.watcher import ChangeKind, VehicleChange
+
+VEHICLES_DIR = Path(__file__).parent.parent / "vehicles"
+
+
+@pytest.fixture
+def fleet_dir(tmp_path):
+    for path in VEHICLES_DIR.glob("*.yaml"):
+        shutil.copy(path, tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def index(fleet_dir):
+    """A built index over fleet_dir whose loads are counted."""
+    loads = []
+
+    def load(path):
+        loads.append(path.stem)
+        return load_vehicle(path)
+
+    index = SummaryIndex(fleet_dir, load=load)
+    index.loads = loads
+    add_write_listener(index.on_write)
+    index.summaries()
+    loads.clear()
+    yield index
+    remove_write_listener(index.on_write)
+
+
+def expected(path):
+    vehicle = load_vehicle(path)
+    statuses = [s.status for s in vehicle.get_all_service_status()]
+    return (
+        path.stem,
+        vehicle.car.name,
+        vehicle.current_miles,
+        statuses.count(Status.OVERDUE),
+        statuses.count(Status.DUE_SOON),
+        statuses.count(Status.OK),
+        len(vehicle.rules),
+        vehicle.last_service,
+    )
+
+
+def by_id(index):
+    return {s.id: s for s in index.summaries()}
+
+
+class TestSummaryIndex:
+    """Tests for SummaryIndex."""
+
+    def test_matches_full_status(self, fleet_dir, index):
+        paths = sorted(fleet_dir.glob("*.yaml"))
+        assert [s[:-1] for s in index.summaries()] == [expected(p) for p in paths]
+
+    def test_repeat_queries_load_nothing(self, index):
+        index.summaries()
+        index.summaries()
+        assert index.loads == []
+
+    def test_loader_writes_update_without_reading(self, fleet_dir, index):
+        vehicle_id = sorted(fleet_dir.glob("*.yaml"))[0].stem
+        path = fleet_dir / f"{vehicle_id}.yaml"
+
+        update_vehicle_meta(path, current_miles=999999)
+        save_history_entry(
+            path,
+            HistoryEntry("oil/replace", date.today().isoformat(), 999999),
+            journal=True,
+        )
+
+        summary = by_id(index)[vehicle_id]
+        assert index.loads == []
+        assert summary.current_miles == 999999
+        assert summary.last_service.mileage == 999999
+        assert summary[:-1] == expected(path)
+
+    def test_loader_delete(self, fleet_dir, index):
+        path = sorted(fleet_dir.glob("*.yaml"))[0]
+        delete_vehicle(path)
+        assert path.stem not in by_id(index)
+
+    def test_watcher_changes(self, fleet_dir, index):
+        source = sorted(fleet_dir.glob("*.yaml"))[0]
+        shutil.copy(source, fleet_dir / "copy.yaml")
+        index.on_change(VehicleChange(ChangeKind.CREATED, "copy"))
+        assert index.loads == ["copy"]
+        assert by_id(index)["copy"].name == by_id(index)[source.stem].name
+
+        (fleet_dir / "copy.yaml").unlink()
+        index.on_change(VehicleChange(ChangeKind.DELETED, "copy"))
+        assert "copy" not in by_id(index)
+
+    def test_own_write_echo_is_not_reloaded(self, fleet_dir, index):
+        """The watcher event for a loader write finds the summary current."""
+        path = sorted(fleet_dir.glob("*.yaml"))[0]
+        update_vehicle_meta(path, current_miles=999999)
+        index.on_change(VehicleChange(ChangeKind.MODIFIED, path.stem))
+        assert index.loads == []
+
+    def test_unreadable_change_is_retried_by_query(self, fleet_dir, index):
+        path = fleet_dir / "broken.yaml"
+        path.write_text("car: [")
+        index.on_change(VehicleChange(ChangeKind.CREATED, "broken"))
+        with pytest.raises(Exception):
+            index.summaries()
+        path.unlink()
+        assert "broken" not in by_id(index)
+
+    def test_sync_finds_unreported_changes(self, fleet_dir, index):
+        path = sorted(fleet_dir.glob("*.yaml"))[0]
+        shutil.copy(path, fleet_dir / "copy.yaml")
+        path.unlink()
+
+        index.sync()
+
+        ids = by_id(index)
+        assert "copy" in ids and path.stem not in ids
+        assert index.loads == ["copy"]
+
+    def test_new_day_recomputes(self, index):
+        count = len(index.summaries())
+        index._day = date(2000, 1, 1)
+        index.summaries()
+        assert len(index.loads) == count
@@ -10,6 +10,11 @@ Includes integration tests for the complete service due calculation logic:
 5. Start/stop thresholds - rules outside current mileage are INACTIVE
 """
 
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
 import pytest
 from models import Vehicle, Car, Rule, HistoryEntry, ServiceDue, Status
 
@@ -54,6 +59,29 @@ class TestVehicleCurrentMiles:
         assert vehicle.current_miles == 6
 
 
+class TestVehicleAsOfDate:
+    """Tests for Vehicle.as_of_date parsing."""
+
+    @pytest.fixture
+    def car(self):
+        return Car("Subaru", "WRX", "Limited", 2012, "2012-03-23", 6)
+
+    def test_as_of_ordinal_from_state(self, car):
+        """An explicit asOfDate is parsed once into an ordinal."""
+        vehicle = Vehicle(car=car, rules=[], state_as_of_date="2025-01-15")
+        assert vehicle.as_of_ordinal == date(2025, 1, 15).toordinal()
+
+    def test_as_of_ordinal_defaults_to_today(self, car):
+        """Without asOfDate the ordinal is today's."""
+        vehicle = Vehicle(car=car, rules=[])
+        assert vehicle.as_of_ordinal == date.today().toordinal()
+
+    def test_malformed_as_of_date_rejected(self, car):
+        """An invalid asOfDate fails when the vehicle is built."""
+        with pytest.raises(ValueError, match="as-of date"):
+            Vehicle(car=car, rules=[], state_as_of_date="2025-02-30")
+
+
 class TestVehicleHistoryLookup:
     """Tests for Vehicle history lookup methods."""
 
@@ -260,6 +288,132 @@ class TestVehicleHistoryLookupCountsAs:
         assert result.status == Status.OK
 
 
+def _scan_last_service_for_item(vehicle, item, verb):
+    """Reference full-scan lookup the history index must agree with."""
+    base_key = f"{item}/{verb}"
+    matching = [h for h in vehicle.history if h.rule_key.startswith(base_key)]
+    for rule in vehicle.rules:
+        if rule.item == item and verb in rule.counts_as:
+            alias_base = f"{item}/{rule.verb}"
+            matching.extend(
+                h for h in vehicle.history if h.rule_key.startswith(alias_base)
+            )
+    if not matching:
+        return None
+    with_mileage = [h for h in matching if h.mileage is not None]
+    if with_mileage:
+        return max(with_mileage, key=lambda h: (h.date, h.mileage))
+    return max(matching, key=lambda h: h.date)
+
+
+class TestVehicleHistoryIndex:
+    """Tests for the indexed history lookups and their invalidation."""
+
+    @pytest.fixture
+    def car(self):
+        return Car("Subaru", "WRX", "Limited", 2012, "2012-03-23", 6)
+
+    @pytest.fixture
+    def vehicle(self, car):
+        return Vehicle(
+            car=car,
+            rules=[
+                Rule("oil", "replace", interval_miles=7500),
+                Rule("air filter", "inspect", interval_miles=7500),
+                Rule("air filter", "replace", interval_miles=15000),
+            ],
+            history=[HistoryEntry("oil/replace", "2024-01-15", mileage=80000)],
+        )
+
+    def test_matches_full_scan_on_random_histories(self, car):
+        """Index lookups pick exactly the entry a full scan would, ties included."""
+        rng = random.Random(8)
+        items = ["oil", "air filter", "coolant"]
+        verbs = ["replace", "inspect", "flush"]
+        for _ in range(200):
+            rules = [
+                Rule(
+                    rng.choice(items),
+                    rng.choice(verbs),
+                    phase=rng.choice([None, "initial"]),
+                    counts_as=rng.sample(verbs, rng.randint(0, 2)),
+                )
+                for _ in range(rng.randint(0, 5))
+            ]
+            history = [
+                HistoryEntry(
+                    f"{rng.choice(items)}/{rng.choice(verbs)}"
+                    + rng.choice(["", "/initial", "/final"]),
+                    f"2024-0{rng.randint(1, 3)}-01",
+                    rng.choice([None, 1000, 2000]),
+                )
+                for _ in range(rng.randint(0, 12))
+            ]
+            vehicle = Vehicle(car=car, rules=rules, history=history)
+            for item in items:
+                for verb in verbs:
+                    assert vehicle.get_last_service_for_item(
+                        item, verb
+                    ) is _scan_last_service_for_item(vehicle, item, verb)
+
+    def test_append_to_history_is_seen(self, vehicle):
+        """Appending an entry after a lookup updates later lookups."""
+        assert vehicle.get_last_service_for_item("oil", "replace").mileage == 80000
+        vehicle.history.append(HistoryEntry("oil/replace", "2024-07-15", mileage=87500))
+        assert vehicle.get_last_service_for_item("oil", "replace").mileage == 87500
+        assert vehicle.current_miles == 87500
+
+    def test_delete_from_history_is_seen(self, vehicle):
+        """Deleting an entry after a lookup updates later lookups."""
+        assert vehicle.get_last_service_for_item("oil", "replace") is not None
+        del vehicle.history[0]
+        assert vehicle.get_last_service_for_item("oil", "replace") is None
+        assert vehicle.get_history_for_rule("oil/replace") == []
+
+    def test_replacing_history_is_seen(self, vehicle):
+        """Assigning a new history list updates later lookups."""
+        assert vehicle.get_last_service_for_item("oil", "replace") is not None
+        vehicle.history = []
+        assert vehicle.get_last_service_for_item("oil", "replace") is None
+
+    def test_rule_changes_update_aliases(self, vehicle):
+        """Adding or removing a counts_as rule updates the alias map."""
+        vehicle.history.append(HistoryEntry("air filter/replace", "2024-03-01", 82000))
+        assert vehicle.get_last_service_for_item("air filter", "inspect") is None
+
+        vehicle.rules[2] = Rule("air filter", "replace", counts_as=["inspect"])
+        assert (
+            vehicle.get_last_service_for_item("air filter", "inspect").mileage == 82000
+        )
+
+        vehicle.rules.pop()
+        assert vehicle.get_last_service_for_item("air filter", "inspect") is None
+
+    def test_in_place_entry_edit_needs_invalidate(self, vehicle):
+        """Editing an entry in place is picked up after invalidate_index."""
+        assert vehicle.get_history_for_rule("oil/replace")
+        vehicle.history[0].rule_key = "oil/flush"
+        vehicle.invalidate_index()
+        assert vehicle.get_history_for_rule("oil/replace") == []
+        assert vehicle.get_last_service_for_item("oil", "flush").mileage == 80000
+
+    def test_in_place_entry_edit_refreshes_status(self, car, vehicle):
+        """invalidate_index also drops the status tables, dates and rate fit."""
+        vehicle.history.append(HistoryEntry("oil/replace", "2024-03-15", 81000))
+        before = vehicle.get_all_service_status()
+
+        vehicle.history[-1].date = "2024-09-15"
+        vehicle.history[-1].mileage = 86000
+        vehicle.invalidate_index()
+
+        fresh = Vehicle(car, list(vehicle.rules), list(vehicle.history))
+        assert vehicle.get_all_service_status() == fresh.get_all_service_status()
+        assert vehicle.get_all_service_status() != before
+        assert vehicle.mileage_rate().miles_per_day == (
+            fresh.mileage_rate().miles_per_day
+        )
+
+
 class TestVehicleLastServiceProperty:
     """Tests for Vehicle.last_service property."""
 
@@ -319,6 +473,26 @@ class TestVehicleGetRule:
         rule = vehicle.get_rule("nonexistent/rule")
         assert rule is None
 
+    def test_get_rule_first_duplicate_wins(self, car):
+        """With duplicate keys, the first rule in the list is returned."""
+        first = Rule(item="oil", verb="replace", interval_miles=7500)
+        second = Rule(item="oil", verb="replace", interval_miles=5000)
+        vehicle = Vehicle(car=car, rules=[first, second], history=[])
+
+        assert vehicle.get_rule("oil/replace") is first
+
+    def test_get_rule_sees_rule_list_changes(self, car):
+        """Rules added or removed after a lookup are reflected."""
+        vehicle = Vehicle(car=car, rules=[], history=[])
+        assert vehicle.get_rule("oil/replace") is None
+
+        rule = Rule(item="oil", verb="replace", interval_miles=7500)
+        vehicle.rules.append(rule)
+        assert vehicle.get_rule("oil/replace") is rule
+
+        vehicle.rules.remove(rule)
+        assert vehicle.get_rule("oil/replace") is None
+
 
 class TestVehicleGetHistoryForRule:
     """Tests for Vehicle.get_history_for_rule method."""
@@ -900,3 +1074,521 @@ class TestGetAllServiceStatus:
         assert len(statuses) == 1
         assert statuses[0].status == Status.UNKNOWN
         assert statuses[0].due_miles is None
+
+
+class TestVehicleMaterializedStatus:
+    """Tests for the status tables kept up to date by the edit methods."""
+
+    OPTIONS = [{}, {"severe": True}, {"time_only": True, "due_soon_months": 2}]
+
+    @pytest.fixture
+    def car(self):
+        return Car("Subaru", "WRX", "Limited", 2012, "2012-03-23", 6)
+
+    @pytest.fixture
+    def vehicle(self, car):
+        return Vehicle(
+            car=car,
+            rules=[
+                Rule("oil", "replace", interval_miles=7500, interval_months=6),
+                Rule("air filter", "inspect", interval_miles=7500),
+                Rule("air filter", "replace", interval_miles=15000),
+                Rule("coolant", "flush", interval_months=60, counts_as=["replace"]),
+                Rule("coolant", "replace", interval_months=60),
+            ],
+            history=[
+                HistoryEntry("oil/replace", "2024-01-15", mileage=80000),
+                HistoryEntry("coolant/flush", "2023-06-01", mileage=75000),
+            ],
+            state_as_of_date="2024-06-01",
+        )
+
+    @staticmethod
+    def fresh(vehicle):
+        return Vehicle(
+            vehicle.car,
+            list(vehicle.rules),
+            list(vehicle.history),
+            vehicle._state_as_of_date,
+            vehicle._state_current_miles,
+        )
+
+    @pytest.fixture
+    def count_calls(self, monkeypatch):
+        """Record the rule of every status row computed."""
+        calls = []
+        original = Vehicle._status_rows
+
+        def counting(self, rules, *args):
+            calls.extend(rules)
+            return original(self, rules, *args)
+
+        monkeypatch.setattr(Vehicle, "_status_rows", counting)
+        return calls
+
+    def test_random_edits_match_fresh_vehicle(self, car):
+        """After every edit the tables equal a full recomputation."""
+        rng = random.Random(13)
+        items = ["oil", "air filter", "coolant"]
+        verbs = ["replace", "inspect", "flush"]
+
+        def random_rule():
+            return Rule(
+                rng.choice(items),
+                rng.choice(verbs),
+                interval_miles=rng.choice([None, 5000, 7500]),
+                interval_months=rng.choice([None, 6, 12]),
+                phase=rng.choice([None, "initial"]),
+                counts_as=rng.sample(verbs, rng.randint(0, 1)),
+            )
+
+        def random_entry():
+            return HistoryEntry(
+                f"{rng.choice(items)}/{rng.choice(verbs)}"
+                + rng.choice(["", "/initial"]),
+                f"2024-0{rng.randint(1, 9)}-01",
+                rng.choice([None, rng.randint(70000, 90000)]),
+            )
+
+        for _ in range(20):
+            vehicle = Vehicle(
+                car=car,
+                rules=[random_rule() for _ in range(rng.randint(1, 5))],
+                history=[random_entry() for _ in range(rng.randint(0, 5))],
+                state_as_of_date="2024-10-01",
+            )
+            for _ in range(15):
+                for options in self.OPTIONS:
+                    vehicle.get_all_service_status(**options)
+                op = rng.choice(["add", "update", "delete", "rule", "meta"])
+                if op == "add":
+                    vehicle.add_history_entry(random_entry())
+                elif op == "update" and vehicle.history:
+                    index = rng.randrange(len(vehicle.history))
+                    vehicle.update_history_entry(index, random_entry())
+                elif op == "delete" and vehicle.history:
+                    vehicle.delete_history_entry(rng.randrange(len(vehicle.history)))
+                elif op == "rule":
+                    choice = rng.choice(["add", "update", "delete"])
+                    if choice == "add" or len(vehicle.rules) < 2:
+                        vehicle.add_rule(random_rule())
+                    elif choice == "update":
+                        index = rng.randrange(len(vehicle.rules))
+                        vehicle.update_rule(index, random_rule())
+                    else:
+                        vehicle.delete_rule(rng.randrange(len(vehicle.rules)))
+                elif op == "meta":
+                    vehicle.update_meta(
+                        current_miles=rng.choice([None, rng.randint(80000, 95000)])
+                    )
+                expected = self.fresh(vehicle)
+                for options in self.OPTIONS:
+                    assert vehicle.get_all_service_status(
+                        **options
+                    ) == expected.get_all_service_status(**options)
+
+    def test_repeat_call_is_served_from_table(self, vehicle, count_calls):
+        vehicle.get_all_service_status()
+        assert len(count_calls) == 5
+        vehicle.get_all_service_status(exclude_verbs=["inspect"])
+        assert len(count_calls) == 5
+
+    def test_history_edit_recomputes_affected_rows(self, vehicle, count_calls):
+        """
+        A flush counts as a coolant replacement, so it touches both coolant rules.
+
+        Mileages stay below the current 80000 so no edit moves current_miles.
+        """
+        vehicle.get_all_service_status()
+        count_calls.clear()
+        vehicle.add_history_entry(HistoryEntry("coolant/flush", "2024-05-01", 79000))
+        assert [r.key for r in count_calls] == ["coolant/flush", "coolant/replace"]
+
+        count_calls.clear()
+        vehicle.update_history_entry(
+            0, HistoryEntry("oil/replace", "2024-02-01", 80000)
+        )
+        assert [r.key for r in count_calls] == ["oil/replace"]
+
+        count_calls.clear()
+        statuses = vehicle.get_all_service_status()
+        assert count_calls == []
+        assert statuses == self.fresh(vehicle).get_all_service_status()
+
+    def test_rule_edit_recomputes_same_item(self, vehicle, count_calls):
+        vehicle.get_all_service_status()
+        count_calls.clear()
+        vehicle.update_rule(1, Rule("air filter", "inspect", interval_miles=5000))
+        assert [r.key for r in count_calls] == [
+            "air filter/inspect",
+            "air filter/replace",
+        ]
+
+        count_calls.clear()
+        vehicle.delete_rule(0)
+        assert count_calls == []
+        assert len(vehicle.get_all_service_status()) == 4
+
+    def test_mileage_change_recomputes_everything(self, vehicle, count_calls):
+        """Every row depends on current mileage, so the tables are rebuilt."""
+        vehicle.get_all_service_status()
+        count_calls.clear()
+        vehicle.add_history_entry(HistoryEntry("oil/replace", "2024-05-01", 90000))
+        assert count_calls == []
+        assert vehicle.get_all_service_status() == (
+            self.fresh(vehicle).get_all_service_status()
+        )
+        assert len(count_calls) == 5 + 5
+
+    def test_direct_list_edits_are_seen(self, vehicle):
+        vehicle.get_all_service_status()
+        vehicle.rules.append(Rule("brake fluid", "replace", interval_months=36))
+        vehicle.history[0] = HistoryEntry("oil/replace", "2024-05-01", 79000)
+        assert vehicle.get_all_service_status() == (
+            self.fresh(vehicle).get_all_service_status()
+        )
+
+    def test_as_of_date_change(self, vehicle):
+        before = vehicle.get_all_service_status()
+        vehicle.update_meta(as_of_date="2025-06-01")
+        after = vehicle.get_all_service_status()
+        assert after != before
+        assert after == self.fresh(vehicle).get_all_service_status()
+
+    def test_copy_is_independent(self, vehicle):
+        before = vehicle.get_all_service_status()
+        copy = vehicle.copy()
+        copy.add_history_entry(HistoryEntry("air filter/replace", "2024-05-01", 80000))
+        copy.delete_rule(0)
+        assert vehicle.get_all_service_status() == before
+        assert len(vehicle.history) == 2
+        assert (
+            copy.get_all_service_status() == self.fresh(copy).get_all_service_status()
+        )
+
+    def test_shared_between_threads(self, vehicle):
+        """Copies and lookups racing over the lazily filled tables are safe."""
+        expected = {
+            months: self.fresh(vehicle).get_all_service_status(due_soon_months=months)
+            for months in range(1, 13)
+        }
+
+        def worker(seed):
+            rng = random.Random(seed)
+            for _ in range(200):
+                months = rng.randint(1, 12)
+                if rng.random() < 0.3:
+                    vehicle.copy()
+                # More thresholds than MAX_STATUS_TABLES, so tables get evicted
+                rows = vehicle.get_all_service_status(due_soon_months=months)
+                assert rows == expected[months]
+
+        # Switch threads as often as possible so the races actually happen
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(worker, range(8)))
+        finally:
+            sys.setswitchinterval(interval)
+
+    def test_index_errors(self, vehicle):
+        with pytest.raises(IndexError, match=r"History index 2 out of range \(0..1\)"):
+            vehicle.delete_history_entry(2)
+        with pytest.raises(IndexError, match=r"Rule index -1 out of range"):
+            vehicle.update_rule(-1, Rule("oil", "replace"))
+
+
+class TestVehicleStatusBundle:
+    """Tests for Vehicle.status_bundle."""
+
+    @pytest.fixture
+    def car(self):
+        return Car("Subaru", "WRX", "Limited", 2012, "2012-03-23", 6)
+
+    def random_vehicle(self, car, rng):
+        items = ["oil", "air filter", "coolant"]
+        verbs = ["replace", "inspect", "flush"]
+        rules = [
+            Rule(
+                rng.choice(items),
+                rng.choice(verbs),
+                interval_miles=rng.choice([None, 5000, 7500]),
+                interval_months=rng.choice([None, 6, 1.5]),
+                severe_interval_miles=rng.choice([None, 3000]),
+                severe_interval_months=rng.choice([None, 3, 0.5]),
+                start_miles=rng.choice([0, 0, 50000]),
+                counts_as=rng.sample(verbs, rng.randint(0, 1)),
+            )
+            for _ in range(rng.randint(0, 6))
+        ]
+        history = [
+            HistoryEntry(
+                f"{rng.choice(items)}/{rng.choice(verbs)}",
+                f"2024-0{rng.randint(1, 9)}-{rng.choice([1, 15, 28]):02d}",
+                rng.choice([None, rng.randint(20000, 90000)]),
+            )
+            for _ in range(rng.randint(0, 8))
+        ]
+        return Vehicle(car, rules, history, state_as_of_date="2024-10-31")
+
+    def test_matches_get_all_service_status(self, car):
+        """Every variant and verb filter equals a direct calculation."""
+        rng = random.Random(15)
+        for _ in range(50):
+            seed = rng.random()
+            bundle = self.random_vehicle(car, random.Random(seed)).status_bundle(
+                due_soon_miles=500, due_soon_months=2
+            )
+            direct = self.random_vehicle(car, random.Random(seed))
+            for severe, miles_only, time_only in [
+                (False, False, False),
+                (True, False, False),
+                (False, True, False),
+                (True, True, False),
+                (False, False, True),
+                (True, False, True),
+            ]:
+                for verbs in [
+                    {},
+                    {"exclude_verbs": ["inspect"]},
+                    {"include_verbs": ["Flush"]},
+                ]:
+                    options = dict(
+                        severe=severe,
+                        miles_only=miles_only,
+                        time_only=time_only,
+                        **verbs,
+                    )
+                    assert [
+                        (s.rule.key, s.status, s.due_miles, s.due_date)
+                        for s in bundle.get(**options)
+                    ] == [
+                        (s.rule.key, s.status, s.due_miles, s.due_date)
+                        for s in direct.get_all_service_status(
+                            due_soon_miles=500, due_soon_months=2, **options
+                        )
+                    ]
+
+    def test_single_pass_then_served_from_tables(self, car, monkeypatch):
+        vehicle = self.random_vehicle(car, random.Random(2))
+        calls = []
+        original = Vehicle._status_rows
+
+        def counting(self, rules, due_soon_miles, due_soon_months, variants):
+            calls.append(len(variants))
+            return original(self, rules, due_soon_miles, due_soon_months, variants)
+
+        monkeypatch.setattr(Vehicle, "_status_rows", counting)
+        vehicle.get_all_service_status(severe=True)
+        assert calls == [1]
+        bundle = vehicle.status_bundle()
+        assert calls == [1, 5]
+        assert vehicle.status_bundle() == bundle
+        assert vehicle.get_all_service_status(time_only=True) == bundle.get(
+            time_only=True
+        )
+        assert calls == [1, 5]
+
+    def test_bundle_is_a_snapshot(self, car):
+        vehicle = Vehicle(
+            car,
+            [Rule("oil", "replace", interval_miles=7500)],
+            [HistoryEntry("oil/replace", "2024-01-15", 80000)],
+            state_current_miles=85000,
+        )
+        bundle = vehicle.status_bundle()
+        vehicle.update_history_entry(
+            0, HistoryEntry("oil/replace", "2024-05-01", 84000)
+        )
+        assert bundle.get()[0].due_miles == 87500
+        assert vehicle.status_bundle().get()[0].due_miles == 91500
+
+
+class TestVehicleProjectedDate:
+    """Tests for projected due dates from the observed mileage rate."""
+
+    @pytest.fixture
+    def vehicle(self):
+        car = Car("Subaru", "WRX", "Limited", 2012, "2012-03-23", 6)
+        return Vehicle(
+            car,
+            [
+                Rule("oil", "replace", interval_miles=7500),
+                Rule("brake fluid", "replace", interval_months=24),
+                Rule("tires", "rotate", interval_miles=5000, interval_months=6),
+            ],
+            [
+                HistoryEntry("oil/replace", "2024-01-01", 80000),
+                HistoryEntry("brake fluid/replace", "2023-06-01", 72000),
+                HistoryEntry("tires/rotate", "2024-01-31", 81200),
+            ],
+            state_as_of_date="2024-01-31",
+        )
+
+    def test_mileage_rate_from_history(self, vehicle):
+        # Least squares over the three readings (Jun 2023 to Jan 2024)
+        assert vehicle.mileage_rate().miles_per_day == pytest.approx(37.586, abs=1e-3)
+
+    def test_mileage_only_rule_gets_a_date(self, vehicle):
+        oil = vehicle.calculate_service_due(vehicle.rules[0])
+        rate = vehicle.mileage_rate().miles_per_day
+        days = -(-oil.miles_remaining // rate)
+        expected = date.fromordinal(vehicle.as_of_ordinal + int(days)).isoformat()
+        assert oil.projected_date == expected
+
+    def test_time_only_rule_projects_to_due_date(self, vehicle):
+        fluid = vehicle.calculate_service_due(vehicle.rules[1])
+        assert fluid.projected_date == fluid.due_date == "2025-06-01"
+
+    def test_earlier_of_miles_and_date(self, vehicle):
+        """5000 mi at ~40 mi/day runs out before the 6-month date."""
+        tires = vehicle.calculate_service_due(vehicle.rules[2])
+        assert tires.projected_date < tires.due_date
+
+    def test_no_rate_without_mileage_trend(self):
+        car = Car("Subaru", "WRX", "Limited", 2012, "2012-03-23", 6)
+        vehicle = Vehicle(
+            car,
+            [Rule("oil", "replace", interval_miles=7500)],
+            [HistoryEntry("oil/replace", "2024-01-01", 80000)],
+        )
+        assert vehicle.mileage_rate().miles_per_day is None
+        assert vehicle.get_all_service_status()[0].projected_date is None
+
+    def test_new_reading_reprojects_every_row(self, vehicle):
+        """A new reading changes the rate, so untouched rows are re-projected."""
+        before = vehicle.get_all_service_status()
+        vehicle.add_history_entry(HistoryEntry("tires/rotate", "2024-01-20", 81000))
+        after = vehicle.get_all_service_status()
+        fresh = Vehicle(
+            vehicle.car, list(vehicle.rules), list(vehicle.history), "2024-01-31"
+        )
+        assert after == fresh.get_all_service_status()
+        assert after[0].projected_date != before[0].projected_date
+
+
+class TestVehicleStatusAsOf:
+    """Tests for point-in-time status over history."""
+
+    @pytest.fixture
+    def car(self):
+        return Car("Subaru", "WRX", "Limited", 2012, "2012-01-01", 100)
+
+    @pytest.fixture
+    def vehicle(self, car):
+        return Vehicle(
+            car,
+            [
+                Rule("oil", "replace", interval_miles=5000, interval_months=6),
+                Rule("brake fluid", "replace", interval_months=24),
+                Rule(
+                    "timing belt", "replace", interval_miles=100000, start_miles=50000
+                ),
+            ],
+            [
+                HistoryEntry("oil/replace", "2013-01-01", 10100),
+                HistoryEntry("brake fluid/replace", "2014-01-01", None),
+                HistoryEntry("oil/replace", "2015-01-01", 30100),
+                HistoryEntry("oil/replace", "2014-01-01", 20100),
+            ],
+            state_as_of_date="2016-01-01",
+            state_current_miles=40100,
+        )
+
+    def truncated(self, vehicle, as_of):
+        """The vehicle as it would have been recorded on as_of, by hand."""
+        return Vehicle(
+            vehicle.car,
+            list(vehicle.rules),
+            [h for h in vehicle.history if h.date <= as_of],
+            state_as_of_date=as_of,
+            state_current_miles=vehicle.miles_as_of(as_of),
+        )
+
+    def test_miles_interpolated_between_readings(self, vehicle):
+        assert vehicle.miles_as_of("2013-01-01") == 10100
+        # 182 of 365 days from 10,100 to 20,100
+        assert vehicle.miles_as_of("2013-07-02") == round(10100 + 10000 * 182 / 365)
+        # From the purchase (2012-01-01, 100) to the first reading, a leap year
+        assert vehicle.miles_as_of("2012-07-01") == round(100 + 10000 * 182 / 366)
+
+    def test_miles_outside_readings(self, vehicle):
+        assert vehicle.miles_as_of("2011-06-01") == 100
+        # Up to the state reading, then held
+        assert vehicle.miles_as_of("2015-07-02") == round(30100 + 10000 * 182 / 365)
+        assert vehicle.miles_as_of("2020-01-01") == 40100
+
+    def test_status_ignores_later_history(self, vehicle):
+        (oil, fluid, belt) = vehicle.status_as_of("2014-06-01")
+        assert oil.last_service_date == "2014-01-01"
+        assert oil.due_miles == 25100
+        assert fluid.due_date == "2016-01-01"
+        assert belt.status == Status.INACTIVE
+        assert vehicle.status_as_of("2012-06-01")[0].last_service_date is None
+
+    def test_matches_hand_truncated_vehicle(self, vehicle):
+        for as_of in ["2012-01-01", "2013-01-01", "2014-05-17", "2015-12-31"]:
+            assert vehicle.status_as_of(as_of, severe=True) == self.truncated(
+                vehicle, as_of
+            ).get_all_service_status(severe=True)
+
+    def test_accepts_date_objects(self, vehicle):
+        assert vehicle.status_as_of(date(2014, 6, 1)) == vehicle.status_as_of(
+            "2014-06-01"
+        )
+
+    def test_rejects_malformed_date(self, vehicle):
+        with pytest.raises(ValueError, match="as-of date"):
+            vehicle.status_as_of("2014-6-1")
+
+    def test_series_matches_single_dates(self, car):
+        """The batch walk equals independent as-of queries, in input order."""
+        rng = random.Random(17)
+        items = ["oil", "coolant"]
+        for _ in range(20):
+            vehicle = Vehicle(
+                car,
+                [
+                    Rule(
+                        rng.choice(items),
+                        "replace",
+                        interval_miles=5000,
+                        interval_months=6,
+                    )
+                    for _ in range(3)
+                ],
+                [
+                    HistoryEntry(
+                        f"{rng.choice(items)}/replace",
+                        f"{rng.randint(2012, 2020)}-0{rng.randint(1, 9)}-01",
+                        rng.choice([None, rng.randint(0, 90000)]),
+                    )
+                    for _ in range(rng.randint(0, 12))
+                ],
+            )
+            dates = [
+                f"{rng.randint(2011, 2021)}-{rng.randint(1, 12):02d}-15"
+                for _ in range(10)
+            ]
+            dates.append(dates[0])
+            assert vehicle.status_series(dates, exclude_verbs=["inspect"]) == [
+                vehicle.status_as_of(d, exclude_verbs=["inspect"]) for d in dates
+            ]
+
+    def test_same_day_ties_keep_history_order(self, car):
+        """Equal date and mileage: the earlier entry in the file wins, as usual."""
+        first = HistoryEntry("oil/replace", "2014-01-01", 20000)
+        second = HistoryEntry("oil/replace", "2014-01-01", 20000)
+        vehicle = Vehicle(
+            car, [Rule("oil", "replace", interval_miles=5000)], [first, second]
+        )
+        assert vehicle.get_last_service_for_item("oil", "replace") is first
+        (series,) = vehicle.status_series(["2014-02-01"])
+        assert series == vehicle.status_as_of("2014-02-01")
+
+    def test_readings_follow_edits(self, vehicle):
+        vehicle.update_meta(current_miles=50100)
+        assert vehicle.miles_as_of("2020-01-01") == 50100
+        vehicle.add_history_entry(HistoryEntry("oil/replace", "2017-01-01", 60100))
+        assert vehicle.miles_as_of("2020-01-01") == 60100
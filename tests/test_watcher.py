@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Tests for the vehicle directory watcher."""
+
+import os
+import queue
+
+import pytest
+from models.loader import save_history_entry, update_vehicle_meta
+from models.history_entry import HistoryEntry
+from models.watcher import ChangeKind, VehicleChange, VehicleWatcher, vehicle_id_for
+
+VEHICLE_YAML = (
+    "car:\n  make: Test\n  model: Car\n  trim: Base\n"
+    "  year: 2020\n  purchaseDate: '2020-01-01'\n  purchaseMiles: 0\n"
+    "history: []\nrules: []\n"
+)
+
+TIMEOUT = 5
+
+
+def created(vehicle_id):
+    return VehicleChange(ChangeKind.CREATED, vehicle_id)
+
+
+def modified(vehicle_id):
+    return VehicleChange(ChangeKind.MODIFIED, vehicle_id)
+
+
+def deleted(vehicle_id):
+    return VehicleChange(ChangeKind.DELETED, vehicle_id)
+
+
+class TestVehicleIdFor:
+    """Tests for mapping file names to vehicles."""
+
+    def test_vehicle_and_journal(self):
+        assert vehicle_id_for("wrx.yaml") == "wrx"
+        assert vehicle_id_for("wrx.history.log") == "wrx"
+
+    def test_ignored_files(self):
+        assert vehicle_id_for(".wrx.yaml.lock") is None
+        assert vehicle_id_for(".wrx.yaml.1a2b3c4d.tmp") is None
+        assert vehicle_id_for("notes.txt") is None
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def watched(request, tmp_path):
+    """(directory, queue of changes, watcher) for each backend."""
+    (tmp_path / "old.yaml").write_text(VEHICLE_YAML)
+    changes = queue.Queue()
+    watcher = VehicleWatcher(
+        tmp_path, poll_interval=0.02, use_inotify=request.param == "inotify"
+    )
+    watcher.subscribe(changes.put)
+    with watcher:
+        if request.param == "inotify" and watcher.backend != "inotify":
+            pytest.skip("inotify not available")
+        yield tmp_path, changes, watcher
+
+
+def next_change(changes):
+    return changes.get(timeout=TIMEOUT)
+
+
+def assert_quiet(changes):
+    with pytest.raises(queue.Empty):
+        changes.get(timeout=0.2)
+
+
+class TestVehicleWatcher:
+    """Tests for VehicleWatcher on both backends."""
+
+    def test_existing_files_are_not_reported(self, watched):
+        _, changes, _ = watched
+        assert_quiet(changes)
+
+    def test_created(self, watched):
+        directory, changes, _ = watched
+        (directory / "new.yaml").write_text(VEHICLE_YAML)
+        assert next_change(changes) == created("new")
+        assert_quiet(changes)
+
+    def test_modified(self, watched):
+        directory, changes, _ = watched
+        with open(directory / "old.yaml", "a") as fp:
+            fp.write("# edited by hand\n")
+        assert next_change(changes) == modified("old")
+
+    def test_deleted(self, watched):
+        directory, changes, _ = watched
+        os.unlink(directory / "old.yaml")
+        assert next_change(changes) == deleted("old")
+
+    def test_atomic_write_is_one_modification(self, watched):
+        """Loader writes (temp file, fsync, rename, lock file) show up once."""
+        directory, changes, _ = watched
+        update_vehicle_meta(directory / "old.yaml", current_miles=1000)
+        assert next_change(changes) == modified("old")
+        assert_quiet(changes)
+
+    def test_journal_append_modifies_vehicle(self, watched):
+        directory, changes, _ = watched
+        save_history_entry(
+            directory / "old.yaml",
+            HistoryEntry("oil/replace", "2020-02-01", 100),
+            journal=True,
+        )
+        assert next_change(changes) == modified("old")
+
+    def test_other_files_ignored(self, watched):
+        directory, changes, _ = watched
+        (directory / "README.txt").write_text("hello")
+        (directory / ".old.yaml.lock").write_text("")
+        assert_quiet(changes)
+
+    def test_subscriber_errors_do_not_stop_others(self, watched, caplog):
+        directory, changes, watcher = watched
+
+        def broken(change):
+            raise RuntimeError("boom")
+
+        watcher.unsubscribe(changes.put)
+        watcher.subscribe(broken)
+        watcher.subscribe(changes.put)
+        (directory / "new.yaml").write_text(VEHICLE_YAML)
+        assert next_change(changes) == created("new")
+        [record] = [r for r in caplog.records if r.name == "models.watcher"]
+        assert record.levelname == "ERROR"
+        assert "RuntimeError: boom" in caplog.text
+
+
+class TestCheck:
+    """Tests for synchronous rescans."""
+
+    def test_check_without_thread(self, tmp_path):
+        watcher = VehicleWatcher(tmp_path)
+        assert watcher.check() == []
+        (tmp_path / "a.yaml").write_text(VEHICLE_YAML)
+        (tmp_path / "b.history.log").write_text("{}\n")  # journal alone
+        assert watcher.check() == [created("a")]
+        os.unlink(tmp_path / "a.yaml")
+        assert watcher.check() == [deleted("a")]
+
+    def test_missing_directory_polls(self, tmp_path):
+        with VehicleWatcher(tmp_path / "missing") as watcher:
+            assert watcher.backend == "polling"
+        assert watcher.backend is None
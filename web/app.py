@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 """Flask web application for vehicle maintenance tracking."""
 
+import atexit
+import functools
+import hashlib
 import os
-from datetime import date
+import threading
+from datetime import date, datetime, time, timezone
 from pathlib import Path
 
 from flask import (
@@ -11,18 +15,29 @@ from flask import (
     render_template,
     request,
     redirect,
+    session,
     url_for,
     flash,
 )
+from werkzeug.http import is_resource_modified
 
 # Add parent directory to path for model imports
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from models.calculations import due_date_cache_info
 from models.loader import (
+    LOAD_WORKERS,
+    add_write_listener,
+    cache_info,
+    file_stamp,
     load_vehicle,
+    lock_stats,
+    parse_timings,
     save_history_entry,
+    LockTimeout,
+    invalidate_cache,
     update_history_entry,
     delete_history_entry,
     add_rule,
@@ -36,6 +51,8 @@ from models.car import Car
 from models.history_entry import HistoryEntry
 from models.rule import Rule
 from models.status import Status
+from models.summary_index import SummaryIndex
+from models.watcher import ChangeKind, VehicleChange, VehicleWatcher
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-secret-key-change-in-prod")
@@ -45,6 +62,10 @@ VEHICLES_DIR = Path(
     os.environ.get("VEHICLES_DIR", str(Path(__file__).parent.parent / "vehicles"))
 )
 
+# Log services to the append-only history journal instead of rewriting the YAML
+# (fold back with: maint.py <file> compact)
+HISTORY_JOURNAL = os.environ.get("HISTORY_JOURNAL", "").lower() in ("1", "true")
+
 
 def get_vehicle_files():
     """Get all vehicle YAML files."""
@@ -61,6 +82,110 @@ def get_vehicle_path(vehicle_id: str) -> Path:
     return VEHICLES_DIR / f"{vehicle_id}.yaml"
 
 
+# Vehicle files also change outside this process (hand edits, git pulls, the
+# CLI); in-memory caches here subscribe to the watcher instead of stat-ing
+# files on every request. It starts with the first request, in the process
+# that serves it (not at import, nor in the debug reloader's parent);
+# VEHICLE_WATCH=0 turns it off.
+vehicle_watcher = VehicleWatcher(VEHICLES_DIR)
+
+
+@vehicle_watcher.subscribe
+def _forget_deleted_vehicle(change: VehicleChange) -> None:
+    """Drop a deleted vehicle's parsed copy from the loader cache."""
+    if change.kind is ChangeKind.DELETED:
+        invalidate_cache(get_vehicle_path(change.vehicle_id))
+
+
+# When this process started: a restart (after an upgrade, say) may render
+# the same vehicle differently, so it is part of every page's validators
+STARTED = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def conditional_vehicle_page(view):
+    """
+    Let clients revalidate a vehicle page instead of downloading it again.
+
+    The ETag covers everything the page is rendered from: the stamps of the
+    vehicle file and its journal, the query string, whether it is an HTMX
+    request, today's date (statuses move with the calendar) and STARTED.
+    Last-Modified is the newest of the file, the journal, local midnight
+    and STARTED.
+    A matching If-None-Match (or, without one, If-Modified-Since) is
+    answered with 304 before the vehicle is loaded. Requests with flash
+    messages pending are rendered as usual and left untagged, since the
+    messages are part of that one response.
+    """
+
+    @functools.wraps(view)
+    def wrapper(vehicle_id: str, **kwargs):
+        if session.get("_flashes"):
+            return view(vehicle_id, **kwargs)
+        try:
+            stamp = file_stamp(get_vehicle_path(vehicle_id))
+        except FileNotFoundError:
+            # The view reports the missing vehicle
+            return view(vehicle_id, **kwargs)
+
+        today = date.today()
+        key = (
+            request.endpoint,
+            vehicle_id,
+            stamp,
+            request.query_string,
+            bool(request.headers.get("HX-Request")),
+            today.isoformat(),
+            STARTED.isoformat(),
+        )
+        etag = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        # stamp is (mtime_ns, size[, journal mtime_ns, journal size])
+        modified = datetime.fromtimestamp(max(stamp[::2]) / 1e9, timezone.utc)
+        midnight = datetime.combine(today, time.min).astimezone(timezone.utc)
+        last_modified = max(modified, midnight, STARTED)
+
+        if is_resource_modified(
+            request.environ, etag=etag, last_modified=last_modified
+        ):
+            response = make_response(view(vehicle_id, **kwargs))
+            if response.status_code != 200 or session.get("_flashes"):
+                return response
+        else:
+            response = make_response("", 304)
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.vary.add("HX-Request")
+        # Cache, but check back every time
+        response.cache_control.no_cache = True
+        return response
+
+    return wrapper
+
+
+# Dashboard rows, updated by this process's writes and by the watcher
+summary_index = SummaryIndex(VEHICLES_DIR)
+add_write_listener(summary_index.on_write)
+vehicle_watcher.subscribe(summary_index.on_change)
+
+# Set once the first request has started the watcher (or found it turned off)
+_watcher_lock = threading.Lock()
+_watcher_checked = False
+
+
+@app.before_request
+def start_vehicle_watcher():
+    """Start the vehicle watcher on the first request, unless turned off."""
+    global _watcher_checked
+    if _watcher_checked:
+        return
+    with _watcher_lock:
+        if _watcher_checked:
+            return
+        if os.environ.get("VEHICLE_WATCH", "1").lower() not in ("0", "false"):
+            vehicle_watcher.start()
+            atexit.register(vehicle_watcher.stop)
+        _watcher_checked = True
+
+
 def format_miles(miles):
     """Format miles with comma separator."""
     if miles is None:
@@ -190,35 +315,31 @@ def _float_or_none_form(key: str):
         return None
 
 
-@app.route("/")
-def index():
-    """Dashboard showing all vehicles."""
-    vehicles = []
-    for path in get_vehicle_files():
-        vehicle = load_vehicle(path)
-        # Get status summary
-        all_status = vehicle.get_all_service_status()
-        overdue = sum(1 for s in all_status if s.status == Status.OVERDUE)
-        due_soon = sum(1 for s in all_status if s.status == Status.DUE_SOON)
+@app.errorhandler(LockTimeout)
+def vehicle_file_busy(error: LockTimeout):
+    """Another writer held the vehicle file too long: ask the user to retry."""
+    flash("Vehicle file is busy, please try again", "error")
+    vehicle_id = (request.view_args or {}).get("vehicle_id")
+    if vehicle_id and get_vehicle_path(vehicle_id).exists():
+        target = url_for("vehicle_detail", vehicle_id=vehicle_id)
+    else:
+        target = url_for("index")
 
-        ok = sum(1 for s in all_status if s.status == Status.OK)
+    if request.headers.get("HX-Request"):
+        response = make_response("")
+        response.headers["HX-Redirect"] = target
+        return response
 
-        # Get last service info
-        last_service = vehicle.last_service
+    return redirect(target)
 
-        vehicles.append(
-            {
-                "id": get_vehicle_id(path),
-                "vehicle": vehicle,
-                "overdue": overdue,
-                "due_soon": due_soon,
-                "ok": ok,
-                "last_service": last_service,
-                "total_rules": len(vehicle.rules),
-            }
-        )
 
-    return render_template("index.html", vehicles=vehicles)
+@app.route("/")
+def index():
+    """Dashboard showing all vehicles."""
+    if vehicle_watcher.backend is None:
+        # Nobody reports outside edits, so check every file's stamp
+        summary_index.sync()
+    return render_template("index.html", vehicles=summary_index.summaries())
 
 
 @app.route("/vehicle/new", methods=["GET", "POST"])
@@ -278,17 +399,24 @@ def create_vehicle_view():
         flash("Purchase mileage is required", "error")
         return redirect(url_for("create_vehicle_view"))
 
-    car = Car(
-        make=make,
-        model=model,
-        trim=trim,
-        year=year,
-        purchase_date=purchase_date,
-        purchase_miles=purchase_miles,
-    )
+    try:
+        car = Car(
+            make=make,
+            model=model,
+            trim=trim,
+            year=year,
+            purchase_date=purchase_date,
+            purchase_miles=purchase_miles,
+        )
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("create_vehicle_view"))
 
     try:
         create_vehicle(path, car, current_miles=current_miles, as_of_date=as_of_date)
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("create_vehicle_view"))
     except Exception:
         flash("Failed to create vehicle", "error")
         return redirect(url_for("create_vehicle_view"))
@@ -308,6 +436,7 @@ def create_vehicle_view():
 
 
 @app.route("/vehicle/<vehicle_id>")
+@conditional_vehicle_page
 def vehicle_detail(vehicle_id: str):
     """Vehicle detail page with status table."""
     path = get_vehicle_path(vehicle_id)
@@ -332,7 +461,8 @@ def vehicle_detail(vehicle_id: str):
     include_verbs = request.args.getlist("show")
     include_verbs = [v.lower() for v in include_verbs] if include_verbs else None
 
-    all_status = vehicle.get_all_service_status(
+    # The bundle holds every severe/basis variant, so toggling reuses it
+    all_status = vehicle.status_bundle().get(
         severe=severe,
         include_verbs=include_verbs,
         miles_only=miles_only,
@@ -384,6 +514,7 @@ def vehicle_detail(vehicle_id: str):
 
 
 @app.route("/vehicle/<vehicle_id>/status")
+@conditional_vehicle_page
 def vehicle_status_partial(vehicle_id: str):
     """HTMX partial: status table for a vehicle."""
     path = get_vehicle_path(vehicle_id)
@@ -393,9 +524,7 @@ def vehicle_status_partial(vehicle_id: str):
     exclude_inspect = request.args.get("exclude_inspect", "").lower() == "true"
 
     exclude_verbs = ["inspect"] if exclude_inspect else None
-    all_status = vehicle.get_all_service_status(
-        severe=severe, exclude_verbs=exclude_verbs
-    )
+    all_status = vehicle.status_bundle().get(severe=severe, exclude_verbs=exclude_verbs)
     all_status.sort(key=lambda s: (s.status.value, s.rule.item))
 
     return render_template(
@@ -450,16 +579,20 @@ def log_service(vehicle_id: str):
     cost_val = float(cost) if cost else None
 
     # Create and save entry
-    entry = HistoryEntry(
-        rule_key=rule_key,
-        date=service_date,
-        mileage=mileage_val,
-        performed_by=performed_by,
-        notes=notes,
-        cost=cost_val,
-    )
+    try:
+        entry = HistoryEntry(
+            rule_key=rule_key,
+            date=service_date,
+            mileage=mileage_val,
+            performed_by=performed_by,
+            notes=notes,
+            cost=cost_val,
+        )
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("vehicle_detail", vehicle_id=vehicle_id))
 
-    save_history_entry(path, entry)
+    save_history_entry(path, entry, journal=HISTORY_JOURNAL)
     flash(f"Logged service: {rule_key}", "success")
 
     # HTMX: redirect to vehicle status so target (#modal-content or #status-table) always works
@@ -527,14 +660,18 @@ def edit_vehicle_view(vehicle_id: str):
         flash("Purchase mileage is required", "error")
         return redirect(url_for("edit_vehicle_view", vehicle_id=vehicle_id))
 
-    car = Car(
-        make=make,
-        model=model,
-        trim=trim,
-        year=year,
-        purchase_date=purchase_date,
-        purchase_miles=purchase_miles,
-    )
+    try:
+        car = Car(
+            make=make,
+            model=model,
+            trim=trim,
+            year=year,
+            purchase_date=purchase_date,
+            purchase_miles=purchase_miles,
+        )
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("edit_vehicle_view", vehicle_id=vehicle_id))
 
     try:
         update_vehicle_meta(
@@ -543,6 +680,9 @@ def edit_vehicle_view(vehicle_id: str):
             current_miles=current_miles,
             as_of_date=as_of_date,
         )
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("edit_vehicle_view", vehicle_id=vehicle_id))
     except Exception:
         flash("Failed to update vehicle", "error")
         return redirect(url_for("edit_vehicle_view", vehicle_id=vehicle_id))
@@ -602,6 +742,7 @@ def delete_vehicle_view(vehicle_id: str):
 
 
 @app.route("/vehicle/<vehicle_id>/history")
+@conditional_vehicle_page
 def vehicle_history(vehicle_id: str):
     """Vehicle maintenance history page."""
     path = get_vehicle_path(vehicle_id)
@@ -641,7 +782,7 @@ def vehicle_history(vehicle_id: str):
 
     total_cost = sum(e.cost for _, e in entries_with_index if e.cost is not None)
 
-    all_status = vehicle.get_all_service_status(severe=False)
+    all_status = vehicle.status_bundle().get(severe=False)
     status_counts = {
         "overdue": sum(1 for s in all_status if s.status == Status.OVERDUE),
         "due_soon": sum(1 for s in all_status if s.status == Status.DUE_SOON),
@@ -665,6 +806,7 @@ def vehicle_history(vehicle_id: str):
 
 
 @app.route("/vehicle/<vehicle_id>/chart")
+@conditional_vehicle_page
 def vehicle_chart(vehicle_id: str):
     """Full mileage chart page."""
     path = get_vehicle_path(vehicle_id)
@@ -676,7 +818,7 @@ def vehicle_chart(vehicle_id: str):
     mileage_points = _build_mileage_points(vehicle)
     service_markers = _build_service_markers(vehicle)
 
-    all_status = vehicle.get_all_service_status(severe=False)
+    all_status = vehicle.status_bundle().get(severe=False)
     status_counts = {
         "overdue": sum(1 for s in all_status if s.status == Status.OVERDUE),
         "due_soon": sum(1 for s in all_status if s.status == Status.DUE_SOON),
@@ -745,14 +887,18 @@ def edit_history(vehicle_id: str, index: int):
     mileage_val = float(mileage) if mileage else None
     cost_val = float(cost) if cost else None
 
-    entry = HistoryEntry(
-        rule_key=rule_key,
-        date=service_date,
-        mileage=mileage_val,
-        performed_by=performed_by,
-        notes=notes,
-        cost=cost_val,
-    )
+    try:
+        entry = HistoryEntry(
+            rule_key=rule_key,
+            date=service_date,
+            mileage=mileage_val,
+            performed_by=performed_by,
+            notes=notes,
+            cost=cost_val,
+        )
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("vehicle_history", vehicle_id=vehicle_id))
 
     try:
         update_history_entry(path, index, entry)
@@ -1044,6 +1190,7 @@ def delete_rule_view(vehicle_id: str, index: int):
 
 
 @app.route("/vehicle/<vehicle_id>/rules")
+@conditional_vehicle_page
 def vehicle_rules(vehicle_id: str):
     """Vehicle maintenance rules/schedule page."""
     path = get_vehicle_path(vehicle_id)
@@ -1095,7 +1242,7 @@ def vehicle_rules(vehicle_id: str):
     for item in sorted_items:
         rules_by_item[item].sort(key=lambda ir: (ir[1].verb, ir[1].phase or ""))
 
-    all_status = vehicle.get_all_service_status(severe=False)
+    all_status = vehicle.status_bundle().get(severe=False)
     status_counts = {
         "overdue": sum(1 for s in all_status if s.status == Status.OVERDUE),
         "due_soon": sum(1 for s in all_status if s.status == Status.DUE_SOON),
@@ -1119,6 +1266,28 @@ def vehicle_rules(vehicle_id: str):
     )
 
 
+# Slowest vehicle files listed on the diagnostics page
+DIAGNOSTICS_SLOWEST = 20
+
+
+@app.route("/diagnostics")
+def diagnostics():
+    """Cache, lock and per-file parse timing counters of this process."""
+    slowest = [
+        {"id": Path(t.path).stem, "path": t.path, "ms": t.seconds * 1000}
+        for t in parse_timings(DIAGNOSTICS_SLOWEST)
+    ]
+    return render_template(
+        "diagnostics.html",
+        slowest=slowest,
+        vehicle_cache=cache_info(),
+        due_date_cache=due_date_cache_info(),
+        locks=lock_stats(),
+        load_workers=LOAD_WORKERS,
+        watcher_backend=vehicle_watcher.backend or "off",
+    )
+
+
 if __name__ == "__main__":
     # Run with debug mode for development
     # Access from phone: use your computer's local IP (e.g., 192.168.1.x:5001)